@@ -0,0 +1,7 @@
+"""
+Benchmarks for Port Royal.
+
+generator builds seeded synthetic contexts, harness times the library over
+size sweeps and writes the results as JSON, and compare reports the
+regressions between two result files.
+"""
@@ -0,0 +1,64 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare baseline.json run.json --threshold 1.2
+
+Prints the ratio of the best times of every benchmark and size present in
+both files and exits with status 1 if any ratio exceeds the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def _best_times(report: dict) -> dict[tuple[str, int, int], float]:
+    return {
+        (result["benchmark"], result["objects"], result["attributes"]): result["best"]
+        for result in report["results"]
+        if result.get("best") is not None
+    }
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float
+) -> list[tuple[str, int, int, float, float]]:
+    """(benchmark, objects, attributes, baseline, current) of every regression."""
+    old = _best_times(baseline)
+    new = _best_times(current)
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        name, num_objects, num_attributes = key
+        ratio = new[key] / old[key] if old[key] else float("inf")
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(
+            f"{name:<36} {num_objects:>6}x{num_attributes:<4} "
+            f"{old[key]:.6f}s -> {new[key]:.6f}s  x{ratio:.2f}{flag}"
+        )
+        if ratio > threshold:
+            regressions.append((name, num_objects, num_attributes, old[key], new[key]))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="slowdown ratio reported as a regression (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    if compare(baseline, current, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Seeded synthetic contexts.
+
+The same parameters and seed always give the same context, so timings of
+different runs (and different versions of the code) measure the same work.
+"""
+
+import random
+from bitarray import bitarray
+from src.context import FormalContext
+from src.implications import Implication
+
+
+def random_context(
+    num_objects: int,
+    num_attributes: int,
+    density: float = 0.2,
+    seed: int = 0,
+    implications: int = 0,
+    premise_size: int = 2,
+) -> tuple[FormalContext, list[Implication]]:
+    """
+    A context whose crosses are set independently with probability density,
+    then closed under the given number of planted implications (random
+    premises of premise_size attributes, one conclusion attribute each).
+    Returns the context and the planted implications, which it satisfies.
+    """
+    rng = random.Random(seed)
+    attributes = [f"a{j}" for j in range(num_attributes)]
+    objects = [f"g{i}" for i in range(num_objects)]
+    incidence = []
+    for _ in range(num_objects):
+        row = bitarray(num_attributes)
+        row.setall(0)
+        for attr_idx in range(num_attributes):
+            if rng.random() < density:
+                row[attr_idx] = 1
+        incidence.append(row)
+
+    planted = _random_implications(rng, attributes, implications, premise_size)
+    for row in incidence:
+        _close(row, planted)
+    return FormalContext(objects, attributes, incidence), planted
+
+
+def random_ranked_context(
+    num_objects: int,
+    num_attributes: int,
+    density: float = 0.2,
+    seed: int = 0,
+    implications: int = 3,
+    premise_size: int = 1,
+    exceptions: float = 0.1,
+) -> tuple[FormalContext, list[Implication]]:
+    """
+    A context for ranking: like random_context, but a fraction exceptions
+    of the objects is made to violate one planted implication (premise set,
+    conclusion cleared). Ranking by the planted implications then places
+    these objects, and the objects violating what they witness, in ranks
+    after the first one.
+    """
+    context, planted = random_context(
+        num_objects, num_attributes, density, seed, implications, premise_size
+    )
+    rng = random.Random(seed + 1)
+    if planted:
+        for obj_idx in range(num_objects):
+            if rng.random() < exceptions:
+                implication = rng.choice(planted)
+                row = context.incidence[obj_idx]
+                row |= implication.premise_bits
+                row &= ~implication.conclusion_bits
+        context = FormalContext(context.objects, context.attributes, context.incidence)
+    return context, planted
+
+
+def random_subsets(
+    size: int, count: int, density: float, seed: int = 0
+) -> list[bitarray]:
+    """count random subsets of range(size), each element with probability density."""
+    rng = random.Random(seed)
+    subsets = []
+    for _ in range(count):
+        bits = bitarray(size)
+        bits.setall(0)
+        for idx in range(size):
+            if rng.random() < density:
+                bits[idx] = 1
+        subsets.append(bits)
+    return subsets
+
+
+def _random_implications(
+    rng: random.Random, attributes: list[str], count: int, premise_size: int
+) -> list[Implication]:
+    planted = []
+    if len(attributes) <= premise_size:
+        return planted
+    for _ in range(count):
+        chosen = rng.sample(attributes, premise_size + 1)
+        planted.append(Implication(chosen[:-1], chosen[-1:], attributes))
+    return planted
+
+
+def _close(row: bitarray, implications: list[Implication]) -> None:
+    """Add conclusions to row until it satisfies every implication."""
+    changed = True
+    while changed:
+        changed = False
+        for implication in implications:
+            premise = implication.premise_bits
+            if (row & premise) == premise and (
+                row & implication.conclusion_bits
+            ) != implication.conclusion_bits:
+                row |= implication.conclusion_bits
+                changed = True
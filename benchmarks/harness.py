@@ -0,0 +1,236 @@
+"""
+Timed benchmark harness.
+
+    python -m benchmarks.harness --sizes 50x10 100x12 --output run.json
+
+Every benchmark runs on fresh seeded contexts of each size, so computed
+concepts and bases cached on a context never leak from one repetition into
+the next. Only the operation itself is timed; building the inputs is not.
+The results are written as JSON for benchmarks.compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable
+import bitarray as bitarray_module
+from benchmarks.generator import random_context, random_ranked_context, random_subsets
+from src.algorithms import object_rank
+from src.context import FormalContext
+from src.io import load_context, save_context
+from src.translated_ranked_context import TranslatedContext
+
+DEFAULT_SIZES = ["50x10", "100x12", "200x14"]
+# Derivations timed per benchmark run
+QUERIES = 1000
+
+
+class Workload:
+    """The parameters of one point of a size sweep."""
+
+    def __init__(
+        self, num_objects: int, num_attributes: int, density: float, seed: int
+    ) -> None:
+        self.num_objects = num_objects
+        self.num_attributes = num_attributes
+        self.density = density
+        self.seed = seed
+
+    def context(self) -> FormalContext:
+        context, _ = random_context(
+            self.num_objects,
+            self.num_attributes,
+            self.density,
+            self.seed,
+            implications=self.num_attributes // 4,
+        )
+        return context
+
+    def ranked(self):
+        """A context with planted defeasible implications and those implications."""
+        return random_ranked_context(
+            self.num_objects, self.num_attributes, self.density, self.seed
+        )
+
+
+def _timed(operation: Callable[[], int]) -> tuple[float, int]:
+    start = time.perf_counter()
+    size = operation()
+    return time.perf_counter() - start, size
+
+
+def bench_prime_objects(workload: Workload) -> tuple[float, int]:
+    context = workload.context()
+    queries = random_subsets(context.num_objects, QUERIES, 0.05, workload.seed)
+    return _timed(lambda: sum(context.prime_objects(q).count() for q in queries))
+
+
+def bench_closure(workload: Workload) -> tuple[float, int]:
+    context = workload.context()
+    queries = random_subsets(context.num_attributes, QUERIES, 0.1, workload.seed)
+    return _timed(lambda: sum(context.closure(q).count() for q in queries))
+
+
+def _bench_concepts(algorithm: str) -> Callable[[Workload], tuple[float, int]]:
+    def bench(workload: Workload) -> tuple[float, int]:
+        context = workload.context()
+        return _timed(lambda: sum(1 for _ in context.generate_all_concepts(algorithm)))
+
+    return bench
+
+
+def bench_canonical_basis(workload: Workload) -> tuple[float, int]:
+    context = workload.context()
+    return _timed(lambda: len(context.get_canonical_basis()))
+
+
+def bench_object_rank(workload: Workload) -> tuple[float, int]:
+    context, delta = workload.ranked()
+    return _timed(lambda: len(object_rank(context, delta).rankings))
+
+
+def bench_defeasible_basis(workload: Workload) -> tuple[float, int]:
+    context, delta = workload.ranked()
+    ranked = object_rank(context, delta)
+    return _timed(lambda: len(ranked.compute_defeasible_basis()))
+
+
+def bench_translated_context(workload: Workload) -> tuple[float, int]:
+    context, delta = workload.ranked()
+    ranked = object_rank(context, delta)
+    # Enumerate the rank 0 concepts up front so only the translation is timed
+    len(ranked.rankings[0].concepts)
+    return _timed(lambda: TranslatedContext(ranked).num_attributes)
+
+
+def _bench_load(format: str) -> Callable[[Workload], tuple[float, int]]:
+    def bench(workload: Workload) -> tuple[float, int]:
+        context = workload.context()
+        with tempfile.TemporaryDirectory() as directory:
+            # load_context resolves absolute paths as they are
+            path = os.path.join(directory, f"bench.{format}")
+            save_context(context, path, format)
+            return _timed(lambda: load_context(path, format).num_objects)
+
+    return bench
+
+
+BENCHMARKS: dict[str, Callable[[Workload], tuple[float, int]]] = {
+    "prime_objects": bench_prime_objects,
+    "closure": bench_closure,
+    "generate_all_concepts[nextclosure]": _bench_concepts("nextclosure"),
+    "generate_all_concepts[cbo]": _bench_concepts("cbo"),
+    "generate_all_concepts[inclose]": _bench_concepts("inclose"),
+    "get_canonical_basis": bench_canonical_basis,
+    "object_rank": bench_object_rank,
+    "compute_defeasible_basis": bench_defeasible_basis,
+    "TranslatedContext": bench_translated_context,
+    "load_context[ctx]": _bench_load("ctx"),
+    "load_context[bin]": _bench_load("bin"),
+}
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    """'200x14' -> (200, 14)."""
+    try:
+        num_objects, num_attributes = size.lower().split("x")
+        return int(num_objects), int(num_attributes)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid size '{size}': expected OBJECTSxATTRIBUTES, e.g. 100x12."
+        ) from None
+
+
+def run(
+    sizes: list[tuple[int, int]],
+    benchmarks: list[str],
+    density: float = 0.2,
+    seed: int = 0,
+    repeat: int = 3,
+) -> dict:
+    """Run the benchmarks over the sizes and return the JSON-ready report."""
+    results = []
+    for num_objects, num_attributes in sizes:
+        workload = Workload(num_objects, num_attributes, density, seed)
+        for name in benchmarks:
+            timings = []
+            size = None
+            error = None
+            for _ in range(repeat):
+                try:
+                    seconds, size = BENCHMARKS[name](workload)
+                except ValueError as e:
+                    # e.g. a planted ranking that cannot be ranked
+                    error = str(e)
+                    break
+                timings.append(seconds)
+            result = {
+                "benchmark": name,
+                "objects": num_objects,
+                "attributes": num_attributes,
+                "density": density,
+                "seconds": timings,
+                "best": min(timings) if timings else None,
+                "result_size": size,
+            }
+            if error is not None:
+                result["error"] = error
+            results.append(result)
+            print(
+                f"{name:<36} {num_objects:>6}x{num_attributes:<4} "
+                + (f"{result['best']:.6f}s" if timings else f"error: {error}"),
+                file=sys.stderr,
+            )
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "bitarray": bitarray_module.__version__,
+            "seed": seed,
+            "density": density,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Time Port Royal over size sweeps.")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=parse_size,
+        default=[parse_size(size) for size in DEFAULT_SIZES],
+        help="OBJECTSxATTRIBUTES sizes to sweep (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=list(BENCHMARKS),
+        default=list(BENCHMARKS),
+        metavar="NAME",
+        help="benchmarks to run (default: all)",
+    )
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.benchmarks, args.density, args.seed, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,55 @@ from src import (
     FormalContext,
     load_context,
     save_context,
-    object_rank,
+    IncrementalRanking,
     Implication,
     Conditional,
     TranslatedContext,
 )
+from src.cache import ResultCache
+from src.instrumentation import Profiler
+from src.progress import Job, Progress
+from src.io import guess_format
 from src.ranked_context import RankedContext
+from typing import Callable, Iterable, TextIO
+from bitarray import bitarray
+import argparse
+import json
 import os
-import readline  # enables arrow key navigation in input
+import sys
+
+
+class CommandError(Exception):
+    """A command that cannot run as given; the message says why."""
 
 
 class PortRoyalREPL:
+    """
+    The interactive shell. The work of a command is done by its op_*
+    method, which returns the results as a dict; cmd_* prints them.
+    """
+
+    # Intents and extents listed by default per page
+    page_size: int | None = 100
+
     def __init__(self):
         self.context: FormalContext | RankedContext | None = None
         self.ranked_context: RankedContext | None = None
         self.implications: list[Implication] = []
+        self.ranking: IncrementalRanking | None = None
+        # Concepts and bases computed in earlier sessions
+        try:
+            self.cache: ResultCache | None = ResultCache()
+        except OSError:
+            self.cache = None
+        self.profiler = Profiler(self.cache)
+        # Parallel concept enumeration settings applied to loaded contexts
+        self.workers = 1
+        self.split_depth = 1
+        # The last long computation, which may still be running
+        self.job: Job | None = None
+        self.job_context: FormalContext | None = None
+        self.background = False
         self.running = True
 
     def list_contexts(self) -> list[str]:
@@ -24,77 +58,138 @@ class PortRoyalREPL:
         data_dir = os.path.join(os.path.dirname(__file__), "data")
         if not os.path.exists(data_dir):
             return []
-        return [f for f in os.listdir(data_dir) if f.endswith(".ctx")]
+        return [f for f in os.listdir(data_dir) if guess_format(f)]
 
     def cmd_help(self, args: list[str]) -> None:
         """Display help information."""
-        print(
-            """
+        print("""
 Port Royal REPL - Formal Concept Analysis with Preferential Semantics
 
 Commands:
   help                    Show this help message
   list                    List available context files
-  load <filename>         Load a context from data/<filename>
+  load <filename> [fmt]   Load a context from data/<filename>
+                          (fmt: ctx, bin, fimi, items, csv; default by extension)
   show                    Display the current context
   info                    Show context statistics
 
-  intents                 List all concept intents
-  extents                 List all concept extents
+  intents [N] [--offset N] [--limit N] [all] [&]
+                          List concept intents, 100 (or N) at a time;
+                          only the concepts shown are enumerated unless
+                          'all' computes and counts them all
+  extents [N] [--offset N] [--limit N] [all] [&]
+                          List concept extents, like intents
   closure <attrs>         Compute closure of attributes (comma-separated)
   extent <attrs>          Get objects with attributes (comma-separated)
   intent <objects>        Get attributes of objects (comma-separated)
 
   impl <premise> -> <conclusion>   Add an implication
   impls                   List current implications
+  remove-impl <i>         Remove implication number i
   clear-impls             Clear all implications
   rank                    Create ranked context from implications
 
   satisfies <premise> -> <conclusion>    Check if implication holds
   cond <premise> |~ <conclusion>         Check conditional (ranked context)
 
-  basis                   Compute canonical basis (classical)
-  defeasible-basis        Compute defeasible basis (ranked)
+  basis [&]               Compute canonical basis (classical)
+  defeasible-basis [&]    Compute defeasible basis (ranked)
+                          (a trailing & runs the computation in the background;
+                          Ctrl-C stops a computation and keeps partial results)
+  progress                Show the progress of the background computation
+  cancel                  Stop the background computation
 
-  save <filename>         Save current context to file
+  save <filename>         Save current context (.bctx for binary)
   clear                   Clear the screen
   reset                   Unload the current context
+  cache [clear|off|on]    Show, clear, disable or enable the result cache
+  workers [n] [depth]     Show or set the processes used to enumerate
+                          concepts and the search tree split depth
+  profile on|off          Start or stop collecting hot-path statistics
+  stats [reset]           Show or reset the collected statistics
   quit / exit             Exit the REPL
-"""
-        )
+""")
 
     def cmd_list(self, args: list[str]) -> None:
         """List available context files."""
         contexts = self.list_contexts()
         if not contexts:
-            print("No .ctx files found in data/")
+            print("No context files found in data/")
         else:
             print("Available contexts:")
             for ctx in sorted(contexts):
                 print(f"  {ctx}")
 
-    def cmd_load(self, args: list[str]) -> None:
-        """Load a context from file."""
-        if not args:
-            print("Usage: load <filename>")
-            return
+    def _current(self) -> FormalContext:
+        """The context commands work on: the ranked one once there is one."""
+        ctx = self.ranked_context or self.context
+        if not ctx:
+            raise CommandError("No context loaded.")
+        return ctx
 
+    def _ranked(self) -> RankedContext:
+        if not self.ranked_context:
+            raise CommandError("No ranked context. Use 'rank' first.")
+        return self.ranked_context
+
+    @staticmethod
+    def _file_argument(args: list[str]) -> tuple[str, str]:
+        """(file name, format) of 'load' and 'save'; .ctx if the format is unknown."""
         filename = args[0]
-        if not filename.endswith(".ctx"):
+        format = args[1] if len(args) > 1 else guess_format(filename)
+        if format is None:
             filename += ".ctx"
+            format = "ctx"
+        return filename, format
+
+    @staticmethod
+    def _name_list(args: list[str]) -> list[str]:
+        """The comma-separated names of a command's arguments."""
+        return [name.strip() for name in " ".join(args).split(",") if name.strip()]
+
+    @classmethod
+    def _rule_sides(
+        cls, args: list[str], separator: str, usage: str
+    ) -> tuple[list[str], list[str]]:
+        """The comma-separated names on both sides of separator."""
+        line = " ".join(args)
+        if separator not in line:
+            raise CommandError(usage)
+        left, right = line.split(separator, 1)
+        return cls._name_list([left]), cls._name_list([right])
+
+    def op_load(self, args: list[str]) -> dict:
+        if not args:
+            raise CommandError("Usage: load <filename> [ctx|bin|fimi|items|csv]")
+        filename, format = self._file_argument(args)
+        self.context = load_context(filename, format, cache=self.cache)
+        self._apply_workers(self.context)
+        self.ranked_context = None
+        self.implications = []
+        self.ranking = None
+        return {
+            "file": filename,
+            "objects": self.context.num_objects,
+            "attributes": self.context.num_attributes,
+        }
 
+    def cmd_load(self, args: list[str]) -> None:
+        """Load a context from file."""
         try:
-            self.context = load_context(filename, "ctx")
-            self.ranked_context = None
-            self.implications = []
-            print(f"Loaded context: {filename}")
-            print(f"  Objects: {self.context.num_objects}")
-            print(f"  Attributes: {self.context.num_attributes}")
+            result = self.op_load(args)
+        except CommandError as e:
+            print(e)
+            return
         except FileNotFoundError:
-            print(f"File not found: {filename}")
+            print(f"File not found: {self._file_argument(args)[0]}")
             print("Use 'list' to see available files.")
+            return
         except Exception as e:
             print(f"Error loading context: {e}")
+            return
+        print(f"Loaded context: {result['file']}")
+        print(f"  Objects: {result['objects']}")
+        print(f"  Attributes: {result['attributes']}")
 
     def cmd_show(self, args: list[str]) -> None:
         """Display the current context."""
@@ -105,234 +200,370 @@ Commands:
         else:
             print("No context loaded. Use 'load <filename>' first.")
 
+    def op_info(self, args: list[str]) -> dict:
+        ctx = self._current()
+        result = {"objects": ctx.objects, "attributes": ctx.attributes}
+        if self.ranked_context:
+            result["ranks"] = [rank.objects for rank in self.ranked_context.rankings]
+        return result
+
     def cmd_info(self, args: list[str]) -> None:
         """Show context information."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
+        try:
+            result = self.op_info(args)
+        except CommandError as e:
+            print(e)
             return
 
-        print(f"Objects ({ctx.num_objects}):")
-        for obj in ctx.objects[:100]:
+        objects, attributes = result["objects"], result["attributes"]
+        print(f"Objects ({len(objects)}):")
+        for obj in objects[:100]:
             print(f"  {obj}")
         # if ctx.num_objects > 20:
         #     print(f"  ... and {ctx.num_objects - 20} more")
 
-        print(f"\nAttributes ({ctx.num_attributes}):")
-        for attr in ctx.attributes[:100]:
+        print(f"\nAttributes ({len(attributes)}):")
+        for attr in attributes[:100]:
             print(f"  {attr}")
         # if ctx.num_attributes > 20:
         #     print(f"  ... and {ctx.num_attributes - 20} more")
 
-        if self.ranked_context:
-            print(f"\nRanked context with {len(self.ranked_context.rankings)} ranks")
-            for i, rank in enumerate(self.ranked_context.rankings):
-                print(f"  Rank {i}: {rank.num_objects} objects")
+        if "ranks" in result:
+            print(f"\nRanked context with {len(result['ranks'])} ranks")
+            for i, rank in enumerate(result["ranks"]):
+                print(f"  Rank {i}: {len(rank)} objects")
+
+    @staticmethod
+    def _parse_page(
+        args: list[str], limit: int | None = 100
+    ) -> tuple[int, int | None, bool]:
+        """
+        (offset, limit, all) from '[N] [--offset N] [--limit N] [all] [&]'.
+        A bare number is the limit; all (or '&') asks for every concept to
+        be computed and counted.
+        """
+        offset = 0
+        everything = False
+        tokens = iter(args)
+        for token in tokens:
+            if token == "--offset":
+                offset = int(next(tokens, ""))
+            elif token == "--limit":
+                limit = int(next(tokens, ""))
+            elif token in ("all", "&"):
+                everything = True
+            else:
+                limit = int(token)
+        # A limit of 0 would show the same empty page over and over
+        if offset < 0 or (limit is not None and limit < 1):
+            raise ValueError("offset must be non-negative and limit positive.")
+        return offset, limit, everything
+
+    def _concept_page(self, kind: str, args: list[str]) -> dict:
+        """
+        A page of intents or extents as lists of names, starting at "offset".
+        Unless all of them are asked for, the concepts are only enumerated
+        up to the end of the page; "more" tells whether the list goes on.
+        """
+        ctx = self._current()
+        try:
+            offset, limit, everything = self._parse_page(args, self.page_size)
+        except ValueError:
+            raise CommandError(
+                f"Usage: {kind} [N] [--offset N] [--limit N] [all] [&]"
+            ) from None
+        if everything:
+            ctx.compute_concepts()
+
+        # One concept beyond the page tells whether there are more
+        page = list(ctx.iter_concepts(offset, None if limit is None else limit + 1))
+        more = limit is not None and len(page) > limit
+        if kind == "intents":
+            names = [self._names(intent, ctx.attributes) for _, intent in page[:limit]]
+        else:
+            names = [self._names(extent, ctx.objects) for extent, _ in page[:limit]]
+        result = {"offset": offset, "count": len(names), kind: names, "more": more}
+        if everything:
+            result["total"] = len(ctx.concepts)
+        return result
 
-    def cmd_intents(self, args: list[str]) -> None:
-        """List all concept intents."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
-            return
+    def op_intents(self, args: list[str]) -> dict:
+        return self._concept_page("intents", args)
 
-        intents = ctx.intents_list
-        print(f"Found {len(intents)} concept intents:")
-        for i, intent in enumerate(intents[:100]):
-            print(f"  {i}: {set(intent) if intent else '{}'}")
-        # if len(intents) > 30:
-        #     print(f"  ... and {len(intents) - 30} more")
+    def op_extents(self, args: list[str]) -> dict:
+        return self._concept_page("extents", args)
 
-    def cmd_extents(self, args: list[str]) -> None:
-        """List all concept extents."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
+    def _list_concepts(self, kind: str, args: list[str]) -> None:
+        """Print a page of intents or extents, enumerating all in a job if asked."""
+        try:
+            ctx = self._current()
+            everything = self._parse_page(args)[2]
+        except CommandError as e:
+            print(e)
             return
+        except ValueError:
+            print(f"Usage: {kind} [N] [--offset N] [--limit N] [all] [&]")
+            return
+        if everything and not self._run_job(kind, ctx, ctx.compute_concepts, args):
+            return
+        result = self._concept_page(kind, args)
 
-        extents = ctx.extents_list
-        print(f"Found {len(extents)} concept extents:")
-        for i, extent in enumerate(extents[:100]):
-            print(f"  {i}: {set(extent) if extent else '{}'}")
-        # if len(extents) > 30:
-        #     print(f"  ... and {len(extents) - 30} more")
-
-    def cmd_closure(self, args: list[str]) -> None:
-        """Compute closure of attributes."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
+        offset, names = result["offset"], result[kind]
+        if "total" in result:
+            print(f"Found {result['total']} concept {kind}:")
+        if not names:
+            print(f"No concept {kind} from position {offset} on.")
             return
+        if "total" not in result:
+            print(f"Concept {kind} {offset}-{offset + len(names) - 1}:")
+        for i, concept in enumerate(names, offset):
+            print(f"  {i}: {set(concept) if concept else '{}'}")
+        if result["more"]:
+            print(f"  ... more with '{kind} --offset {offset + len(names)}'")
+
+    def cmd_intents(self, args: list[str]) -> None:
+        """List concept intents, a page at a time."""
+        self._list_concepts("intents", args)
 
+    def cmd_extents(self, args: list[str]) -> None:
+        """List concept extents, a page at a time."""
+        self._list_concepts("extents", args)
+
+    @staticmethod
+    def _names(bits: bitarray, names: list[str]) -> list[str]:
+        return [names[i] for i in bits.search(1)]
+
+    def op_closure(self, args: list[str]) -> dict:
+        ctx = self._current()
         if not args:
-            print("Usage: closure <attr1,attr2,...>")
-            return
+            raise CommandError("Usage: closure <attr1,attr2,...>")
+        attr_bits = ctx._attributes_to_bitarray(self._name_list(args))
+        return {"attributes": self._names(ctx.closure(attr_bits), ctx.attributes)}
 
-        attrs = [a.strip() for a in " ".join(args).split(",")]
+    def cmd_closure(self, args: list[str]) -> None:
+        """Compute closure of attributes."""
         try:
-            attr_bits = ctx._attributes_to_bitarray(frozenset(attrs))
-            closure_bits = ctx.closure(attr_bits)
-            closure = ctx._bitarray_to_attributes(closure_bits)
-            print(f"Closure of {{{', '.join(attrs)}}}:")
-            print(f"  {set(closure)}")
+            result = self.op_closure(args)
+        except CommandError as e:
+            print(e)
+            return
         except ValueError as e:
             print(f"Error: {e}")
-
-    def cmd_extent(self, args: list[str]) -> None:
-        """Get objects with given attributes."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
             return
+        print(f"Closure of {{{', '.join(self._name_list(args))}}}:")
+        print(f"  {set(result['attributes'])}")
 
+    def op_extent(self, args: list[str]) -> dict:
+        ctx = self._current()
         if not args:
-            print("Usage: extent <attr1,attr2,...>")
-            return
+            raise CommandError("Usage: extent <attr1,attr2,...>")
+        attr_bits = ctx._attributes_to_bitarray(self._name_list(args))
+        return {"objects": self._names(ctx.prime_attributes(attr_bits), ctx.objects)}
 
-        attrs = [a.strip() for a in " ".join(args).split(",")]
+    def cmd_extent(self, args: list[str]) -> None:
+        """Get objects with given attributes."""
         try:
-            attr_bits = ctx._attributes_to_bitarray(frozenset(attrs))
-            extent_bits = ctx.prime_attributes(attr_bits)
-            extent = ctx._bitarray_to_objects(extent_bits)
-            print(f"Objects with {{{', '.join(attrs)}}}:")
-            print(f"  {set(extent)}")
+            result = self.op_extent(args)
+        except CommandError as e:
+            print(e)
+            return
         except ValueError as e:
             print(f"Error: {e}")
-
-    def cmd_intent(self, args: list[str]) -> None:
-        """Get attributes of given objects."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
             return
+        print(f"Objects with {{{', '.join(self._name_list(args))}}}:")
+        print(f"  {set(result['objects'])}")
 
+    def op_intent(self, args: list[str]) -> dict:
+        ctx = self._current()
         if not args:
-            print("Usage: intent <obj1,obj2,...>")
-            return
-
-        objs = [o.strip() for o in " ".join(args).split(",")]
-        from bitarray import bitarray
-
-        obj_bits = bitarray(ctx.num_objects)
-        obj_bits.setall(0)
+            raise CommandError("Usage: intent <obj1,obj2,...>")
+        obj_bits = ctx._objects_to_bitarray(self._name_list(args))
+        return {"attributes": self._names(ctx.prime_objects(obj_bits), ctx.attributes)}
 
+    def cmd_intent(self, args: list[str]) -> None:
+        """Get attributes of given objects."""
         try:
-            for obj in objs:
-                idx = ctx.objects.index(obj)
-                obj_bits[idx] = 1
-            intent_bits = ctx.prime_objects(obj_bits)
-            intent = ctx._bitarray_to_attributes(intent_bits)
-            print(f"Attributes of {{{', '.join(objs)}}}:")
-            print(f"  {set(intent)}")
-        except ValueError:
-            print(f"Error: Object not found in context")
-
-    def cmd_impl(self, args: list[str]) -> None:
-        """Add an implication."""
-        if not self.context:
-            print("No context loaded.")
+            result = self.op_intent(args)
+        except CommandError as e:
+            print(e)
             return
-
-        line = " ".join(args)
-        if "->" not in line:
-            print("Usage: impl <premise> -> <conclusion>")
-            print("Example: impl road -> tarmac")
+        except ValueError as e:
+            print(f"Error: {e}")
             return
+        print(f"Attributes of {{{', '.join(self._name_list(args))}}}:")
+        print(f"  {set(result['attributes'])}")
 
-        parts = line.split("->")
-        premise = [a.strip() for a in parts[0].split(",") if a.strip()]
-        conclusion = [a.strip() for a in parts[1].split(",") if a.strip()]
+    def op_impl(self, args: list[str]) -> dict:
+        if not self.context:
+            raise CommandError("No context loaded.")
+        premise, conclusion = self._rule_sides(
+            args,
+            "->",
+            "Usage: impl <premise> -> <conclusion>\nExample: impl road -> tarmac",
+        )
+        impl = Implication(premise, conclusion, self.context.attributes)
+        self.implications.append(impl)
+        return {"index": len(self.implications) - 1, "implication": impl}
 
+    def cmd_impl(self, args: list[str]) -> None:
+        """Add an implication."""
         try:
-            impl = Implication(premise, conclusion, self.context.attributes)
-            self.implications.append(impl)
-            print(f"Added: {impl}")
+            result = self.op_impl(args)
+        except CommandError as e:
+            print(e)
+            return
         except Exception as e:
             print(f"Error: {e}")
+            return
+        print(f"Added: {result['implication']}")
+
+    def op_impls(self, args: list[str]) -> dict:
+        return {"implications": list(self.implications)}
 
     def cmd_impls(self, args: list[str]) -> None:
         """List current implications."""
-        if not self.implications:
+        implications = self.op_impls(args)["implications"]
+        if not implications:
             print("No implications defined.")
             return
 
-        print(f"Current implications ({len(self.implications)}):")
-        for i, impl in enumerate(self.implications):
+        print(f"Current implications ({len(implications)}):")
+        for i, impl in enumerate(implications):
             print(f"  {i}: {impl}")
 
+    def op_clear_impls(self, args: list[str]) -> dict:
+        self.implications = []
+        self.ranking = None
+        return {}
+
     def cmd_clear_impls(self, args: list[str]) -> None:
         """Clear all implications."""
-        self.implications = []
+        self.op_clear_impls(args)
         print("Implications cleared.")
 
-    def cmd_rank(self, args: list[str]) -> None:
-        """Create ranked context from implications."""
-        if not self.context:
-            print("No context loaded.")
+    def op_remove_impl(self, args: list[str]) -> dict:
+        try:
+            impl = self.implications.pop(int(args[0]))
+        except (IndexError, ValueError):
+            raise CommandError(
+                "Usage: remove-impl <i>  (see 'impls' for the indices)"
+            ) from None
+        return {"implication": impl}
+
+    def cmd_remove_impl(self, args: list[str]) -> None:
+        """Remove an implication by its index in 'impls'."""
+        try:
+            result = self.op_remove_impl(args)
+        except CommandError as e:
+            print(e)
             return
-
-        if not self.implications:
-            print("No implications defined. Use 'impl' to add some first.")
+        print(f"Removed: {result['implication']}")
+
+    def _sync_ranking(self) -> None:
+        """
+        Apply the implications added or removed since the last rank. The
+        edits are made on a copy, which replaces the ranking only if all of
+        them succeed, so a ValueError leaves the ranking as it was.
+        """
+        if self.ranking is None:
+            self.ranking = IncrementalRanking(self.context, self.implications)
             return
 
-        self.ranked_context = object_rank(self.context, self.implications)
-        print(f"Created ranked context with {len(self.ranked_context.rankings)} ranks:")
-        for i, rank in enumerate(self.ranked_context.rankings):
-            print(f"  Rank {i}: {rank.num_objects} objects - {rank.objects}")
+        current = self.implications
+        staged = self.ranking.copy()
+        for impl in staged.delta:
+            if not any(impl is other for other in current):
+                staged.remove_implication(impl)
+        for impl in current:
+            if not any(impl is other for other in staged.delta):
+                staged.add_implication(impl)
+        self.ranking = staged
+
+    def op_rank(self, args: list[str]) -> dict:
+        if not self.context:
+            raise CommandError("No context loaded.")
+        if not self.implications:
+            raise CommandError("No implications defined. Use 'impl' to add some first.")
+        self._sync_ranking()
+        self.ranked_context = self.ranking.ranked_context()
+        self.ranked_context.result_cache = self.cache
+        self._apply_workers(self.ranked_context)
+        return {"ranks": [rank.objects for rank in self.ranked_context.rankings]}
 
-    def cmd_satisfies(self, args: list[str]) -> None:
-        """Check if an implication is satisfied."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
+    def cmd_rank(self, args: list[str]) -> None:
+        """Create ranked context from implications."""
+        try:
+            result = self.op_rank(args)
+        except CommandError as e:
+            print(e)
             return
-
-        line = " ".join(args)
-        if "->" not in line:
-            print("Usage: satisfies <premise> -> <conclusion>")
+        except ValueError as e:
+            print(f"Error: {e}")
             return
+        print(f"Created ranked context with {len(result['ranks'])} ranks:")
+        for i, objects in enumerate(result["ranks"]):
+            print(f"  Rank {i}: {len(objects)} objects - {objects}")
+
+    def op_satisfies(self, args: list[str]) -> dict:
+        ctx = self._current()
+        premise, conclusion = self._rule_sides(
+            args, "->", "Usage: satisfies <premise> -> <conclusion>"
+        )
+        impl = Implication(premise, conclusion, ctx.attributes)
+        return {"implication": impl, "satisfied": ctx.satisfies(impl)}
 
-        parts = line.split("->")
-        premise = [a.strip() for a in parts[0].split(",") if a.strip()]
-        conclusion = [a.strip() for a in parts[1].split(",") if a.strip()]
-
+    def cmd_satisfies(self, args: list[str]) -> None:
+        """Check if an implication is satisfied."""
         try:
-            impl = Implication(premise, conclusion, ctx.attributes)
-            satisfied = ctx.satisfies(impl)
-            print(f"{impl}: {'✓ satisfied' if satisfied else '✗ not satisfied'}")
+            result = self.op_satisfies(args)
+        except CommandError as e:
+            print(e)
+            return
         except Exception as e:
             print(f"Error: {e}")
-
-    def cmd_cond(self, args: list[str]) -> None:
-        """Check a conditional (ranked semantics)."""
-        if not self.ranked_context:
-            print("No ranked context. Use 'rank' first.")
-            return
-
-        line = " ".join(args)
-        if "|~" not in line:
-            print("Usage: cond <premise> |~ <conclusion>")
             return
+        mark = "✓ satisfied" if result["satisfied"] else "✗ not satisfied"
+        print(f"{result['implication']}: {mark}")
 
-        parts = line.split("|~")
-        premise = [a.strip() for a in parts[0].split(",") if a.strip()]
-        conclusion = [a.strip() for a in parts[1].split(",") if a.strip()]
+    def op_cond(self, args: list[str]) -> dict:
+        ctx = self._ranked()
+        premise, conclusion = self._rule_sides(
+            args, "|~", "Usage: cond <premise> |~ <conclusion>"
+        )
+        cond = Conditional(premise, conclusion, ctx.attributes)
+        return {"conditional": cond, "satisfied": ctx.satisfies(cond)}
 
+    def cmd_cond(self, args: list[str]) -> None:
+        """Check a conditional (ranked semantics)."""
         try:
-            cond = Conditional(premise, conclusion, self.ranked_context.attributes)
-            satisfied = self.ranked_context.satisfies(cond)
-            print(f"{cond}: {'✓ satisfied' if satisfied else '✗ not satisfied'}")
+            result = self.op_cond(args)
+        except CommandError as e:
+            print(e)
+            return
         except Exception as e:
             print(f"Error: {e}")
+            return
+        mark = "✓ satisfied" if result["satisfied"] else "✗ not satisfied"
+        print(f"{result['conditional']}: {mark}")
+
+    def op_basis(self, args: list[str]) -> dict:
+        return {"implications": self._current().get_canonical_basis() or []}
 
     def cmd_basis(self, args: list[str]) -> None:
         """Compute canonical basis."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
+        try:
+            ctx = self._current()
+        except CommandError as e:
+            print(e)
             return
 
-        basis = ctx.get_canonical_basis()
+        def compute(progress: Progress) -> list[Implication] | None:
+            return ctx.get_canonical_basis(progress=progress)
+
+        if not self._run_job("basis", ctx, compute, args):
+            return
+
+        basis = self.op_basis(args)["implications"]
         if basis:
             print(f"Canonical basis ({len(basis)} implications):")
             for impl in basis[:40]:
@@ -342,53 +573,299 @@ Commands:
         else:
             print("No implications in canonical basis.")
 
+    def op_defeasible_basis(self, args: list[str]) -> dict:
+        return {"conditionals": self._ranked().compute_defeasible_basis()}
+
     def cmd_defeasible_basis(self, args: list[str]) -> None:
         """Compute defeasible basis."""
-        if not self.ranked_context:
-            print("No ranked context. Use 'rank' first.")
+        try:
+            ctx = self._ranked()
+        except CommandError as e:
+            print(e)
             return
 
-        basis = self.ranked_context.compute_defeasible_basis()
+        if not self._run_job(
+            "defeasible-basis", ctx, ctx.compute_defeasible_basis, args
+        ):
+            return
+
+        basis = self.op_defeasible_basis(args)["conditionals"]
         print(f"Defeasible basis ({len(basis)} conditionals):")
         for cond in basis[:200]:
             print(f"  {cond}")
         # if len(basis) > 20:
         #     print(f"  ... and {len(basis) - 20} more")
 
-    def cmd_save(self, args: list[str]) -> None:
-        """Save current context to file."""
-        ctx = self.ranked_context or self.context
-        if not ctx:
-            print("No context loaded.")
-            return
+    def _run_job(
+        self,
+        name: str,
+        ctx: FormalContext,
+        target: Callable[[Progress], object],
+        args: list[str],
+    ) -> bool:
+        """
+        Run target in a worker thread. In the foreground the progress is
+        shown until it ends and Ctrl-C cancels it; with a trailing '&' the
+        prompt returns at once. True if the result is ready to be shown.
+        """
+        self.job = Job(name, target).start()
+        self.job_context = ctx
+        self.background = args[-1:] == ["&"]
+        if self.background:
+            print(f"Started {name} in the background. Use 'progress' or 'cancel'.")
+            return False
 
-        if not args:
-            print("Usage: save <filename>")
+        try:
+            # Results already computed or cached come back before the first tick
+            while not self.job.wait(0.5):
+                print(f"\r  {self._progress_line()}\033[K", end="", flush=True)
+        except KeyboardInterrupt:
+            self.job.cancel()
+            self.job.wait()
+        print("\r\033[K", end="")
+        return self._report_job()
+
+    def _progress_line(self) -> str:
+        """One line summary of the job's progress."""
+        progress = self.job.progress
+        parts = [f"{self.job.name} [{progress.phase or 'starting'}]"]
+        if progress.concepts:
+            parts.append(f"{progress.concepts} concepts")
+        if progress.pseudo_intents:
+            parts.append(f"{progress.pseudo_intents} pseudo-intents")
+        if progress.conditionals:
+            parts.append(f"{progress.conditionals} conditionals")
+        position = progress.position
+        if position is not None:
+            attributes = self.job_context.attributes
+            names = ", ".join(attributes[i] for i in position.search(1))
+            if len(names) > 40:
+                names = names[:37] + "..."
+            parts.append(f"at {{{names}}}")
+        parts.append(f"{self.job.elapsed:.1f}s")
+        return ", ".join(parts)
+
+    def _report_job(self) -> bool:
+        """Report how the finished job ended; True if it completed."""
+        job = self.job
+        if job.completed:
+            return True
+        if job.error is not None:
+            print(f"Error in {job.name}: {job.error}")
+            return False
+
+        print(f"Cancelled: {self._progress_line()}")
+        self._show_partial()
+        return False
+
+    def _show_partial(self) -> None:
+        """Print the partial results of a cancelled job."""
+        progress = self.job.progress
+        ctx = self.job_context
+        partial = progress.partial
+        if not partial:
+            print("No partial results.")
+        elif progress.phase == "concepts":
+            print(f"Partial intents ({len(partial)}):")
+            for i, (_, intent) in zip(range(100), partial):
+                print(f"  {i}: {set(ctx._bitarray_to_attributes(intent)) or '{}'}")
+        elif progress.phase == "canonical basis":
+            print(f"Partial canonical basis ({len(partial)} implications):")
+            for impl in partial[:40]:
+                print(f"  {impl}")
+        else:
+            print(f"Partial defeasible basis ({len(partial)} conditionals):")
+            for premise, conclusion in partial[:200]:
+                cond = Conditional(
+                    ctx._bitarray_to_attributes(premise),
+                    ctx._bitarray_to_attributes(conclusion),
+                    ctx.attributes,
+                )
+                print(f"  {cond}")
+
+    def cmd_progress(self, args: list[str]) -> None:
+        """Show the progress of the background computation."""
+        if self.job is None:
+            print("No computation started.")
+        elif self.job.running:
+            print(self._progress_line())
+        else:
+            if self.job.completed:
+                print(f"{self.job.name} finished in {self.job.elapsed:.1f}s.")
+            else:
+                self._report_job()
+            # Reported now, so not again at the next prompt
+            self.background = False
+            self.job = None
+            self.job_context = None
+
+    def cmd_cancel(self, args: list[str]) -> None:
+        """Stop the background computation."""
+        if self.job is None or not self.job.running:
+            print("No computation running.")
             return
+        self.job.cancel()
+        self.job.wait()
+        self.background = False
+        self._report_job()
 
-        filename = args[0]
-        if not filename.endswith(".ctx"):
-            filename += ".ctx"
+    def op_save(self, args: list[str]) -> dict:
+        ctx = self._current()
+        if not args:
+            raise CommandError("Usage: save <filename>")
+        filename, format = self._file_argument(args[:1])
+        save_context(ctx, filename, format)
+        return {"file": filename}
 
+    def cmd_save(self, args: list[str]) -> None:
+        """Save current context to file."""
         try:
-            save_context(ctx, filename)
-            print(f"Saved to data/{filename}")
+            result = self.op_save(args)
+        except CommandError as e:
+            print(e)
+            return
         except Exception as e:
             print(f"Error saving: {e}")
+            return
+        print(f"Saved to data/{result['file']}")
 
     def cmd_clear(self, args: list[str]) -> None:
         """Clear the screen."""
         os.system("clear" if os.name != "nt" else "cls")
 
-    def cmd_reset(self, args: list[str]) -> None:
-        """Unload the current context."""
+    def op_cache(self, args: list[str]) -> dict:
+        action = args[0] if args else ""
+        if action == "on":
+            if self.cache is None:
+                self.cache = ResultCache()
+        elif action == "off":
+            self.cache = None
+        elif action == "clear":
+            if self.cache is not None:
+                self.cache.clear()
+        elif action:
+            raise CommandError("Usage: cache [clear|off|on]")
+
+        for ctx in (self.context, self.ranked_context):
+            if ctx:
+                ctx.result_cache = self.cache
+        self.profiler.cache = self.cache
+        if self.cache is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "directory": self.cache.directory,
+            "entries": len(self.cache),
+            "bytes": self.cache.nbytes,
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+        }
+
+    def cmd_cache(self, args: list[str]) -> None:
+        """Show or manage the persistent result cache."""
+        try:
+            result = self.op_cache(args)
+        except CommandError as e:
+            print(e)
+            return
+        if not result["enabled"]:
+            print("Result cache is off.")
+            return
+        if args[:1] == ["clear"]:
+            print("Cache cleared.")
+        print(f"Result cache: {result['directory']}")
+        print(f"  Entries: {result['entries']} ({result['bytes']} bytes)")
+        print(f"  Hits/misses this session: {result['hits']}/{result['misses']}")
+
+    def _apply_workers(self, ctx: FormalContext) -> None:
+        ctx.concept_workers = self.workers
+        ctx.concept_split_depth = self.split_depth
+
+    def op_workers(self, args: list[str]) -> dict:
+        """Apply '[n] [depth]' to the settings and the loaded contexts."""
+        try:
+            values = [int(arg) for arg in args]
+        except ValueError:
+            raise CommandError("Usage: workers [n] [depth]") from None
+        if len(values) > 2:
+            raise CommandError("Usage: workers [n] [depth]")
+        workers, split_depth = values + [self.workers, self.split_depth][len(values) :]
+        if workers < 1 or split_depth < 0:
+            raise CommandError("Usage: workers [n] [depth]")
+        self.workers, self.split_depth = workers, split_depth
+        for ctx in (self.context, self.ranked_context):
+            if ctx:
+                self._apply_workers(ctx)
+        return {"workers": self.workers, "split_depth": self.split_depth}
+
+    def cmd_workers(self, args: list[str]) -> None:
+        """Show or set the parallel concept enumeration settings."""
+        try:
+            result = self.op_workers(args)
+        except CommandError as e:
+            print(e)
+            return
+        print(
+            f"Concept workers: {result['workers']}, split depth: {result['split_depth']}"
+        )
+
+    def op_profile(self, args: list[str]) -> dict:
+        if args == ["on"]:
+            try:
+                self.profiler.enable()
+            except RuntimeError as e:
+                raise CommandError(str(e))
+        elif args == ["off"]:
+            self.profiler.disable()
+        elif args:
+            raise CommandError("Usage: profile on|off")
+        return {"enabled": self.profiler.enabled}
+
+    def cmd_profile(self, args: list[str]) -> None:
+        """Enable or disable the instrumentation."""
+        state = "on" if self.profiler.enabled else "off"
+        try:
+            enabled = self.op_profile(args)["enabled"]
+        except CommandError as e:
+            print(f"Profiling is {state}. {e}")
+            return
+        if args:
+            print(f"Profiling {'on' if enabled else 'off'}.")
+        else:
+            print(f"Profiling is {state}. Usage: profile on|off")
+
+    def op_stats(self, args: list[str]) -> dict:
+        if args == ["reset"]:
+            self.profiler.reset()
+        return self.profiler.report()
+
+    def cmd_stats(self, args: list[str]) -> None:
+        """Show or reset the collected statistics."""
+        if args == ["reset"]:
+            self.op_stats(args)
+            print("Statistics reset.")
+            return
+        if not self.profiler.enabled and not self.profiler.calls:
+            print("No statistics collected. Use 'profile on' first.")
+            return
+        print(self.profiler.format())
+
+    def op_reset(self, args: list[str]) -> dict:
         self.context = None
         self.ranked_context = None
         self.implications = []
+        self.ranking = None
+        return {}
+
+    def cmd_reset(self, args: list[str]) -> None:
+        """Unload the current context."""
+        self.op_reset(args)
         print("Context unloaded.")
 
     def run(self) -> None:
         """Main REPL loop."""
+        import readline  # enables arrow key navigation in input
+
         print("=" * 60)
         print("Port Royal - Formal Concept Analysis REPL")
         print("=" * 60)
@@ -407,6 +884,7 @@ Commands:
             "intent": self.cmd_intent,
             "impl": self.cmd_impl,
             "impls": self.cmd_impls,
+            "remove-impl": self.cmd_remove_impl,
             "clear-impls": self.cmd_clear_impls,
             "rank": self.cmd_rank,
             "satisfies": self.cmd_satisfies,
@@ -416,10 +894,27 @@ Commands:
             "save": self.cmd_save,
             "clear": self.cmd_clear,
             "reset": self.cmd_reset,
+            "cache": self.cmd_cache,
+            "workers": self.cmd_workers,
+            "profile": self.cmd_profile,
+            "stats": self.cmd_stats,
+            "progress": self.cmd_progress,
+            "cancel": self.cmd_cancel,
         }
+        # Commands that don't touch the context a background job works on
+        # (profile patches methods the job may be calling, so it has to wait)
+        concurrent = {"help", "list", "clear", "stats", "progress", "cancel"}
 
         while self.running:
             try:
+                if self.background and not self.job.running:
+                    # Report a background job once, at the next prompt
+                    self.background = False
+                    if self.job.completed:
+                        name = self.job.name
+                        print(f"{name} finished. Run '{name}' to show it.")
+                    else:
+                        self._report_job()
                 prompt = "port-royal> "
                 if self.ranked_context:
                     prompt = f"port-royal [{self.context.num_objects}obj, ranked]> "
@@ -435,25 +930,169 @@ Commands:
                 args = parts[1:]
 
                 if cmd in ("quit", "exit", "q"):
+                    if self.job is not None and self.job.running:
+                        self.job.cancel()
                     print("Goodbye!")
                     break
 
-                if cmd in commands:
+                if (
+                    self.job is not None
+                    and self.job.running
+                    and cmd in commands
+                    and cmd not in concurrent
+                ):
+                    print(f"{self.job.name} is running. Use 'progress' or 'cancel'.")
+                    continue
+
+                if cmd in commands and self.profiler.enabled:
+                    with self.profiler.phase(cmd):
+                        commands[cmd](args)
+                elif cmd in commands:
                     commands[cmd](args)
                 else:
                     print(f"Unknown command: {cmd}")
                     print("Type 'help' for available commands.")
 
             except KeyboardInterrupt:
-                print("\nUse 'quit' to exit.")
+                if self.job is not None and self.job.running:
+                    print()
+                    self.cmd_cancel([])
+                else:
+                    print("\nUse 'quit' to exit.")
             except EOFError:
                 print("\nGoodbye!")
                 break
 
 
+class BatchSession(PortRoyalREPL):
+    """
+    Runs REPL commands from a script without prompts and writes one JSON
+    object per command: {"line": n, "command": ..., "ok": true, ...} with
+    the command's results, or "ok": false and an "error" message. Blank
+    lines and lines starting with '#' are skipped. Long computations run
+    in the calling thread.
+    """
+
+    # Intents and extents list every concept unless a limit is given
+    page_size = None
+
+    def __init__(self):
+        super().__init__()
+        self.failed = 0
+        # The op_* results of most commands are plain data already; the
+        # do_* methods turn implications and conditionals into names
+        self.handlers = {
+            "load": self.op_load,
+            "info": self.op_info,
+            "intents": self.op_intents,
+            "extents": self.op_extents,
+            "closure": self.op_closure,
+            "extent": self.op_extent,
+            "intent": self.op_intent,
+            "impl": self.do_impl,
+            "impls": self.do_impls,
+            "remove-impl": self.do_remove_impl,
+            "clear-impls": self.op_clear_impls,
+            "rank": self.op_rank,
+            "satisfies": self.do_satisfies,
+            "cond": self.do_cond,
+            "basis": self.do_basis,
+            "defeasible-basis": self.do_defeasible_basis,
+            "save": self.op_save,
+            "reset": self.op_reset,
+            "cache": self.op_cache,
+            "workers": self.op_workers,
+            "profile": self.op_profile,
+            "stats": self.op_stats,
+        }
+
+    def run_lines(self, lines: Iterable[str], out: TextIO) -> int:
+        """Execute every line and write the results; returns the failure count."""
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            cmd, *args = line.split()
+            cmd = cmd.lower()
+            if cmd in ("quit", "exit", "q"):
+                break
+            record = {"line": number, "command": cmd}
+            record.update(self.execute(cmd, args))
+            out.write(json.dumps(record) + "\n")
+        out.flush()
+        return self.failed
+
+    def execute(self, cmd: str, args: list[str]) -> dict:
+        """The result record of one command."""
+        handler = self.handlers.get(cmd)
+        try:
+            if handler is None:
+                raise CommandError(f"Unknown command: {cmd}")
+            if self.profiler.enabled:
+                with self.profiler.phase(cmd):
+                    result = handler(args)
+            else:
+                result = handler(args)
+        except Exception as e:
+            self.failed += 1
+            return {"ok": False, "error": str(e) or type(e).__name__}
+        return {"ok": True, **result}
+
+    def _rule(self, rule: Implication) -> dict:
+        return {
+            "premise": self._names(rule.premise_bits, rule.attributes),
+            "conclusion": self._names(rule.conclusion_bits, rule.attributes),
+        }
+
+    def do_impl(self, args: list[str]) -> dict:
+        result = self.op_impl(args)
+        return {"index": result["index"], **self._rule(result["implication"])}
+
+    def do_impls(self, args: list[str]) -> dict:
+        implications = self.op_impls(args)["implications"]
+        return {"implications": [self._rule(impl) for impl in implications]}
+
+    def do_remove_impl(self, args: list[str]) -> dict:
+        return self._rule(self.op_remove_impl(args)["implication"])
+
+    def do_satisfies(self, args: list[str]) -> dict:
+        return {"satisfied": self.op_satisfies(args)["satisfied"]}
+
+    def do_cond(self, args: list[str]) -> dict:
+        return {"satisfied": self.op_cond(args)["satisfied"]}
+
+    def do_basis(self, args: list[str]) -> dict:
+        implications = self.op_basis(args)["implications"]
+        return {"implications": [self._rule(impl) for impl in implications]}
+
+    def do_defeasible_basis(self, args: list[str]) -> dict:
+        conditionals = self.op_defeasible_basis(args)["conditionals"]
+        return {"conditionals": [self._rule(cond) for cond in conditionals]}
+
+
 def main():
-    repl = PortRoyalREPL()
-    repl.run()
+    parser = argparse.ArgumentParser(
+        description="Port Royal - Formal Concept Analysis REPL"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="run the commands in FILE ('-' for stdin) and print JSON Lines",
+    )
+    args = parser.parse_args()
+
+    if args.batch is None:
+        repl = PortRoyalREPL()
+        repl.run()
+        return
+
+    session = BatchSession()
+    if args.batch == "-":
+        failed = session.run_lines(sys.stdin, sys.stdout)
+    else:
+        with open(args.batch, encoding="utf-8") as f:
+            failed = session.run_lines(f, sys.stdout)
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == "__main__":
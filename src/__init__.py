@@ -3,23 +3,33 @@ Port Royal - Formal Concept Analysis with Preferential Semantics
 """
 
 from src.context import FormalContext
+from src.lattice import ConceptLattice
 from src.ranked_context import RankedContext
 from src.implications import Implication
 from src.conditional import Conditional
 from src.io import load_context, save_context
-from src.algorithms import object_rank
-from src.translated_ranked_context import TranslatedContext
+from src.algorithms import object_rank, IncrementalRanking
+from src.translated_ranked_context import TranslatedContext, SparseTranslatedContext
 from src.latex_export import export_to_latex, export_context_to_file
+from src.instrumentation import Profiler
+from src.progress import Progress, Job, Cancelled
 
 __all__ = [
     "FormalContext",
+    "ConceptLattice",
     "RankedContext",
     "Implication",
     "Conditional",
     "load_context",
     "save_context",
     "object_rank",
+    "IncrementalRanking",
     "TranslatedContext",
+    "SparseTranslatedContext",
     "export_to_latex",
     "export_context_to_file",
+    "Profiler",
+    "Progress",
+    "Job",
+    "Cancelled",
 ]
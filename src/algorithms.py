@@ -1,3 +1,6 @@
+from typing import Iterable
+from bitarray import bitarray
+from bitarray.util import any_and
 from src.context import FormalContext
 from src.implications import Implication
 from src.ranked_context import RankedContext
@@ -6,44 +9,196 @@ from src.ranked_context import RankedContext
 def object_rank(
     input_context: FormalContext, delta: list[Implication]
 ) -> RankedContext:
-    unranked_objects = set(input_context.objects)
-    obj_to_idx = {obj: idx for idx, obj in enumerate(input_context.objects)}
-
-    ranks = []
-    while unranked_objects:
-        current_rank = FormalContext([], input_context.attributes, [])
-        witnessed = set()
-        to_remove = set()
-
-        for g in unranked_objects:
-            g_idx = obj_to_idx[g]
-            g_intent = input_context.incidence[g_idx]
-            # print(f"considering object: {g}")
-
-            remove = True
-            witnessed_by_this_object = set()
-            for impl in delta:
-                sat, wit = impl.sat_wit(g_intent)
-                if not sat:
-                    # print(f"Object {g} does not satisfy {impl}")
-                    remove = False
-                if wit:
-                    # print(f"Object {g} witnesses {impl}")
-                    witnessed_by_this_object.add(impl)
-
-            if remove:
-                current_rank.add_object(g, g_intent)
-                # print(f"Object {g} added to rank: {len(ranks)}")
-                to_remove.add(g)
-                witnessed.update(witnessed_by_this_object)
-
-        unranked_objects -= to_remove
-
-        for impl in witnessed:
-            print(f"Removing {impl} on rank {len(ranks)}")
-        delta = [impl for impl in delta if impl not in witnessed]
-        ranks.append(current_rank)
-
-    return RankedContext(
-        input_context.objects, input_context.attributes, input_context.incidence, ranks
+    """
+    Partition the objects into ranks by the defeasible implications delta.
+
+    Each round places every unranked object that satisfies all implications
+    still in delta, then drops the implications witnessed (premise satisfied)
+    by a placed object. The work is done column-wise: every implication gets
+    its premise extent and its violator extent once, after which a round is a
+    few bitwise operations over the implications still active.
+    """
+    return IncrementalRanking(input_context, delta).ranked_context()
+
+
+class _Witnesses:
+    """An implication of delta with its premise and violator extents."""
+
+    __slots__ = ("implication", "premise_extent", "violators")
+
+    def __init__(self, context: FormalContext, implication: Implication) -> None:
+        self.implication = implication
+        self.premise_extent = context.prime_attributes(implication.premise_bits)
+        conclusion_extent = context.prime_attributes(implication.conclusion_bits)
+        self.violators = self.premise_extent & ~conclusion_extent
+
+
+class _Round:
+    """State of one ranking round: who was unranked and active, who got placed."""
+
+    __slots__ = ("unranked", "active", "placed")
+
+    def __init__(
+        self, unranked: bitarray, active: list[_Witnesses], placed: bitarray
+    ) -> None:
+        self.unranked = unranked
+        self.active = active
+        self.placed = placed
+
+    def copy(self) -> "_Round":
+        return _Round(self.unranked, list(self.active), self.placed)
+
+
+class IncrementalRanking:
+    """
+    Object ranking that follows edits of the defeasible knowledge base.
+
+    The ranking keeps, for every round, the objects still unranked, the
+    implications still active and the objects placed. When an implication is
+    added or removed, the rounds before the first one whose placement it
+    changes are kept as they are and only the remaining rounds are rerun.
+    """
+
+    def __init__(
+        self, context: FormalContext, delta: Iterable[Implication] = ()
+    ) -> None:
+        self.context = context
+        self._entries = [_Witnesses(context, impl) for impl in delta]
+        unranked = bitarray(context.num_objects)
+        unranked.setall(1)
+        self._rounds = self._run([], unranked, list(self._entries))
+
+    @property
+    def delta(self) -> list[Implication]:
+        return [entry.implication for entry in self._entries]
+
+    @property
+    def ranks(self) -> list[bitarray]:
+        """The objects of each rank, most typical first, as bitarrays."""
+        return [rnd.placed.copy() for rnd in self._rounds]
+
+    def rank_of(self, obj_idx: int) -> int:
+        """The rank of the object at position obj_idx."""
+        for rank_idx, rnd in enumerate(self._rounds):
+            if rnd.placed[obj_idx]:
+                return rank_idx
+        raise ValueError(f"Object {obj_idx} is not ranked.")
+
+    def copy(self) -> "IncrementalRanking":
+        """
+        An independent ranking in the same state. The rounds are shared, as
+        add_implication and remove_implication replace them instead of
+        changing them.
+        """
+        ranking = IncrementalRanking.__new__(IncrementalRanking)
+        ranking.context = self.context
+        ranking._entries = list(self._entries)
+        ranking._rounds = list(self._rounds)
+        return ranking
+
+    def add_implication(self, implication: Implication) -> None:
+        """
+        Add an implication to delta. Rounds before the first one in which it
+        blocks a placed object stay as they are. Raises ValueError, leaving
+        the ranking unchanged, if the objects can no longer be ranked.
+        """
+        entry = _Witnesses(self.context, implication)
+        rounds = [rnd.copy() for rnd in self._rounds]
+        for round_idx, rnd in enumerate(rounds):
+            rnd.active.append(entry)
+            if any_and(entry.violators, rnd.placed):
+                rounds = self._run(rounds[:round_idx], rnd.unranked, rnd.active)
+                break
+            if any_and(entry.premise_extent, rnd.placed):
+                # Witnessed in this round and dropped without any effect
+                break
+
+        self._rounds = rounds
+        self._entries.append(entry)
+
+    def remove_implication(self, implication: Implication) -> None:
+        """
+        Remove an implication from delta. Rounds before the first one in which
+        it was the only reason to hold back an object stay as they are.
+        The implication object itself is removed if it is in delta, so that
+        of several equal implications the right one goes; otherwise the
+        first equal one.
+        """
+        implications = [entry.implication for entry in self._entries]
+        position = next(
+            (i for i, impl in enumerate(implications) if impl is implication), None
+        )
+        if position is None:
+            if implication not in implications:
+                raise ValueError(f"{implication} is not in delta.")
+            position = implications.index(implication)
+        entry = self._entries[position]
+
+        rounds = [rnd.copy() for rnd in self._rounds]
+        for round_idx, rnd in enumerate(rounds):
+            if not any(other is entry for other in rnd.active):
+                # Dropped in an earlier round, later rounds never saw it
+                break
+            rnd.active = [other for other in rnd.active if other is not entry]
+            blocked = self._blocked(rnd.active)
+            if (entry.violators & rnd.unranked & ~blocked).any():
+                rounds = self._run(rounds[:round_idx], rnd.unranked, rnd.active)
+                break
+
+        self._rounds = rounds
+        del self._entries[position]
+
+    def _blocked(self, active: list[_Witnesses]) -> bitarray:
+        blocked = bitarray(self.context.num_objects)
+        blocked.setall(0)
+        for entry in active:
+            blocked |= entry.violators
+        return blocked
+
+    def _run(
+        self, rounds: list[_Round], unranked: bitarray, active: list[_Witnesses]
+    ) -> list[_Round]:
+        """Continue the ranking after rounds from the given state."""
+        rounds = list(rounds)
+        while unranked.any():
+            blocked = self._blocked(active)
+            placed = unranked & ~blocked
+            if not placed.any():
+                remaining = ", ".join(
+                    self.context.objects[i] for i in unranked.search(1)
+                )
+                raise ValueError(
+                    f"Objects {remaining} cannot be ranked: each violates an "
+                    "implication that no rankable object witnesses."
+                )
+
+            rounds.append(_Round(unranked, active, placed))
+            active = [
+                entry for entry in active if not any_and(entry.premise_extent, placed)
+            ]
+            unranked = unranked & blocked
+        return rounds
+
+    def ranked_context(self) -> RankedContext:
+        context = self.context
+        ranked = RankedContext(
+            context.objects,
+            context.attributes,
+            context.incidence,
+            [_rank_context(context, rnd.placed) for rnd in self._rounds],
+            context.backend,
+        )
+        # Same names and incidence: no need to hash them again after a re-rank
+        ranked._content_key = context._content_key
+        return ranked
+
+
+def _rank_context(input_context: FormalContext, members: bitarray) -> FormalContext:
+    """The subcontext of input_context on the objects in members."""
+    indices = list(members.search(1))
+    return FormalContext(
+        [input_context.objects[i] for i in indices],
+        input_context.attributes,
+        [input_context.incidence[i] for i in indices],
+        input_context.backend,
     )
@@ -0,0 +1,231 @@
+"""
+Persistent cache of computed results, keyed by the content of a context.
+
+A context is identified by a SHA-256 hash of its object and attribute names
+and its incidence rows. Results that depend on the ranking, such as the
+defeasible basis, are keyed by that hash and the objects of every rank.
+Concepts are stored as the packed ConceptStore buffer and the bases as
+packed (premise, conclusion) bit pairs, one file per result, under a cache
+directory. File modification times record the last use; once the directory
+grows beyond max_bytes the least recently used files are removed. The cache
+counts its hits and misses.
+"""
+
+import hashlib
+import os
+import struct
+from bitarray import bitarray
+from typing import TYPE_CHECKING
+from src.concepts import ConceptStore
+
+if TYPE_CHECKING:
+    from src.context import FormalContext
+    from src.ranked_context import RankedContext
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+_CONCEPTS_HEADER = struct.Struct("<3Q")  # num_objects, num_attributes, count
+_PAIRS_HEADER = struct.Struct("<2Q")  # num_attributes, count
+
+
+def default_cache_dir() -> str:
+    """$PORT_ROYAL_CACHE_DIR, or port-royal in the user's cache directory."""
+    directory = os.environ.get("PORT_ROYAL_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "port-royal")
+
+
+def context_key(context: "FormalContext") -> str:
+    """Hex digest identifying the names and incidence of context."""
+    digest = hashlib.sha256()
+    digest.update(struct.pack("<2Q", context.num_objects, context.num_attributes))
+    for name in context.objects:
+        _hash_name(digest, name)
+    for attr in context.attributes:
+        # TranslatedContext attributes are sets of names
+        _hash_name(digest, attr if isinstance(attr, str) else ",".join(sorted(attr)))
+    for row in context.incidence:
+        digest.update(row.tobytes())
+    return digest.hexdigest()
+
+
+def ranked_key(context: "RankedContext") -> str:
+    """
+    Hex digest of the content key of context and the objects of each rank.
+    The ranks are subcontexts of context, so their rows are not hashed again.
+    """
+    digest = hashlib.sha256(context.content_key().encode("ascii"))
+    for rank in context.rankings:
+        digest.update(struct.pack("<Q", rank.num_objects))
+        for name in rank.objects:
+            _hash_name(digest, name)
+    return digest.hexdigest()
+
+
+def _hash_name(digest, name: str) -> None:
+    encoded = name.encode("utf-8")
+    digest.update(struct.pack("<Q", len(encoded)))
+    digest.update(encoded)
+
+
+class ResultCache:
+    """Size-bounded on-disk LRU cache of concepts and bases."""
+
+    def __init__(
+        self, directory: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory: str = directory or default_cache_dir()
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, context: "FormalContext") -> str:
+        """Key of results that depend on the incidence alone."""
+        return context.content_key()
+
+    def ranked_key(self, context: "RankedContext") -> str:
+        """Key of results that also depend on the ranking."""
+        return context.ranked_key()
+
+    def _path(self, key: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{key}.{kind}")
+
+    def get(self, key: str, kind: str) -> bytes | None:
+        """The stored bytes of a result, marking it as recently used."""
+        path = self._path(key, kind)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, kind: str, data: bytes) -> None:
+        """Store a result, then evict the least recently used ones if needed."""
+        path = self._path(key, kind)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        # Readers never see a partly written file
+        os.replace(temporary, path)
+        self._evict()
+
+    def discard(self, key: str, kind: str) -> None:
+        try:
+            os.remove(self._path(key, kind))
+        except FileNotFoundError:
+            pass
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """(last use, size, path) of every stored result."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the stored results in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            os.remove(path)
+
+    def load_concepts(
+        self, key: str, kind: str, num_objects: int, num_attributes: int
+    ) -> ConceptStore | None:
+        data = self.get(key, kind)
+        if data is None:
+            return None
+        header = _CONCEPTS_HEADER.size
+        if len(data) < header or _CONCEPTS_HEADER.unpack_from(data)[:2] != (
+            num_objects,
+            num_attributes,
+        ):
+            self.discard(key, kind)
+            return None
+        count = _CONCEPTS_HEADER.unpack_from(data)[2]
+        try:
+            return ConceptStore.frombytes(
+                num_objects, num_attributes, data[header:], count
+            )
+        except ValueError:
+            self.discard(key, kind)
+            return None
+
+    def store_concepts(self, key: str, kind: str, store: ConceptStore) -> None:
+        header = _CONCEPTS_HEADER.pack(
+            store.num_objects, store.num_attributes, len(store)
+        )
+        self.put(key, kind, header + store.tobytes())
+
+    def load_pairs(
+        self, key: str, kind: str, num_attributes: int
+    ) -> list[tuple[bitarray, bitarray]] | None:
+        """Stored (premise, conclusion) attribute set pairs, e.g. a basis."""
+        data = self.get(key, kind)
+        if data is None:
+            return None
+        size = (num_attributes + 7) // 8
+        header = _PAIRS_HEADER.size
+        if len(data) < header:
+            self.discard(key, kind)
+            return None
+        stored_attributes, count = _PAIRS_HEADER.unpack_from(data)
+        if (
+            stored_attributes != num_attributes
+            or len(data) != header + count * 2 * size
+        ):
+            self.discard(key, kind)
+            return None
+
+        pairs = []
+        # Pairs of a context without attributes are empty, so count them
+        for pair_idx in range(count):
+            offset = header + pair_idx * 2 * size
+            premise, conclusion = bitarray(), bitarray()
+            premise.frombytes(data[offset : offset + size])
+            conclusion.frombytes(data[offset + size : offset + 2 * size])
+            del premise[num_attributes:]
+            del conclusion[num_attributes:]
+            pairs.append((premise, conclusion))
+        return pairs
+
+    def store_pairs(
+        self,
+        key: str,
+        kind: str,
+        num_attributes: int,
+        pairs: list[tuple[bitarray, bitarray]],
+    ) -> None:
+        chunks = [_PAIRS_HEADER.pack(num_attributes, len(pairs))]
+        for premise, conclusion in pairs:
+            chunks.append(premise.tobytes())
+            chunks.append(conclusion.tobytes())
+        self.put(key, kind, b"".join(chunks))
@@ -0,0 +1,223 @@
+"""
+Compact storage for enumerated concepts.
+
+All intents and extents live in one packed byte buffer; names are only
+decoded when an element is accessed through one of the sequence views.
+"""
+
+from collections.abc import Sequence
+from typing import Callable, Iterable, Iterator, overload
+from bitarray import bitarray
+
+
+class ConceptStore:
+    """
+    Append-only packed store of (extent, intent) pairs.
+    Every concept occupies one fixed-size record: the intent bytes followed by
+    the extent bytes.
+    """
+
+    def __init__(self, num_objects: int, num_attributes: int) -> None:
+        self.num_objects: int = num_objects
+        self.num_attributes: int = num_attributes
+        self._intent_size: int = (num_attributes + 7) // 8
+        self._record_size: int = self._intent_size + (num_objects + 7) // 8
+        self._buffer: bytearray = bytearray()
+        self._count: int = 0
+        # Intents as integer keys (see intent_key) and key -> concept id,
+        # built on first use and kept up to date by append
+        self._keys: list[int] | None = None
+        self._ids: dict[int, int] | None = None
+
+    def append(self, extent: bitarray, intent: bitarray) -> None:
+        intent_bytes = intent.tobytes()
+        self._buffer += intent_bytes
+        self._buffer += extent.tobytes()
+        if self._keys is not None:
+            key = int.from_bytes(intent_bytes, "big")
+            self._keys.append(key)
+            self._ids[key] = self._count  # type: ignore[index]
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add_object(self, members: Iterable[int]) -> None:
+        """
+        Extend every extent by one new object, which belongs to the extents
+        of the concepts in members. The records are only rewritten when
+        the extents need another byte; they are then widened one byte
+        column at a time, each copied for all records by one strided slice.
+        """
+        obj_idx = self.num_objects
+        self.num_objects += 1
+        record_size = self._intent_size + (self.num_objects + 7) // 8
+        if record_size != self._record_size:
+            old_size = self._record_size
+            buffer = bytearray(self._count * record_size)
+            for column in range(old_size):
+                buffer[column::record_size] = self._buffer[column::old_size]
+            self._buffer = buffer
+            self._record_size = record_size
+
+        # The byte mask of the new bit, in the bit order used by _decode
+        bit = bitarray(8)
+        bit.setall(0)
+        bit[obj_idx % 8] = 1
+        mask = bit.tobytes()[0]
+        offset = self._intent_size + obj_idx // 8
+        for i in members:
+            self._buffer[self._index(i) * record_size + offset] |= mask
+
+    def intent_key(self, intent: bitarray) -> int:
+        """
+        The packed bytes of an intent as an integer. Keys compare, hash and
+        intersect with & like the intents, but much faster than bitarrays.
+        """
+        return int.from_bytes(intent.tobytes(), "big")
+
+    def key_bits(self, key: int) -> bitarray:
+        """The intent of an intent_key as a fresh bitarray."""
+        bits = bitarray()
+        bits.frombytes(key.to_bytes(self._intent_size, "big"))
+        del bits[self.num_attributes :]
+        return bits
+
+    def intent_keys(self) -> list[int]:
+        """The intent_key of every concept, kept by the store; do not mutate."""
+        if self._keys is None:
+            starts = (i * self._record_size for i in range(self._count))
+            self._keys = [
+                int.from_bytes(self._buffer[start : start + self._intent_size], "big")
+                for start in starts
+            ]
+            self._ids = {key: i for i, key in enumerate(self._keys)}
+        return self._keys
+
+    def intent_ids(self) -> dict[int, int]:
+        """intent_key -> concept id, kept like intent_keys; do not mutate."""
+        self.intent_keys()
+        return self._ids  # type: ignore[return-value]
+
+    def copy(self) -> "ConceptStore":
+        """An independent store with the same concepts."""
+        store = ConceptStore.frombytes(
+            self.num_objects, self.num_attributes, self._buffer, self._count
+        )
+        if self._keys is not None:
+            store._keys = list(self._keys)
+            store._ids = dict(self._ids)  # type: ignore[arg-type]
+        return store
+
+    def tobytes(self) -> bytes:
+        """The packed records, as accepted by frombytes."""
+        return bytes(self._buffer)
+
+    @classmethod
+    def frombytes(
+        cls, num_objects: int, num_attributes: int, data: bytes, count: int
+    ) -> "ConceptStore":
+        """
+        A store holding the count packed records in data. The count is
+        needed because records of a context without objects and attributes
+        are empty.
+        """
+        store = cls(num_objects, num_attributes)
+        if len(data) != count * store._record_size:
+            raise ValueError("Data size doesn't match the number of concepts.")
+        store._count = count
+        store._buffer = bytearray(data)
+        return store
+
+    def __iter__(self) -> Iterator[tuple[bitarray, bitarray]]:
+        """Iterate over (extent, intent) bitarray pairs."""
+        for i in range(self._count):
+            yield self.extent_bits(i), self.intent_bits(i)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the packed buffer in bytes."""
+        return len(self._buffer)
+
+    def _index(self, i: int) -> int:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("concept index out of range")
+        return i
+
+    def intent_bits(self, i: int) -> bitarray:
+        """The intent of concept i as a fresh bitarray."""
+        record = self._index(i) * self._record_size
+        return self._decode(record, record + self._intent_size, self.num_attributes)
+
+    def extent_bits(self, i: int) -> bitarray:
+        """The extent of concept i as a fresh bitarray."""
+        record = self._index(i) * self._record_size
+        return self._decode(
+            record + self._intent_size, record + self._record_size, self.num_objects
+        )
+
+    def _decode(self, start: int, stop: int, length: int) -> bitarray:
+        bits = bitarray()
+        bits.frombytes(self._buffer[start:stop])
+        del bits[length:]
+        return bits
+
+
+class ConceptView(Sequence):
+    """
+    Read-only sequence of name sets backed by a ConceptStore.
+    Elements are decoded into frozensets on access and not kept.
+    It compares equal to a list or tuple with the same elements, and
+    slicing and + produce plain lists, as with the lists it replaces.
+    """
+
+    def __init__(
+        self,
+        bits_of: Callable[[int], bitarray],
+        length: Callable[[], int],
+        decode: Callable[[bitarray], frozenset[str]],
+    ) -> None:
+        self._bits_of = bits_of
+        self._length = length
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return self._length()
+
+    @overload
+    def __getitem__(self, index: int) -> frozenset[str]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[frozenset[str]]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._decode(self._bits_of(index))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ConceptView):
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                mine == theirs for mine, theirs in zip(self, other)
+            )
+        return NotImplemented
+
+    # Mutable like the lists it stands in for, so not hashable
+    __hash__ = None  # type: ignore[assignment]
+
+    def __add__(self, other: Sequence) -> list[frozenset[str]]:
+        if not isinstance(other, (list, tuple, ConceptView)):
+            return NotImplemented
+        return list(self) + list(other)
+
+    def __radd__(self, other: Sequence) -> list:
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -1,6 +1,19 @@
-from typing import override, Generator, Tuple
+from contextlib import contextmanager
+from itertools import islice
+from typing import TYPE_CHECKING, override, Generator, Iterable, Iterator, Tuple
 from bitarray import bitarray
 from src.implications import Implication
+from src import packed
+from src.concepts import ConceptStore, ConceptView
+from src.enumeration import ALGORITHMS
+from src.implication_closure import CLOSURE_ALGORITHMS, LinClosure, WildClosure
+from src.lattice import ConceptLattice
+from src.progress import Progress
+
+if TYPE_CHECKING:
+    from src.cache import ResultCache
+
+BACKENDS = ("bitarray", "numpy")
 
 
 class FormalContext:
@@ -10,17 +23,53 @@ class FormalContext:
         objects: list[str],
         attributes: list[str],
         incidence: list[bitarray] | None = None,
+        backend: str = "bitarray",
+        attribute_extents: list[bitarray] | None = None,
     ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown backend: '{backend}'. Expected one of {', '.join(BACKENDS)}."
+            )
+        if backend == "numpy":
+            packed.require_numpy()
+        self.backend: str = backend
         self.objects: list[str] = objects
         self.attributes: list[str] = attributes
         self.attributes_bits: bitarray = bitarray("1" * len(attributes))
         self.num_objects: int = len(objects)
         self.num_attributes: int = len(attributes)
-        self._intents_list: list[frozenset[str]] | None = None
-        self._extents_list: list[frozenset[str]] | None = None
+        self._concepts: ConceptStore | None = None
+        self._intents_list: ConceptView | None = None
+        self._extents_list: ConceptView | None = None
         self._concepts_dirty: bool = True
+        # Whether the store or its views were handed out since they were set,
+        # so that add_object has to update a copy of them
+        self._concepts_shared: bool = False
         self._attribute_extents_cache: list[bitarray] | None = None
+        # Name -> position maps, built on first lookup
+        self._object_index: dict[str, int] | None = None
+        self._attribute_index: dict[str, int] | None = None
         self._canonical_basis: list[Implication] | None = None
+        self._lattice: ConceptLattice | None = None
+        self._concept_algorithm: str = "nextclosure"
+        # Number of worker processes used by intents_list; 1 means sequential
+        self.concept_workers: int = 1
+        # Depth of the generation tree at which parallel enumeration splits
+        # the search into worker tasks; deeper gives more, smaller tasks
+        self.concept_split_depth: int = 1
+        # Update computed concepts in place on add_object instead of discarding them
+        self.incremental: bool = False
+        # Persistent store consulted before computing concepts or bases
+        self.result_cache: "ResultCache | None" = None
+        # Digest of the content that keys the stored results, see content_key
+        self._content_key: str | None = None
+        # Packed uint64 row and column matrices, only used by the numpy backend
+        # and rebuilt lazily after mutation
+        self._packed_rows = None
+        self._packed_columns = None
+        # Nesting depth of bulk_update blocks and whether they saw a mutation
+        self._bulk_depth: int = 0
+        self._pending_invalidation: bool = False
 
         if incidence is None:
             self.incidence: list[bitarray] = [
@@ -38,69 +87,284 @@ class FormalContext:
                     )
             self.incidence = incidence
 
-        self._build_attribute_extent_cache()
+        if attribute_extents is None:
+            self._build_attribute_extent_cache()
+        else:
+            # Columns supplied by the caller (e.g. read from a binary file)
+            if len(attribute_extents) != self.num_attributes or any(
+                len(column) != self.num_objects for column in attribute_extents
+            ):
+                raise ValueError(
+                    "Attribute extents don't match the size of the incidence matrix"
+                )
+            self._attribute_extents_cache = attribute_extents
 
     @property
-    def intents_list(self) -> list[frozenset[str]]:
+    def concepts(self) -> ConceptStore:
+        """Lazily compute and cache all concepts as packed (extent, intent) bits."""
+        if self._concepts_dirty or self._concepts is None:
+            self._compute_all_concepts()
+        self._concepts_shared = True
+        return self._concepts  # type: ignore
+
+    @property
+    def intents_list(self) -> ConceptView:
         """Lazily compute and cache all concept intents."""
         if self._concepts_dirty or self._intents_list is None:
             self._compute_all_concepts()
+        self._concepts_shared = True
         return self._intents_list  # type: ignore
 
     @property
-    def extents_list(self) -> list[frozenset[str]]:
+    def extents_list(self) -> ConceptView:
         """Lazily compute and cache all concept extents."""
         if self._concepts_dirty or self._extents_list is None:
             self._compute_all_concepts()
+        self._concepts_shared = True
         return self._extents_list  # type: ignore
 
+    def compute_concepts(self, progress: Progress | None = None) -> ConceptStore:
+        """
+        The concepts, enumerated if needed while reporting to progress.
+        Raises Cancelled if progress is cancelled; the concepts found so far
+        are then left in progress.partial.
+        """
+        if self._concepts_dirty or self._concepts is None:
+            self._compute_all_concepts(progress)
+        self._concepts_shared = True
+        return self._concepts  # type: ignore
+
+    def iter_concepts(
+        self, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Tuple[bitarray, bitarray]]:
+        """
+        (extent, intent) pairs of the concepts offset .. offset + limit - 1,
+        in the order of intents_list. Concepts that were not computed yet
+        are enumerated lazily and not stored, so the enumeration stops as
+        soon as the last requested concept has been produced.
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset and limit must be non-negative.")
+        stop = None if limit is None else offset + limit
+
+        if not self._concepts_dirty and self._concepts is not None:
+            store = self._concepts
+            self._concepts_shared = True
+            end = len(store) if stop is None else min(stop, len(store))
+            return (
+                (store.extent_bits(i), store.intent_bits(i)) for i in range(offset, end)
+            )
+        if self.concept_workers > 1:
+            # Ordered parallel enumeration only yields once every worker is
+            # done; NextClosure produces the same lectic order lazily
+            concepts = self.generate_all_concepts("nextclosure", workers=1)
+        else:
+            concepts = self.generate_all_concepts()
+        return islice(concepts, offset, stop)
+
+    @property
+    def concept_algorithm(self) -> str:
+        """Enumeration engine used by intents_list and extents_list."""
+        return self._concept_algorithm
+
+    @concept_algorithm.setter
+    def concept_algorithm(self, algorithm: str) -> None:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"Unknown algorithm: '{algorithm}'. Expected one of {', '.join(ALGORITHMS)}."
+            )
+        if algorithm != self._concept_algorithm:
+            self._concept_algorithm = algorithm
+            # The concept order depends on the engine
+            self._concepts_dirty = True
+
     def _build_attribute_extent_cache(self) -> None:
         """Build cache of attribute extents for fast lookup."""
         self._attribute_extents_cache = []
-        for attr_idx in range(self.num_attributes):
+        for _ in range(self.num_attributes):
             extent = bitarray(self.num_objects)
-            for obj_idx in range(self.num_objects):
-                extent[obj_idx] = self.incidence[obj_idx][attr_idx]
+            extent.setall(0)
             self._attribute_extents_cache.append(extent)
 
-    def _invalidate_caches(self) -> None:
-        """Invalidate all caches when context is mutated."""
+        # Transpose by visiting only the crosses of each row
+        for obj_idx, row in enumerate(self.incidence):
+            for attr_idx in row.search(1):
+                self._attribute_extents_cache[attr_idx][obj_idx] = 1
+
+        self._packed_rows = None
+        self._packed_columns = None
+
+    def _packed_matrices(self) -> tuple:
+        """The packed (rows, columns) matrices of the numpy backend."""
+        if self._packed_rows is None:
+            self._packed_rows = packed.pack_bits(self.incidence, self.num_attributes)
+            self._packed_columns = packed.pack_bits(
+                self._attribute_columns(), self.num_objects
+            )
+        return self._packed_rows, self._packed_columns
+
+    def _invalidate_caches(self, keep_concepts: bool = False) -> None:
+        """
+        Invalidate all caches when context is mutated.
+        The attribute extent cache is kept in step by the mutators themselves.
+        Inside bulk_update the concepts are only discarded when the batch ends.
+        """
+        self._canonical_basis = None
+        self._lattice = None
+        self._content_key = None
+        self._packed_rows = None
+        self._packed_columns = None
+        if keep_concepts:
+            return
+        if self._bulk_depth:
+            self._pending_invalidation = True
+            return
+        self._discard_concepts()
+
+    def _discard_concepts(self) -> None:
+        self._pending_invalidation = False
         self._concepts_dirty = True
+        self._concepts = None
         self._intents_list = None
         self._extents_list = None
-        self._canonical_basis = None
-        # Rebuild attribute extent cache
-        self._build_attribute_extent_cache()
 
-    def _compute_all_concepts(self) -> None:
+    @contextmanager
+    def bulk_update(self) -> Iterator["FormalContext"]:
         """
-        Internal method to generate and store all concepts.
-        Converts bitarray concepts into frozensets.
+        Group several mutations so that computed results are invalidated once,
+        when the outermost block exits. Concepts read inside the block may
+        not reflect the edits made so far; results that combine the concepts
+        with the incidence, such as the lattice, recompute them first.
+
+            with context.bulk_update():
+                for obj, attr in pairs:
+                    context.add_relation(obj, attr)
         """
-        self._intents_list = []
-        self._extents_list = []
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth == 0 and self._pending_invalidation:
+                self._invalidate_caches()
 
-        for extent_bits, intent_bits in self.generate_all_concepts():
-            # Convert the bitarrays to frozensets before storing
-            self._extents_list.append(self._bitarray_to_objects(extent_bits))
-            self._intents_list.append(self._bitarray_to_attributes(intent_bits))
+    def _current_concepts(self, progress: Progress | None = None) -> ConceptStore:
+        """
+        The concepts of the current incidence, even inside bulk_update, for
+        results that would not match stale concepts.
+        """
+        if self._pending_invalidation:
+            self._discard_concepts()
+        return self.compute_concepts(progress)
 
-        self._concepts_dirty = False
+    def content_key(self) -> str:
+        """
+        Hex digest of the names and incidence that keys the results of this
+        context in a ResultCache. Hashed once until the context is edited.
+        """
+        if self._content_key is None:
+            from src.cache import context_key
+
+            self._content_key = context_key(self)
+        return self._content_key
 
-    def generate_all_concepts(self) -> Generator[Tuple[bitarray, bitarray], None, None]:
+    def _compute_all_concepts(self, progress: Progress | None = None) -> None:
         """
-        The pairs are (extent, intent) bitarray objects.
+        Internal method to generate and store all concepts.
+        The bitarrays are packed into a ConceptStore; the intent and extent
+        lists only decode names when an element is accessed.
         """
-        current_intent = self.closure(bitarray("0" * self.num_attributes))
-        current_extent = self.prime_attributes(current_intent)
-        yield current_extent, current_intent
+        cache = self.result_cache
+        if cache is not None:
+            # The concept order depends on the engine; ordered parallel
+            # enumeration yields the lectic order of NextClosure
+            if self.concept_workers > 1:
+                kind = "concepts-nextclosure"
+            else:
+                kind = f"concepts-{self._concept_algorithm}"
+            key = cache.key(self)
+            store = cache.load_concepts(
+                key, kind, self.num_objects, self.num_attributes
+            )
+            if store is not None:
+                self._set_concepts(store)
+                return
+
+        store = ConceptStore(self.num_objects, self.num_attributes)
+        if progress is None:
+            for extent_bits, intent_bits in self.generate_all_concepts():
+                store.append(extent_bits, intent_bits)
+        else:
+            progress.phase = "concepts"
+            progress.partial = store
+            for extent_bits, intent_bits in self.generate_all_concepts(
+                progress=progress
+            ):
+                progress.check()
+                store.append(extent_bits, intent_bits)
+                progress.concepts += 1
+                progress.position = intent_bits
+        self._set_concepts(store)
+        if cache is not None:
+            cache.store_concepts(key, kind, store)
+
+    def _set_concepts(self, store: ConceptStore) -> None:
+        """Install store as the current, valid set of concepts."""
+        self._concepts = store
+        self._intents_list = ConceptView(
+            store.intent_bits, store.__len__, self._bitarray_to_attributes
+        )
+        self._extents_list = ConceptView(
+            store.extent_bits, store.__len__, self._bitarray_to_objects
+        )
+        self._concepts_dirty = False
+        self._concepts_shared = False
 
-        top_intent = bitarray("1" * self.num_attributes)
+    def generate_all_concepts(
+        self,
+        algorithm: str | None = None,
+        workers: int | None = None,
+        ordered: bool = True,
+        split_depth: int | None = None,
+        progress: Progress | None = None,
+    ) -> Generator[Tuple[bitarray, bitarray], None, None]:
+        """
+        The pairs are (extent, intent) bitarray objects.
 
-        while current_intent != top_intent:
-            current_intent = self._next_intent(current_intent)
-            current_extent = self.prime_attributes(current_intent)
-            yield current_extent, current_intent
+        algorithm selects the enumeration engine ("nextclosure", "cbo" or
+        "inclose") and defaults to concept_algorithm. Only NextClosure yields
+        the concepts in lectic order.
+
+        With more than one worker (default: concept_workers) the In-Close
+        search tree is split across worker processes and algorithm is
+        ignored. The concepts then come in lectic order, or unordered as
+        soon as each subtree is done if ordered is False. split_depth
+        (default: concept_split_depth) is the depth at which the tree is split.
+        The workers poll progress and stop when it is cancelled; the other
+        engines yield often enough for the caller to poll it.
+        """
+        if workers is None:
+            workers = self.concept_workers
+        if workers > 1:
+            from src.parallel import parallel_concepts
+
+            if split_depth is None:
+                split_depth = self.concept_split_depth
+            return parallel_concepts(
+                self,
+                workers=workers,
+                split_depth=split_depth,
+                ordered=ordered,
+                progress=progress,
+            )
+
+        if algorithm is None:
+            algorithm = self._concept_algorithm
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"Unknown algorithm: '{algorithm}'. Expected one of {', '.join(ALGORITHMS)}."
+            )
+        return ALGORITHMS[algorithm](self)
 
     def _next_intent(self, intent: bitarray) -> bitarray:
         temp_intent = intent.copy()
@@ -114,34 +378,116 @@ class FormalContext:
 
                 new_intent = self.closure(candidate_basis)
 
-                mask = bitarray("1" * self.num_attributes)
-                for j in range(i, self.num_attributes):
-                    mask[j] = 0
-
-                if (new_intent & mask) == (temp_intent & mask):
+                # Valid if the closure adds no attribute before i
+                if new_intent[:i] == temp_intent[:i]:
                     return new_intent  # This is the next valid intent
 
         return bitarray("1" * self.num_attributes)
 
+    @staticmethod
+    def _build_index(names: Iterable) -> dict:
+        """Map every name to its first position."""
+        index: dict = {}
+        for i, name in enumerate(names):
+            index.setdefault(name, i)
+        return index
+
+    def _object_positions(self) -> dict[str, int]:
+        if self._object_index is None:
+            self._object_index = self._build_index(self.objects)
+        return self._object_index
+
+    def _attribute_positions(self) -> dict[str, int]:
+        if self._attribute_index is None:
+            self._attribute_index = self._build_index(self.attributes)
+        return self._attribute_index
+
+    def object_index(self, name: str) -> int:
+        """Position of an object, in constant time."""
+        try:
+            return self._object_positions()[name]
+        except KeyError:
+            raise ValueError(f"Object '{name}' not in context.") from None
+
+    def attribute_index(self, name: str) -> int:
+        """Position of an attribute, in constant time."""
+        try:
+            return self._attribute_positions()[name]
+        except KeyError:
+            raise ValueError(f"Attribute '{name}' not in context.") from None
+
     def _bitarray_to_objects(self, bits: bitarray) -> frozenset[str]:
         """Converts an object bitarray to a frozenset of object names."""
-        return frozenset(self.objects[i] for i, bit in enumerate(bits) if bit)
+        return frozenset(self.objects[i] for i in bits.search(1))
+
+    def _objects_to_bitarray(self, object_set: Iterable[str]) -> bitarray:
+        """Converts an object set to a bitarray"""
+        return self._objects_to_bitarrays([object_set])[0]
 
-    def _attributes_to_bitarray(self, attribute_set: frozenset[str]) -> bitarray:
+    def _attributes_to_bitarray(self, attribute_set: Iterable[str]) -> bitarray:
         """Converts an attribute set to a bitarray"""
-        result = bitarray(self.num_attributes)
-        result.setall(0)
-        for attr in attribute_set:
-            idx = self.attributes.index(attr)
-            result[idx] = 1
-        return result
+        return self._attributes_to_bitarrays([attribute_set])[0]
 
     def _bitarray_to_attributes(self, bits: bitarray) -> frozenset[str]:
         """Converts an attribute bitarray to a frozenset of attribute names."""
-        return frozenset(self.attributes[i] for i, bit in enumerate(bits) if bit)
+        return frozenset(self.attributes[i] for i in bits.search(1))
+
+    def _objects_to_bitarrays(
+        self, object_sets: Iterable[Iterable[str]]
+    ) -> list[bitarray]:
+        """Converts many object sets to bitarrays at once."""
+        return self._names_to_bitarrays(
+            object_sets, self._object_positions(), self.num_objects, "Object"
+        )
+
+    def _attributes_to_bitarrays(
+        self, attribute_sets: Iterable[Iterable[str]]
+    ) -> list[bitarray]:
+        """Converts many attribute sets to bitarrays at once."""
+        return self._names_to_bitarrays(
+            attribute_sets,
+            self._attribute_positions(),
+            self.num_attributes,
+            "Attribute",
+        )
+
+    def _bitarrays_to_objects(
+        self, bits_list: Iterable[bitarray]
+    ) -> list[frozenset[str]]:
+        """Converts many object bitarrays to frozensets of names at once."""
+        objects = self.objects
+        return [frozenset(objects[i] for i in bits.search(1)) for bits in bits_list]
+
+    def _bitarrays_to_attributes(
+        self, bits_list: Iterable[bitarray]
+    ) -> list[frozenset[str]]:
+        """Converts many attribute bitarrays to frozensets of names at once."""
+        attributes = self.attributes
+        return [frozenset(attributes[i] for i in bits.search(1)) for bits in bits_list]
+
+    @staticmethod
+    def _names_to_bitarrays(
+        name_sets: Iterable[Iterable[str]], index: dict, length: int, kind: str
+    ) -> list[bitarray]:
+        empty = bitarray(length)
+        empty.setall(0)
+        result = []
+        for names in name_sets:
+            bits = empty.copy()
+            for name in names:
+                try:
+                    bits[index[name]] = 1
+                except KeyError:
+                    raise ValueError(f"{kind} '{name}' not in context.") from None
+            result.append(bits)
+        return result
 
     def prime_objects(self, objects: bitarray) -> bitarray:
         """Compute the intent of a set of objects (all common attributes)."""
+        if self.backend == "numpy":
+            rows, _ = self._packed_matrices()
+            return packed.and_reduce(rows, objects, self.num_attributes)
+
         if objects.count() == 0:
             result = bitarray(self.num_attributes)
             result.setall(1)
@@ -158,6 +504,10 @@ class FormalContext:
 
     def prime_attributes(self, attributes: bitarray) -> bitarray:
         """Compute the extent of a set of attributes (all objects having these attributes)."""
+        if self.backend == "numpy":
+            _, columns = self._packed_matrices()
+            return packed.and_reduce(columns, attributes, self.num_objects)
+
         if attributes.count() == 0:
             result = bitarray(self.num_objects)
             result.setall(1)
@@ -178,12 +528,26 @@ class FormalContext:
 
     def set_relation(self, obj_idx: int, attr_idx: int, value: bool = True) -> None:
         """Set whether object obj_idx has attribute attr_idx."""
-        self.incidence[obj_idx][attr_idx] = value
+        self._writable(self.incidence, obj_idx)[attr_idx] = value
+        # Flip the single bit in the column cache instead of rebuilding it
+        self._writable(self._attribute_columns(), attr_idx)[obj_idx] = value
         self._invalidate_caches()
 
+    @staticmethod
+    def _writable(matrix: list[bitarray], idx: int) -> bitarray:
+        """
+        matrix[idx], replaced by a copy first if it is read-only, as are the
+        rows and columns viewing a memory-mapped binary file.
+        """
+        bits = matrix[idx]
+        if bits.readonly:
+            bits = matrix[idx] = bits.copy()
+        return bits
+
     def add_object(self, name: str, incidence_row: bitarray | None = None) -> None:
         """Add a new object (row) to the context."""
-        if name in self.objects:
+        object_index = self._object_positions()
+        if name in object_index:
             raise ValueError(f"Object '{name}' already exists.")
         if incidence_row is None:
             incidence_row = bitarray(self.num_attributes)
@@ -191,21 +555,67 @@ class FormalContext:
         elif len(incidence_row) != self.num_attributes:
             raise ValueError("Incidence row length must match number of attributes.")
 
+        concepts = self._concepts
+        if not self.incremental or self._concepts_dirty or self._pending_invalidation:
+            concepts = None
+
+        columns = self._attribute_columns()
+        object_index[name] = self.num_objects
         self.objects.append(name)
         self.incidence.append(incidence_row)
         self.num_objects += 1
-        self._invalidate_caches()
+        for attr_idx in range(self.num_attributes):
+            self._writable(columns, attr_idx).append(incidence_row[attr_idx])
+
+        if concepts is not None:
+            # Copy on write: a store or views held by callers, e.g. by a
+            # TranslatedContext, must keep the old concepts
+            if self._concepts_shared:
+                concepts = concepts.copy()
+            self._set_concepts(self._add_intent(concepts, incidence_row))
+            self._invalidate_caches(keep_concepts=True)
+        else:
+            self._invalidate_caches()
 
-    def add_relation(self, obj_name: str, attr_name: str) -> None:
-        try:
-            obj_idx = self.objects.index(obj_name)
-        except ValueError:
-            raise ValueError(f"Object '{obj_name}' not in context.")
-        try:
-            attr_idx = self.attributes.index(attr_name)
-        except ValueError:
-            raise ValueError(f"Attribute '{attr_name}' not in context.")
+    def _add_intent(self, concepts: ConceptStore, row: bitarray) -> ConceptStore:
+        """
+        Update the concepts of the context before the last object (with
+        intent row) was added, in place in the given store, in the style of
+        Godin's incremental algorithm.
+
+        Every old intent stays an intent. An old concept whose intent is
+        contained in row gains the new object in its extent. Every other
+        intersection B & row that is not an intent yet becomes a new concept;
+        its extent is the extent of the smallest old intent B producing it,
+        plus the new object. The old concepts keep their positions and the
+        new ones are appended, so the order differs from a fresh enumeration.
+        """
+        keys = concepts.intent_keys()
+        known = concepts.intent_ids()
+        row_key = concepts.intent_key(row)
+        members = []
+        # New intent -> the old concept with the smallest intent producing it,
+        # which is its closure in the old context
+        generators: dict[int, int] = {}
+        for i, key in enumerate(keys):
+            meet = key & row_key
+            if meet == key:
+                members.append(i)
+            elif meet not in known:
+                best = generators.get(meet)
+                if best is None or key.bit_count() < keys[best].bit_count():
+                    generators[meet] = i
+
+        concepts.add_object(members)
+        for meet, i in generators.items():
+            extent = concepts.extent_bits(i)
+            extent[-1] = 1
+            concepts.append(extent, concepts.key_bits(meet))
+        return concepts
 
+    def add_relation(self, obj_name: str, attr_name: str) -> None:
+        obj_idx = self.object_index(obj_name)
+        attr_idx = self.attribute_index(attr_name)
         self.set_relation(obj_idx, attr_idx, True)
 
     def has_attribute(self, obj_idx: int, attr_idx: int) -> bool:
@@ -216,6 +626,12 @@ class FormalContext:
         """Get all attributes of a given object."""
         return self.incidence[obj_idx].copy()
 
+    def _attribute_columns(self) -> list[bitarray]:
+        """The cached attribute extents themselves (not copies); do not mutate."""
+        if self._attribute_extents_cache is None:
+            self._build_attribute_extent_cache()
+        return self._attribute_extents_cache  # type: ignore
+
     def attribute_extent(self, attr_idx: int) -> bitarray:
         """Get all objects that have a given attribute."""
         if self._attribute_extents_cache is None:
@@ -224,35 +640,93 @@ class FormalContext:
 
     def satisfies(self, implication: Implication) -> bool:
         """returns True if the implication is satisfied by the context"""
-        return all(
-            implication.satisfied(self.object_intent(i))
-            for i in range(self.num_objects)
-        )
-
-    def get_canonical_basis(self) -> list[Implication] | None:
-        """Lazily compute and cache the canonical basis."""
+        # Every object having the premise must also have the conclusion
+        premise_extent = self.prime_attributes(implication.premise_bits)
+        conclusion_extent = self.prime_attributes(implication.conclusion_bits)
+        return not (premise_extent & ~conclusion_extent).any()
+
+    def get_lattice(self) -> ConceptLattice:
+        """Lazily compute and cache the concept lattice with its cover relation."""
+        concepts = self._current_concepts()
+        if self._lattice is None or self._lattice.concepts is not concepts:
+            self._lattice = ConceptLattice(self)
+        return self._lattice
+
+    def get_canonical_basis(
+        self, algorithm: str = "linclosure", progress: Progress | None = None
+    ) -> list[Implication] | None:
+        """
+        Lazily compute and cache the canonical basis.
+        algorithm selects the implication closure engine ("linclosure" or "wild").
+        A cancelled progress stops the computation with Cancelled and leaves
+        the implications found so far in progress.partial.
+        """
         if self._canonical_basis is None:
-            self._compute_canonical_basis()
+            if self.result_cache is None:
+                self._compute_canonical_basis(algorithm, progress)
+            else:
+                self._canonical_basis = self._cached_canonical_basis(
+                    algorithm, progress
+                )
         return self._canonical_basis
 
-    def _compute_canonical_basis(self) -> None:
+    def _cached_canonical_basis(
+        self, algorithm: str, progress: Progress | None = None
+    ) -> list[Implication]:
+        """The canonical basis from result_cache, computed and stored on a miss."""
+        cache = self.result_cache
+        key = cache.key(self)
+        pairs = cache.load_pairs(key, "canonical-basis", self.num_attributes)
+        if pairs is None:
+            self._compute_canonical_basis(algorithm, progress)
+            pairs = [
+                (impl.premise_bits, impl.conclusion_bits)
+                for impl in self._canonical_basis
+            ]
+            cache.store_pairs(key, "canonical-basis", self.num_attributes, pairs)
+            return self._canonical_basis
+
+        premises = self._bitarrays_to_attributes(premise for premise, _ in pairs)
+        conclusions = self._bitarrays_to_attributes(
+            conclusion for _, conclusion in pairs
+        )
+        return [
+            Implication(premise, conclusion, self.attributes)
+            for premise, conclusion in zip(premises, conclusions)
+        ]
+
+    def _compute_canonical_basis(
+        self, algorithm: str = "linclosure", progress: Progress | None = None
+    ) -> None:
         """
         Compute the canonical (Duquenne-Guigues) basis using NextClosure on pseudo-intents.
         """
+        if algorithm not in CLOSURE_ALGORITHMS:
+            raise ValueError(
+                f"Unknown closure algorithm: '{algorithm}'. "
+                f"Expected one of {', '.join(CLOSURE_ALGORITHMS)}."
+            )
         L: list[Implication] = []  # List of implications (pseudo-intent -> closure)
-        pseudo_intents: list[bitarray] = []
+        # Pseudo-intents with their cached context closures
+        implications = CLOSURE_ALGORITHMS[algorithm](self.num_attributes)
 
         A: bitarray = bitarray("0" * self.num_attributes)
+        if progress is not None:
+            progress.phase = "canonical basis"
+            progress.partial = L
 
         while True:
-            A_Lclosed = self._L_closure(A, pseudo_intents)
+            if progress is not None:
+                progress.check()
+                progress.position = A
+            A_Lclosed = self._L_closure(A, implications)
 
             if A_Lclosed != A:
                 A = A_Lclosed
             else:
                 context_closure = self.closure(A)
                 if A != context_closure:
-                    pseudo_intents.append(A.copy())
+                    implications.add(A, context_closure)
                     premise = self._bitarray_to_attributes(A)
                     closure = self._bitarray_to_attributes(context_closure)
                     conclusion = closure - premise
@@ -263,58 +737,42 @@ class FormalContext:
                             self.attributes,
                         )
                     )
+                    if progress is not None:
+                        progress.pseudo_intents += 1
 
-            A = self._next_L_closed(A, pseudo_intents)
+            A = self._next_L_closed(A, implications)
             if A is None:
                 break
 
         self._canonical_basis = L
 
-    def _L_closure(self, A: bitarray, pseudo_intents: list[bitarray]) -> bitarray:
-        result = A.copy()
-        changed = True
-        while changed:
-            changed = False
-            for P in pseudo_intents:
-                # Check if P ⊆ result
-                if (P & result) == P:
-                    # Add closure of P to result
-                    P_closure = self.closure(P)
-                    new_result = result | P_closure
-                    if new_result != result:
-                        result = new_result
-                        changed = True
-        return result
+    def _L_closure(
+        self, A: bitarray, implications: LinClosure | WildClosure
+    ) -> bitarray:
+        """Close A under the pseudo-intent implications found so far."""
+        return implications.closure(A)
 
     def _next_L_closed(
-        self, A: bitarray, pseudo_intents: list[bitarray]
+        self, A: bitarray, implications: LinClosure | WildClosure
     ) -> bitarray | None:
         """
         Find the next L-closed set after A in lectic order.
         Returns None if A is the largest (all attributes).
         """
+        A = A.copy()
         for i in range(self.num_attributes - 1, -1, -1):
             if not A[i]:
+                # A has no attributes after i at this point
                 candidate = A.copy()
                 candidate[i] = 1
-                # Zero out all attributes after i
-                for j in range(i + 1, self.num_attributes):
-                    candidate[j] = 0
 
-                candidate_closed = self._L_closure(candidate, pseudo_intents)
+                candidate_closed = self._L_closure(candidate, implications)
 
                 # Check if closure respects lectic order (no bits before i got set)
-                valid = True
-                for j in range(i):
-                    if candidate_closed[j] and not A[j]:
-                        valid = False
-                        break
-
-                if valid:
+                if candidate_closed[:i] == A[:i]:
                     return candidate_closed
             else:
                 # Unset bit i for next iteration
-                A = A.copy()
                 A[i] = 0
 
         return None
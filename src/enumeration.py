@@ -0,0 +1,135 @@
+"""
+Concept enumeration engines.
+
+Each engine takes a FormalContext and yields (extent, intent) bitarray pairs,
+one per formal concept. NextClosure yields the concepts in lectic order of
+their intents; the Close-by-One family performs a depth-first traversal of
+the canonical generation tree instead, which is much cheaper because every
+child closure starts from the extent of its parent.
+"""
+
+from typing import TYPE_CHECKING, Callable, Generator, Tuple
+from bitarray import bitarray
+from bitarray.util import subset
+
+if TYPE_CHECKING:
+    from src.context import FormalContext
+
+Concept = Tuple[bitarray, bitarray]
+
+
+def next_closure(context: "FormalContext") -> Generator[Concept, None, None]:
+    """Ganter's NextClosure: concepts in lectic order of their intents."""
+    current_intent = context.closure(bitarray("0" * context.num_attributes))
+    current_extent = context.prime_attributes(current_intent)
+    yield current_extent, current_intent
+
+    top_intent = bitarray("1" * context.num_attributes)
+
+    while current_intent != top_intent:
+        current_intent = context._next_intent(current_intent)
+        current_extent = context.prime_attributes(current_intent)
+        yield current_extent, current_intent
+
+
+def close_by_one(context: "FormalContext") -> Generator[Concept, None, None]:
+    """
+    Kuznetsov's Close-by-One.
+    A child is generated by intersecting the parent extent with one attribute
+    column and is kept only if its closure adds no attribute before that one.
+    """
+    columns = context._attribute_columns()
+    extent = bitarray(context.num_objects)
+    extent.setall(1)
+    stack = [(extent, context.prime_objects(extent), 0)]
+
+    while stack:
+        extent, intent, start = stack.pop()
+        yield extent, intent
+
+        children = []
+        for j in range(start, context.num_attributes):
+            if intent[j]:
+                continue
+            child_extent = extent & columns[j]
+            child_intent = context.prime_objects(child_extent)
+            # Canonicity test: no new attribute before j
+            if child_intent[:j] == intent[:j]:
+                children.append((child_extent, child_intent, j + 1))
+        # Reversed so that children are expanded in increasing attribute order
+        stack.extend(reversed(children))
+
+
+def in_close(context: "FormalContext") -> Generator[Concept, None, None]:
+    """
+    Andrews' In-Close2.
+    Intents are completed incrementally while scanning the attribute columns,
+    and the canonicity test runs on the child extent, so no full closure is
+    ever computed.
+    """
+    extent = bitarray(context.num_objects)
+    extent.setall(1)
+    intent = bitarray(context.num_attributes)
+    intent.setall(0)
+    yield from in_close_subtree(context, extent, intent, 0)
+
+
+def in_close_subtree(
+    context: "FormalContext", extent: bitarray, intent: bitarray, start: int
+) -> Generator[Concept, None, None]:
+    """
+    Enumerate the In-Close subtree rooted at a node of the generation tree.
+    intent holds the attributes known so far and is completed in place.
+    """
+    columns = context._attribute_columns()
+    stack = [(extent, intent, start)]
+
+    while stack:
+        extent, intent, start = stack.pop()
+        children = in_close_children(columns, extent, intent, start)
+        yield extent, intent
+        # Reversed so that children are expanded in increasing attribute order
+        stack.extend(reversed(children))
+
+
+def in_close_children(
+    columns: list[bitarray], extent: bitarray, intent: bitarray, start: int
+) -> list[tuple[bitarray, bitarray, int]]:
+    """
+    Complete intent in place and return the canonical child nodes
+    (extent, partial intent, start) of an In-Close node.
+    """
+    found = []
+    for j in range(start, len(intent)):
+        if intent[j]:
+            continue
+        child_extent = extent & columns[j]
+        if child_extent == extent:
+            # Every object of the extent has j, so it belongs to the intent
+            intent[j] = 1
+        elif _is_canonical(child_extent, j, intent, columns):
+            found.append((child_extent, j))
+
+    children = []
+    for child_extent, j in found:
+        child_intent = intent.copy()
+        child_intent[j] = 1
+        children.append((child_extent, child_intent, j + 1))
+    return children
+
+
+def _is_canonical(
+    extent: bitarray, j: int, intent: bitarray, columns: list[bitarray]
+) -> bool:
+    """True if no attribute before j outside intent is shared by all of extent."""
+    for k in range(j):
+        if not intent[k] and subset(extent, columns[k]):
+            return False
+    return True
+
+
+ALGORITHMS: dict[str, Callable[["FormalContext"], Generator[Concept, None, None]]] = {
+    "nextclosure": next_closure,
+    "cbo": close_by_one,
+    "inclose": in_close,
+}
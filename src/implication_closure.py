@@ -0,0 +1,105 @@
+"""
+Closure of attribute sets under a growing set of implications.
+
+Both engines keep their implications as (premise, conclusion) bitarrays and
+index them by attribute, so a closure only looks at implications that can
+still fire instead of rescanning the whole list until a fixed point.
+"""
+
+from bitarray import bitarray
+
+
+class LinClosure:
+    """
+    LinClosure (Beeri & Bernstein): every implication keeps a counter of
+    premise attributes not yet in the closure and fires when it reaches zero.
+    """
+
+    def __init__(self, num_attributes: int) -> None:
+        self.num_attributes: int = num_attributes
+        self._conclusions: list[bitarray] = []
+        self._premise_sizes: list[int] = []
+        # Implications whose premise contains each attribute
+        self._by_attribute: list[list[int]] = [[] for _ in range(num_attributes)]
+        # Implications with an empty premise fire unconditionally
+        self._unconditional: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._conclusions)
+
+    def add(self, premise: bitarray, conclusion: bitarray) -> None:
+        idx = len(self._conclusions)
+        self._conclusions.append(conclusion.copy())
+        self._premise_sizes.append(premise.count())
+        for attr_idx in premise.search(1):
+            self._by_attribute[attr_idx].append(idx)
+        if not premise.any():
+            self._unconditional.append(idx)
+
+    def closure(self, attributes: bitarray) -> bitarray:
+        result = attributes.copy()
+        counters = self._premise_sizes.copy()
+        pending = list(attributes.search(1))
+
+        for idx in self._unconditional:
+            added = self._conclusions[idx] & ~result
+            result |= added
+            pending.extend(added.search(1))
+
+        while pending:
+            attr_idx = pending.pop()
+            for idx in self._by_attribute[attr_idx]:
+                counters[idx] -= 1
+                if counters[idx] == 0:
+                    added = self._conclusions[idx] & ~result
+                    if added.any():
+                        result |= added
+                        pending.extend(added.search(1))
+        return result
+
+
+class WildClosure:
+    """
+    Wild's closure: for every attribute a bitarray over the implications marks
+    those whose premise contains it. The implications that can fire are the
+    unused ones whose premise avoids every attribute outside the current set.
+    """
+
+    def __init__(self, num_attributes: int) -> None:
+        self.num_attributes: int = num_attributes
+        self._conclusions: list[bitarray] = []
+        self._with_attribute: list[bitarray] = [
+            bitarray() for _ in range(num_attributes)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._conclusions)
+
+    def add(self, premise: bitarray, conclusion: bitarray) -> None:
+        self._conclusions.append(conclusion.copy())
+        for attr_idx, column in enumerate(self._with_attribute):
+            column.append(premise[attr_idx])
+
+    def closure(self, attributes: bitarray) -> bitarray:
+        result = attributes.copy()
+        unused = bitarray(len(self._conclusions))
+        unused.setall(1)
+
+        while True:
+            blocked = bitarray(len(self._conclusions))
+            blocked.setall(0)
+            for attr_idx in (~result).search(1):
+                blocked |= self._with_attribute[attr_idx]
+
+            applicable = unused & ~blocked
+            if not applicable.any():
+                return result
+            for idx in applicable.search(1):
+                result |= self._conclusions[idx]
+            unused &= blocked
+
+
+CLOSURE_ALGORITHMS = {
+    "linclosure": LinClosure,
+    "wild": WildClosure,
+}
@@ -0,0 +1,210 @@
+"""
+Optional instrumentation of the hot paths.
+
+A Profiler wraps the instrumented methods on their classes while it is
+enabled and restores the originals when it is disabled, so there is no cost
+at all while profiling is off. Used as a context manager it is enabled for
+the block, and nested blocks leave it enabled until the outermost one ends.
+Times are inclusive wall-clock times: the time of closure contains the time
+of the prime_* calls it makes.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Generator
+from src.algorithms import IncrementalRanking, _Witnesses
+from src.cache import ResultCache
+from src.context import FormalContext
+from src.ranked_context import RankedContext
+
+# (class, method) pairs whose calls and wall time are recorded, under the
+# method name (the class name for constructors)
+TIMED_METHODS: list[tuple[type, str]] = [
+    (FormalContext, "prime_objects"),
+    (FormalContext, "prime_attributes"),
+    (FormalContext, "closure"),
+    (FormalContext, "_next_intent"),
+    (FormalContext, "_L_closure"),
+    # Column-wise ranking: the extents of each implication, the objects
+    # blocked in a round and the loop over the rounds
+    (_Witnesses, "__init__"),
+    (IncrementalRanking, "_blocked"),
+    (IncrementalRanking, "_run"),
+    # Ranked semantics: the rank-ordered columns and the typical objects
+    (RankedContext, "_rank_index"),
+    (RankedContext, "_typical_extent"),
+]
+
+
+class Profiler:
+    """
+    Call counts and wall time of the hot methods, the number of ranking
+    rounds, the largest concept set installed, and the wall time of named
+    phases. The hits and misses of cache, if one is given, are read from
+    the cache itself, which counts them.
+    """
+
+    # The profiler whose wrappers are currently installed
+    _active: "Profiler | None" = None
+
+    def __init__(self, cache: ResultCache | None = None) -> None:
+        self.cache: ResultCache | None = cache
+        # name -> [calls, seconds]; the wrappers update these lists in place
+        self.calls: dict[str, list] = {}
+        # name -> [runs, seconds]
+        self.phases: dict[str, list] = {}
+        self.ranking_rounds: int = 0
+        self.peak_concepts: int = 0
+        self._originals: list[tuple[type, str, Callable]] = []
+        # Per open with-block, whether the profiler was enabled on entry
+        self._entered: list[bool] = []
+
+    def __enter__(self) -> "Profiler":
+        self._entered.append(self.enabled)
+        try:
+            self.enable()
+        except BaseException:
+            self._entered.pop()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if not self._entered.pop():
+            self.disable()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    @property
+    def cache_hits(self) -> int:
+        return self.cache.hits if self.cache is not None else 0
+
+    @property
+    def cache_misses(self) -> int:
+        return self.cache.misses if self.cache is not None else 0
+
+    def enable(self) -> None:
+        """Install the wrappers."""
+        if self.enabled:
+            return
+        if Profiler._active is not None:
+            raise RuntimeError("Another profiler is already enabled.")
+
+        for cls, name in TIMED_METHODS:
+            self._patch(cls, name, self._timed)
+        self._patch(IncrementalRanking, "_run", self._count_rounds)
+        self._patch(FormalContext, "_set_concepts", self._track_concepts)
+        Profiler._active = self
+
+    def disable(self) -> None:
+        """Restore the original methods."""
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals = []
+        if Profiler._active is self:
+            Profiler._active = None
+
+    def reset(self) -> None:
+        """
+        Zero all statistics, including the counters of the cache (the
+        installed wrappers keep working).
+        """
+        for stats in self.calls.values():
+            stats[0], stats[1] = 0, 0.0
+        self.phases.clear()
+        self.ranking_rounds = 0
+        self.peak_concepts = 0
+        if self.cache is not None:
+            self.cache.hits = 0
+            self.cache.misses = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Record the wall time of the block under name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.phases.setdefault(name, [0, 0.0])
+            stats[0] += 1
+            stats[1] += time.perf_counter() - start
+
+    def _patch(self, cls: type, name: str, wrap: Callable) -> None:
+        original = getattr(cls, name)
+        self._originals.append((cls, name, original))
+        setattr(cls, name, functools.wraps(original)(wrap(name, original)))
+
+    def _timed(self, name: str, method: Callable) -> Callable:
+        if name == "__init__":
+            name = method.__qualname__.split(".")[0]
+        stats = self.calls.setdefault(name, [0, 0.0])
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats[0] += 1
+                stats[1] += perf_counter() - start
+
+        return wrapper
+
+    def _count_rounds(self, name: str, method: Callable) -> Callable:
+        def wrapper(ranking, rounds, *args, **kwargs):
+            result = method(ranking, rounds, *args, **kwargs)
+            self.ranking_rounds += len(result) - len(rounds)
+            return result
+
+        return wrapper
+
+    def _track_concepts(self, name: str, method: Callable) -> Callable:
+        def wrapper(context, store):
+            self.peak_concepts = max(self.peak_concepts, len(store))
+            return method(context, store)
+
+        return wrapper
+
+    def report(self) -> dict:
+        """All statistics as plain data."""
+        return {
+            "calls": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in self.calls.items()
+            },
+            "phases": {
+                name: {"runs": runs, "seconds": seconds}
+                for name, (runs, seconds) in self.phases.items()
+            },
+            "ranking_rounds": self.ranking_rounds,
+            "peak_concepts": self.peak_concepts,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    def format(self) -> str:
+        """The statistics as a human-readable table."""
+        lines = ["Calls (inclusive wall time):"]
+        for name, (calls, seconds) in sorted(
+            self.calls.items(), key=lambda item: -item[1][1]
+        ):
+            if not calls:
+                continue
+            per_call = seconds / calls * 1e6
+            lines.append(
+                f"  {name:<18} {calls:>10} calls {seconds:>10.4f}s  {per_call:>9.2f}us/call"
+            )
+        if self.phases:
+            lines.append("Phases:")
+            for name, (runs, seconds) in self.phases.items():
+                lines.append(f"  {name:<18} {runs:>10} runs  {seconds:>10.4f}s")
+        lines.append(f"Ranking rounds: {self.ranking_rounds}")
+        lines.append(f"Peak concepts: {self.peak_concepts}")
+        lookups = self.cache_hits + self.cache_misses
+        rate = f" ({self.cache_hits / lookups:.0%} hits)" if lookups else ""
+        lines.append(
+            f"Result cache: {self.cache_hits} hits, {self.cache_misses} misses{rate}"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,71 @@
+from bitarray import bitarray
+
+
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: dict[int, "_Node"] = {}
+        self.ids: list[int] = []
+
+
+class IntentTrie:
+    """
+    Set-trie over attribute sets.
+
+    Every stored set is spelled as the increasing sequence of its attribute
+    positions, and the node reached at the end records the set's id. Subset
+    and superset queries then only descend into branches that can still
+    match, instead of comparing the query against every stored set.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, bits: bitarray, value: int) -> None:
+        """Store the set given by bits under the id value."""
+        node = self._root
+        for attr_idx in bits.search(1):
+            child = node.children.get(attr_idx)
+            if child is None:
+                child = node.children[attr_idx] = _Node()
+            node = child
+        node.ids.append(value)
+        self._size += 1
+
+    def between(self, lower: bitarray, upper: bitarray) -> list[int]:
+        """Ids of all stored sets S with lower ⊆ S ⊆ upper."""
+        required = list(lower.search(1))
+        found: list[int] = []
+        # (node, number of required attributes already on the path)
+        stack = [(self._root, 0)]
+        while stack:
+            node, matched = stack.pop()
+            if matched == len(required):
+                found.extend(node.ids)
+            next_required = required[matched] if matched < len(required) else None
+            for attr_idx, child in node.children.items():
+                if not upper[attr_idx]:
+                    continue
+                if next_required is None or attr_idx < next_required:
+                    stack.append((child, matched))
+                elif attr_idx == next_required:
+                    stack.append((child, matched + 1))
+                # attr_idx > next_required: the required attribute was skipped
+        return found
+
+    def supersets(self, bits: bitarray) -> list[int]:
+        """Ids of all stored supersets of bits (including bits itself)."""
+        upper = bitarray(len(bits))
+        upper.setall(1)
+        return self.between(bits, upper)
+
+    def subsets(self, bits: bitarray) -> list[int]:
+        """Ids of all stored subsets of bits (including bits itself)."""
+        lower = bitarray(len(bits))
+        lower.setall(0)
+        return self.between(lower, bits)
@@ -1,28 +1,91 @@
+import csv
+import gzip
+import lzma
+import mmap
 import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import TextIOWrapper
 from bitarray import bitarray
+from src import packed
 from src.context import FormalContext
-from typing import TYPE_CHECKING
+from src.parallel import pool_context
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, TextIO
 
 if TYPE_CHECKING:
+    from src.cache import ResultCache
     from src.translated_ranked_context import TranslatedContext
 
+FORMATS = ("ctx", "bin", "fimi", "items", "csv")
+# Sparse transaction formats are read-only
+SAVE_FORMATS = ("ctx", "bin")
+
+# Binary context layout (all integers little-endian uint64):
+#   magic, num_objects, num_attributes,
+#   objects offset/size, attributes offset/size, rows offset, columns offset
+# followed by the UTF-8 name tables, where every name is prefixed by its
+# length in bytes as a little-endian uint32, and the packed row and column
+# matrices. Every section starts on an 8-byte boundary and every matrix
+# row is padded to whole 64-bit words, in the layout of src.packed.
+BINARY_MAGIC = b"PRBCTX\x00\x02"
+NAME_LENGTH = struct.Struct("<I")
+BINARY_HEADER = struct.Struct("<8s8Q")
+
+# File name extension of each format
+EXTENSIONS = {".ctx": "ctx", ".bctx": "bin", ".dat": "fimi", ".csv": "csv"}
+COMPRESSED_EXTENSIONS = (".gz", ".xz")
+
+# Compressed text files are recognised by their signature
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+# Bytes of the cross table read and parsed at a time
+BLOCK_SIZE = 1 << 24
+
+# Translation of cross table characters to bits: 'X' or 'x' is a cross
+_CROSSES = bytes(ord("1") if c in b"Xx" else ord("0") for c in range(256))
+# Whitespace that readline().strip() would remove around a row
+_BLANKS = b" \t\r\x0b\x0c"
+
+
+def guess_format(file_name: str) -> str | None:
+    """The format of file_name judging by its extension, None if unknown."""
+    for extension in COMPRESSED_EXTENSIONS:
+        if file_name.endswith(extension):
+            file_name = file_name[: -len(extension)]
+    for extension, format in EXTENSIONS.items():
+        if file_name.endswith(extension):
+            return format
+    return None
+
 
 def save_context(
     context: "FormalContext | TranslatedContext", file_name: str, format: str = "ctx"
 ) -> None:
     """
     Saves a formal context to a file in the project's 'data' directory.
-    Currently only supports the '.ctx' (ConImp) format.
+    Supports the '.ctx' (ConImp) text format and the 'bin' binary format.
 
     For TranslatedContext objects with list/frozenset attributes, they are
     converted to strings using comma-separated format.
     """
-    if format.lower() != "ctx":
-        raise ValueError(f"Unsupported format: '{format}'. Only 'ctx' is supported.")
+    format = format.lower()
+    if format not in SAVE_FORMATS:
+        raise ValueError(
+            f"Unsupported format: '{format}'. Expected one of {', '.join(SAVE_FORMATS)}."
+        )
 
     data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
     file_path = os.path.join(data_dir, file_name)
 
+    if format == "bin":
+        try:
+            _save_binary(context, file_path)
+        except IOError as e:
+            raise IOError(f"Error writing file {file_path}: {e}")
+        return
+
     try:
         with open(file_path, "w", encoding="utf-8") as f:
             # Write header
@@ -39,12 +102,7 @@ def save_context(
             # Write attribute names
             # Handle both regular strings and list/frozenset attributes
             for attr in context.attributes:
-                if isinstance(attr, (list, frozenset, set)):
-                    # Convert collection to comma-separated string
-                    attr_str = ",".join(sorted(attr))
-                    f.write(f"{attr_str}\n")
-                else:
-                    f.write(f"{attr}\n")
+                f.write(f"{_attribute_name(attr)}\n")
 
             # Write incidence matrix
             for row in context.incidence:
@@ -57,14 +115,30 @@ def save_context(
         raise RuntimeError(f"An unexpected error occurred during file writing: {e}")
 
 
-def load_context(file_name: str, format: str) -> FormalContext:
+def load_context(
+    file_name: str,
+    format: str,
+    backend: str = "bitarray",
+    workers: int = 1,
+    cache: "ResultCache | None" = None,
+) -> FormalContext:
     """
     Loads a formal context from a file located in the project's 'data' directory.
-    Currently only supports the '.ctx' (ConImp) format.
-    """
+    Supports the '.ctx' (ConImp) text format, the 'bin' binary format and
+    the sparse transaction formats 'fimi', 'items' and 'csv' (see
+    _load_sparse), which are read straight into the context.
 
-    if format.lower() != "ctx":
-        raise ValueError(f"Unsupported format: '{format}'. Only 'ctx' is supported.")
+    The backend selects the incidence storage of the returned context
+    ("bitarray" or "numpy"). Compressed '.ctx' files (gzip, xz) are read
+    transparently; with workers > 1 their cross table is parsed by that
+    many processes. If a cache is given, the context looks up its concepts
+    and bases there before computing them.
+    """
+    format = format.lower()
+    if format not in FORMATS:
+        raise ValueError(
+            f"Unsupported format: '{format}'. Expected one of {', '.join(FORMATS)}."
+        )
 
     data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
     file_path = os.path.join(data_dir, file_name)
@@ -72,13 +146,26 @@ def load_context(file_name: str, format: str) -> FormalContext:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Context file not found: {os.path.abspath(file_path)}")
 
+    if format == "bin":
+        try:
+            context = _load_binary(file_path, backend)
+        except IOError as e:
+            raise IOError(f"Error reading or parsing file {file_path}: {e}")
+    elif format in SPARSE_READERS:
+        context = _load_sparse(file_path, format, backend)
+    else:
+        context = _load_ctx(file_path, backend, workers)
+    context.result_cache = cache
+    return context
+
+
+def _load_ctx(file_path: str, backend: str, workers: int) -> FormalContext:
     objects: list[str] = []
     attributes: list[str] = []
-    incidence: list[bitarray] = []
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            if f.readline().strip() != "B":
+        with _open_file(file_path) as f:
+            if f.readline().strip() != b"B":
                 raise ValueError("Invalid .ctx format: Expected 'B' on the first line.")
 
             try:
@@ -96,37 +183,427 @@ def load_context(file_name: str, format: str) -> FormalContext:
                     "Invalid .ctx format: Expected number of attributes on line 3."
                 )
 
-            if f.readline().strip() != "":
+            if f.readline().strip() != b"":
                 raise ValueError(
                     "Invalid .ctx format: Expected empty line after counts."
                 )
 
             for _ in range(num_objects):
-                obj_name = f.readline().strip()
+                obj_name = f.readline().decode("utf-8").strip()
                 if not obj_name:
                     raise ValueError("Invalid .ctx format: Found empty object name.")
                 objects.append(obj_name)
 
             for _ in range(num_attributes):
-                attr_name = f.readline().strip()
+                attr_name = f.readline().decode("utf-8").strip()
                 if not attr_name:
                     raise ValueError("Invalid .ctx format: Found empty attribute name.")
                 attributes.append(attr_name)
 
-            for obj_idx in range(num_objects):
-                line = f.readline().strip()
+            incidence, columns = _read_cross_table(f, objects, num_attributes, workers)
 
-                if len(line) != num_attributes:
-                    raise ValueError(
-                        f"Incidence row {obj_idx} (object '{objects[obj_idx]}') has incorrect length. Expected {num_attributes}, got {len(line)}."
-                    )
+    except IOError as e:
+        raise IOError(f"Error reading or parsing file {file_path}: {e}")
+    except Exception as e:
+        raise RuntimeError(f"An unexpected error occurred during file parsing: {e}")
+
+    return FormalContext(objects, attributes, incidence, backend, columns)
+
+
+def _open_file(file_path: str) -> BinaryIO:
+    """Open a file for binary reading, decompressing gzip or xz files."""
+    with open(file_path, "rb") as f:
+        signature = f.read(6)
+    if signature.startswith(GZIP_MAGIC):
+        return gzip.open(file_path, "rb")
+    if signature.startswith(XZ_MAGIC):
+        return lzma.open(file_path, "rb")
+    return open(file_path, "rb")
+
+
+class _BadRow(Exception):
+    """A malformed incidence row: args are its index in the block and its length."""
+
+
+def _parse_rows(block: bytes, num_rows: int, num_attributes: int) -> bitarray:
+    """
+    Parse num_rows newline-separated incidence rows into one bitarray of
+    num_rows * num_attributes bits. The rows are translated to '0'/'1' in
+    bulk; they are only stripped one by one if some row has whitespace
+    such as a carriage return or the wrong length.
+    """
+    lines = block.split(b"\n") if num_rows else []
+    has_blanks = len(block.translate(None, _BLANKS)) != len(block)
+    if has_blanks or any(len(line) != num_attributes for line in lines):
+        lines = [line.strip() for line in lines]
+        for row_idx, line in enumerate(lines):
+            if len(line) != num_attributes:
+                raise _BadRow(row_idx, len(line))
+    return bitarray(b"".join(lines).translate(_CROSSES).decode("ascii"))
+
+
+def _row_blocks(
+    f: BinaryIO, num_rows: int, block_size: int
+) -> Iterator[tuple[bytes, int]]:
+    """
+    Cut the next num_rows lines of f into (block, number of lines) pieces of
+    about block_size bytes. Missing lines at the end of the file are
+    reported as empty lines, as readline() would return them.
+    """
+    pending = b""
+    while num_rows:
+        chunk = f.read(block_size)
+        if not chunk:
+            available = pending.count(b"\n") + 1 if pending else 0
+            lines = pending.split(b"\n")[:num_rows] + [b""] * (num_rows - available)
+            yield b"\n".join(lines), num_rows
+            return
+
+        pending += chunk
+        last = pending.rfind(b"\n")
+        if last < 0:
+            continue
+        block, pending = pending[:last], pending[last + 1 :]
+        count = block.count(b"\n") + 1
+        if count >= num_rows:
+            yield b"\n".join(block.split(b"\n", num_rows)[:num_rows]), num_rows
+            return
+        yield block, count
+        num_rows -= count
+
+
+def _read_cross_table(
+    f: BinaryIO, objects: list[str], num_attributes: int, workers: int
+) -> tuple[list[bitarray], list[bitarray]]:
+    """
+    Read the incidence rows in blocks. Every block is parsed into one
+    bitarray, which is then cut into rows by slicing and into column pieces
+    by stepped slicing, so no Python code runs per cross. With workers > 1
+    the blocks are parsed in a process pool while the next ones are read.
+    """
+    incidence: list[bitarray] = []
+    columns = [bitarray() for _ in range(num_attributes)]
+
+    def collect(bits: bitarray, num_rows: int) -> None:
+        if not num_attributes:
+            incidence.extend(bitarray() for _ in range(num_rows))
+            return
+        for start in range(0, len(bits), num_attributes):
+            incidence.append(bits[start : start + num_attributes])
+        for attr_idx, column in enumerate(columns):
+            column.extend(bits[attr_idx::num_attributes])
+
+    blocks = _row_blocks(f, len(objects), BLOCK_SIZE)
+    try:
+        if workers <= 1:
+            for block, num_rows in blocks:
+                collect(_parse_rows(block, num_rows, num_attributes), num_rows)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=pool_context()
+            ) as pool:
+                in_flight: deque = deque()
+                for block, num_rows in blocks:
+                    future = pool.submit(_parse_rows, block, num_rows, num_attributes)
+                    in_flight.append((future, num_rows))
+                    # Bound the memory held by blocks waiting for a worker
+                    if len(in_flight) > 2 * workers:
+                        future, num_rows = in_flight.popleft()
+                        collect(future.result(), num_rows)
+                while in_flight:
+                    future, num_rows = in_flight.popleft()
+                    collect(future.result(), num_rows)
+    except _BadRow as e:
+        row_idx, length = e.args
+        obj_idx = len(incidence) + row_idx
+        raise ValueError(
+            f"Incidence row {obj_idx} (object '{objects[obj_idx]}') has incorrect length. Expected {num_attributes}, got {length}."
+        )
+
+    return incidence, columns
+
+
+def _attribute_name(attr) -> str:
+    """Attribute name as written to a file; collections become comma-separated."""
+    if isinstance(attr, (list, frozenset, set)):
+        return ",".join(sorted(attr))
+    return str(attr)
 
-                row = bitarray([char.lower() == "x" for char in line])
-                incidence.append(row)
 
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def _name_table(names: Iterable[str]) -> bytes:
+    """Names encoded as UTF-8, each prefixed by its length, so any name round-trips."""
+    table = bytearray()
+    for name in names:
+        encoded = name.encode("utf-8")
+        table += NAME_LENGTH.pack(len(encoded))
+        table += encoded
+    return bytes(table)
+
+
+def _save_binary(context: "FormalContext | TranslatedContext", file_path: str) -> None:
+    object_names = _name_table(context.objects)
+    attribute_names = _name_table(_attribute_name(attr) for attr in context.attributes)
+
+    objects_offset = BINARY_HEADER.size
+    attributes_offset = _align(objects_offset + len(object_names))
+    rows_offset = _align(attributes_offset + len(attribute_names))
+    row_bytes = packed.words_for(context.num_attributes) * 8
+    columns_offset = rows_offset + context.num_objects * row_bytes
+    column_bytes = packed.words_for(context.num_objects) * 8
+
+    # Replace the file in one step: contexts loaded from it may still map it
+    temporary = f"{file_path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(
+            BINARY_HEADER.pack(
+                BINARY_MAGIC,
+                context.num_objects,
+                context.num_attributes,
+                objects_offset,
+                len(object_names),
+                attributes_offset,
+                len(attribute_names),
+                rows_offset,
+                columns_offset,
+            )
+        )
+        f.write(object_names)
+        f.write(b"\0" * (attributes_offset - objects_offset - len(object_names)))
+        f.write(attribute_names)
+        f.write(b"\0" * (rows_offset - attributes_offset - len(attribute_names)))
+        for row in context.incidence:
+            f.write(row.tobytes().ljust(row_bytes, b"\0"))
+        for column in context._attribute_columns():
+            f.write(column.tobytes().ljust(column_bytes, b"\0"))
+    os.replace(temporary, file_path)
+
+
+def _load_binary(file_path: str, backend: str) -> FormalContext:
+    """
+    Map a binary context file into memory. The attribute columns are
+    read-only bitarray views of the mapping, which the context copies when
+    it is edited. So are the rows with the numpy backend, whose packed
+    matrices are views of the mapping as well; the bitarray backend copies
+    each row with one slice. Rows and columns whose width is not a whole
+    number of bytes are always sliced (see _read_matrix). The mapping stays
+    open while any view of it is in use.
+    """
+    with open(file_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # Close the mapping if the file turns out to be invalid
+    view = None
+    try:
+        if len(mapped) < BINARY_HEADER.size:
+            raise ValueError("Invalid binary context: file is too short.")
+        (
+            magic,
+            num_objects,
+            num_attributes,
+            objects_offset,
+            objects_size,
+            attributes_offset,
+            attributes_size,
+            rows_offset,
+            columns_offset,
+        ) = BINARY_HEADER.unpack_from(mapped)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Invalid binary context: unknown file signature.")
+
+        row_bytes = packed.words_for(num_attributes) * 8
+        column_bytes = packed.words_for(num_objects) * 8
+        if len(mapped) < columns_offset + num_attributes * column_bytes:
+            raise ValueError("Invalid binary context: file is truncated.")
+
+        objects = _read_names(mapped, objects_offset, objects_size, num_objects)
+        attributes = _read_names(
+            mapped, attributes_offset, attributes_size, num_attributes
+        )
+
+        view = memoryview(mapped)
+        # The numpy backend answers queries from the packed matrices, so its
+        # rows stay views; the bitarray backend works on copied rows
+        incidence = _read_matrix(
+            view,
+            rows_offset,
+            num_objects,
+            row_bytes,
+            num_attributes,
+            views=backend == "numpy",
+        )
+        columns = _read_matrix(
+            view, columns_offset, num_attributes, column_bytes, num_objects
+        )
+        context = FormalContext(objects, attributes, incidence, backend, columns)
+    except BaseException:
+        # Once bitarrays view the mapping it is closed when they are collected
+        if view is None:
+            mapped.close()
+        raise
+
+    if backend == "numpy":
+        np = packed.np
+        context._packed_rows = np.frombuffer(
+            mapped, np.uint64, num_objects * row_bytes // 8, rows_offset
+        ).reshape(num_objects, row_bytes // 8)
+        context._packed_columns = np.frombuffer(
+            mapped, np.uint64, num_attributes * column_bytes // 8, columns_offset
+        ).reshape(num_attributes, column_bytes // 8)
+    return context
+
+
+def _read_names(mapped: mmap.mmap, offset: int, size: int, count: int) -> list[str]:
+    """Decode count length-prefixed names from the size bytes at offset."""
+    table = mapped[offset : offset + size]
+    names = []
+    position = 0
+    while len(names) < count and position + NAME_LENGTH.size <= size:
+        (length,) = NAME_LENGTH.unpack_from(table, position)
+        position += NAME_LENGTH.size
+        if position + length > size:
+            break
+        names.append(table[position : position + length].decode("utf-8"))
+        position += length
+    if len(names) != count or position != size:
+        raise ValueError("Invalid binary context: name tables don't match the counts.")
+    return names
+
+
+def _read_matrix(
+    view: memoryview,
+    offset: int,
+    count: int,
+    stride: int,
+    num_bits: int,
+    views: bool = True,
+) -> list[bitarray]:
+    """
+    count bitarrays of num_bits bits stored every stride bytes from offset.
+    With views, and if num_bits is a whole number of bytes, every bitarray
+    is a read-only view of its bytes. Otherwise a view of the whole matrix
+    is cut into rows, each copied by one slice, which is quicker to make
+    than a view at the cost of the copied bytes.
+    """
+    if not num_bits:
+        return [bitarray() for _ in range(count)]
+    end = offset + count * stride
+    if views and num_bits % 8 == 0:
+        size = num_bits // 8
+        return [
+            bitarray(buffer=view[start : start + size], endian="big")
+            for start in range(offset, end, stride)
+        ]
+    matrix = bitarray(buffer=view[offset:end], endian="big")
+    return [
+        matrix[start : start + num_bits] for start in range(0, len(matrix), stride * 8)
+    ]
+
+
+def _fimi_transactions(f: TextIO) -> Iterator[tuple[str, list[str]]]:
+    """FIMI .dat: one transaction per line, items are integers separated by spaces."""
+    for line_no, line in enumerate(f):
+        items = line.split()
+        for item in items:
+            if not item.isdigit():
+                raise ValueError(
+                    f"Invalid FIMI format: item '{item}' on line {line_no + 1} is not a non-negative integer."
+                )
+        # Normalise ids such as '007' so each item has one name
+        yield str(line_no), [str(int(item)) for item in items]
+
+
+def _item_list_transactions(f: TextIO) -> Iterator[tuple[str, list[str]]]:
+    """Item lists: one transaction per line, attribute names separated by commas."""
+    for line_no, line in enumerate(f):
+        yield str(line_no), [item.strip() for item in line.split(",") if item.strip()]
+
+
+def _csv_transactions(f: TextIO) -> Iterator[tuple[str, list[str]]]:
+    """
+    Long-format CSV: one object,attribute pair per row. An optional header
+    row 'object,attribute' is skipped; an object may span several rows.
+    An empty attribute adds an object without crosses. Empty object names
+    and names with line breaks are rejected, as no writer can store them.
+    """
+    for row_no, row in enumerate(csv.reader(f)):
+        if not row or not any(field.strip() for field in row):
+            continue
+        if len(row) != 2:
+            raise ValueError(
+                f"Invalid CSV format: row {row_no + 1} should be 'object,attribute'."
+            )
+        obj, attr = row[0].strip(), row[1].strip()
+        if row_no == 0 and (obj.lower(), attr.lower()) == ("object", "attribute"):
+            continue
+        # Names must survive a round trip through the .ctx format
+        if not obj:
+            raise ValueError(
+                f"Invalid CSV format: empty object name in row {row_no + 1}, column 1."
+            )
+        for column, name in ((1, obj), (2, attr)):
+            if "\n" in name or "\r" in name:
+                raise ValueError(
+                    f"Invalid CSV format: name in row {row_no + 1}, column {column} contains a line break."
+                )
+        yield obj, [attr] if attr else []
+
+
+SPARSE_READERS = {
+    "fimi": _fimi_transactions,
+    "items": _item_list_transactions,
+    "csv": _csv_transactions,
+}
+
+
+def _load_sparse(file_path: str, format: str, backend: str) -> FormalContext:
+    """
+    Build a context from (object, attributes) transactions without going
+    through a dense cross table. Objects and attributes are numbered in
+    order of first appearance (FIMI item ids are sorted numerically), and
+    only the crosses themselves are visited.
+    """
+    object_positions: dict[str, int] = {}
+    attribute_positions: dict[str, int] = {}
+    crosses: list[list[int]] = []
+
+    try:
+        with (
+            _open_file(file_path) as raw,
+            TextIOWrapper(raw, encoding="utf-8", newline="") as f,
+        ):
+            for obj, items in SPARSE_READERS[format](f):
+                obj_idx = object_positions.setdefault(obj, len(object_positions))
+                if obj_idx == len(crosses):
+                    crosses.append([])
+                row = crosses[obj_idx]
+                for item in items:
+                    row.append(
+                        attribute_positions.setdefault(item, len(attribute_positions))
+                    )
     except IOError as e:
         raise IOError(f"Error reading or parsing file {file_path}: {e}")
     except Exception as e:
         raise RuntimeError(f"An unexpected error occurred during file parsing: {e}")
 
-    return FormalContext(objects, attributes, incidence)
+    attributes = list(attribute_positions)
+    if format == "fimi":
+        # Renumber the items in increasing order of their ids
+        order = sorted(range(len(attributes)), key=lambda i: int(attributes[i]))
+        renumber = [0] * len(order)
+        for new_idx, old_idx in enumerate(order):
+            renumber[old_idx] = new_idx
+        attributes = [attributes[i] for i in order]
+        crosses = [[renumber[attr_idx] for attr_idx in row] for row in crosses]
+
+    incidence = []
+    for row in crosses:
+        bits = bitarray(len(attributes))
+        bits.setall(0)
+        for attr_idx in row:
+            bits[attr_idx] = 1
+        incidence.append(bits)
+    return FormalContext(list(object_positions), attributes, incidence, backend)
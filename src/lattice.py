@@ -0,0 +1,100 @@
+from typing import TYPE_CHECKING, Iterator
+from bitarray import bitarray
+
+if TYPE_CHECKING:
+    from src.context import FormalContext
+
+
+class ConceptLattice:
+    """
+    The concept lattice of a formal context with its cover relation.
+
+    Concepts are identified by their integer position in context.concepts.
+    The Hasse diagram is stored as adjacency lists of concept ids and is
+    computed with Lindig's neighbour algorithm: for a concept (A, B) every
+    attribute m outside B yields a candidate (A & m', (A & m')'), and a
+    candidate is a lower neighbour only if its closure adds no other
+    attribute that is still minimal. This needs one closure per
+    (concept, attribute) pair instead of comparing all pairs of concepts.
+    """
+
+    def __init__(self, context: "FormalContext") -> None:
+        self.context = context
+        self.concepts = context.concepts
+        count = len(self.concepts)
+        self.upper_covers: list[list[int]] = [[] for _ in range(count)]
+        self.lower_covers: list[list[int]] = [[] for _ in range(count)]
+        self._compute_covers()
+
+        no_attributes = bitarray(context.num_attributes)
+        no_attributes.setall(0)
+        self.top: int = self.index(context.closure(no_attributes))
+        self.bottom: int = self.index(context.closure(~no_attributes))
+
+    def _compute_covers(self) -> None:
+        """
+        The concepts stay packed in the store: each one is decoded while its
+        neighbours are computed, and they are found by the store's intent keys.
+        """
+        columns = self.context._attribute_columns()
+        concepts = self.concepts
+        ids = concepts.intent_ids()
+        for concept_id, (extent, intent) in enumerate(concepts):
+            minimal = ~intent
+            for attr_idx in (~intent).search(1):
+                lower_intent = self.context.prime_objects(extent & columns[attr_idx])
+                added = lower_intent & ~intent
+                added[attr_idx] = 0
+                if (minimal & added).any():
+                    minimal[attr_idx] = 0
+                    continue
+                lower_id = ids[concepts.intent_key(lower_intent)]
+                self.lower_covers[concept_id].append(lower_id)
+                self.upper_covers[lower_id].append(concept_id)
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    def index(self, intent: bitarray) -> int:
+        """The id of the concept with the given intent."""
+        if len(intent) != self.context.num_attributes:
+            raise ValueError("Not an intent of the context.")
+        try:
+            return self.concepts.intent_ids()[self.concepts.intent_key(intent)]
+        except KeyError:
+            raise ValueError("Not an intent of the context.") from None
+
+    def intent_bits(self, concept_id: int) -> bitarray:
+        return self.concepts.intent_bits(concept_id)
+
+    def extent_bits(self, concept_id: int) -> bitarray:
+        return self.concepts.extent_bits(concept_id)
+
+    def intent(self, concept_id: int) -> frozenset[str]:
+        return self.context._bitarray_to_attributes(self.intent_bits(concept_id))
+
+    def extent(self, concept_id: int) -> frozenset[str]:
+        return self.context._bitarray_to_objects(self.extent_bits(concept_id))
+
+    def upper_neighbours(self, concept_id: int) -> list[int]:
+        """Concepts directly above concept_id (larger extents)."""
+        return self.upper_covers[concept_id]
+
+    def lower_neighbours(self, concept_id: int) -> list[int]:
+        """Concepts directly below concept_id (larger intents)."""
+        return self.lower_covers[concept_id]
+
+    def leq(self, first: int, second: int) -> bool:
+        """True if concept first is below or equal to concept second."""
+        keys = self.concepts.intent_keys()
+        return keys[first] & keys[second] == keys[second]
+
+    def edges(self) -> Iterator[tuple[int, int]]:
+        """All cover pairs (lower, upper) of the Hasse diagram."""
+        for upper, lowers in enumerate(self.lower_covers):
+            for lower in lowers:
+                yield lower, upper
+
+    @property
+    def num_edges(self) -> int:
+        return sum(len(lowers) for lowers in self.lower_covers)
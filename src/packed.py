@@ -0,0 +1,62 @@
+"""
+Packed 64-bit word matrices used by the NumPy incidence backend.
+
+Rows are stored with the same bit order as ``bitarray.tobytes()`` and padded
+with zero bits to a whole number of ``uint64`` words, so a packed row can be
+turned back into a bitarray with a single ``frombytes`` call.
+"""
+
+from bitarray import bitarray
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+
+def require_numpy() -> None:
+    """Raise an informative error if numpy is not installed."""
+    if np is None:
+        raise ImportError(
+            "The 'numpy' backend requires numpy. Install it with 'pip install numpy'."
+        )
+
+
+def words_for(num_bits: int) -> int:
+    """Number of 64-bit words needed to hold num_bits bits."""
+    return (num_bits + 63) // 64
+
+
+def pack_bits(rows: list[bitarray], num_bits: int) -> "np.ndarray":
+    """Pack a list of equally long bitarrays into a (len(rows), words) uint64 matrix."""
+    row_bytes = words_for(num_bits) * 8
+    buffer = b"".join(row.tobytes().ljust(row_bytes, b"\0") for row in rows)
+    matrix = np.frombuffer(buffer, dtype=np.uint64).copy()
+    return matrix.reshape(len(rows), words_for(num_bits))
+
+
+def words_to_bits(words: "np.ndarray", num_bits: int) -> bitarray:
+    """Convert a packed row back into a bitarray of length num_bits."""
+    result = bitarray()
+    result.frombytes(words.tobytes())
+    del result[num_bits:]
+    return result
+
+
+def bits_to_indices(bits: bitarray) -> "np.ndarray":
+    """Return the positions of all set bits as an integer array."""
+    raw = np.frombuffer(bits.tobytes(), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, count=len(bits)))
+
+
+def and_reduce(matrix: "np.ndarray", selected: bitarray, num_bits: int) -> bitarray:
+    """
+    AND together the rows of matrix selected by the set bits of selected.
+    An empty selection yields all ones, the neutral element of intersection.
+    """
+    indices = bits_to_indices(selected)
+    if len(indices) == 0:
+        result = bitarray(num_bits)
+        result.setall(1)
+        return result
+    return words_to_bits(np.bitwise_and.reduce(matrix[indices], axis=0), num_bits)
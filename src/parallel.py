@@ -0,0 +1,158 @@
+"""
+Multi-core concept enumeration.
+
+The In-Close generation tree is expanded in the calling process down to a
+fixed depth. Every node left at that depth roots an independent subtree,
+which is enumerated by a worker of a ProcessPoolExecutor. While the
+workers run, a Progress is polled, and cancelling it stops the pool: a
+shared event tells the workers to abandon their subtrees.
+
+The workers are started with forkserver (spawn where it is unavailable),
+never with fork: enumeration often runs on a REPL worker thread, and a
+process forked from a multi-threaded one can deadlock on a lock that was
+held at fork time.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Generator
+from bitarray import bitarray
+from src.enumeration import Concept, in_close_children, in_close_subtree
+from src.progress import Progress
+
+if TYPE_CHECKING:
+    from src.context import FormalContext
+
+# Seconds between polls of the progress while waiting for the workers
+POLL_INTERVAL = 0.05
+
+# Concepts a worker enumerates between checks of the stop event
+STOP_CHECK_INTERVAL = 64
+
+# Context of the current worker process and the event that stops it, set
+# by _init_worker
+_worker_context: "FormalContext | None" = None
+_worker_stop = None
+
+
+def pool_context():
+    """Multiprocessing context for process pools that must not fork."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _init_worker(
+    objects: list[str],
+    attributes: list[str],
+    incidence: list[bitarray],
+    backend: str,
+    stop,
+) -> None:
+    global _worker_context, _worker_stop
+    from src.context import FormalContext
+
+    _worker_context = FormalContext(objects, attributes, incidence, backend)
+    _worker_stop = stop
+
+
+def _enumerate_subtree(extent: bitarray, intent: bitarray, start: int) -> list[Concept]:
+    """The concepts of a subtree; nothing once the pool is being stopped."""
+    found = []
+    subtree = in_close_subtree(_worker_context, extent, intent, start)  # type: ignore
+    for count, concept in enumerate(subtree):
+        if count % STOP_CHECK_INTERVAL == 0 and _worker_stop.is_set():  # type: ignore
+            return []
+        found.append(concept)
+    return found
+
+
+def parallel_concepts(
+    context: "FormalContext",
+    workers: int | None = None,
+    split_depth: int = 1,
+    ordered: bool = True,
+    progress: Progress | None = None,
+) -> Generator[Concept, None, None]:
+    """
+    Enumerate all concepts of context using a pool of worker processes.
+
+    split_depth is the depth of the generation tree at which subtrees are
+    handed to the workers; deeper splits produce more, smaller tasks.
+    With ordered=True the concepts are yielded in lectic order of their
+    intents (like NextClosure) once all workers have finished. Otherwise
+    each subtree is yielded as soon as its worker returns.
+
+    progress is checked while waiting for the workers; once it is cancelled
+    the pool is stopped and Cancelled raised. The pool is stopped as well
+    when the generator is closed before the end.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if split_depth < 0:
+        raise ValueError("split_depth must be non-negative.")
+
+    columns = context._attribute_columns()
+    extent = bitarray(context.num_objects)
+    extent.setall(1)
+    intent = bitarray(context.num_attributes)
+    intent.setall(0)
+
+    # Concepts above the split depth are computed here
+    local: list[Concept] = []
+    frontier = [(extent, intent, 0)]
+    for _ in range(split_depth):
+        next_frontier = []
+        for node_extent, node_intent, start in frontier:
+            next_frontier.extend(
+                in_close_children(columns, node_extent, node_intent, start)
+            )
+            local.append((node_extent, node_intent))
+        frontier = next_frontier
+
+    found: list[Concept] = []
+    if ordered:
+        found.extend(local)
+    else:
+        yield from local
+
+    if frontier:
+        mp_context = pool_context()
+        stop = mp_context.Event()
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(
+                context.objects,
+                context.attributes,
+                context.incidence,
+                context.backend,
+                stop,
+            ),
+        )
+        try:
+            pending = {executor.submit(_enumerate_subtree, *node) for node in frontier}
+            while pending:
+                done, pending = wait(
+                    pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    if ordered:
+                        found.extend(future.result())
+                    else:
+                        yield from future.result()
+                if progress is not None:
+                    progress.check()
+        except BaseException:
+            # Drop the queued subtrees and let the running ones return early
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+    if ordered:
+        # Lectic order coincides with the order of intents read as bit strings
+        found.sort(key=lambda concept: concept[1])
+        yield from found
@@ -0,0 +1,109 @@
+"""
+Progress reporting and cooperative cancellation of long computations.
+
+The concept enumeration and the basis computations accept a Progress and
+update it as they go. They poll it at every step and stop by raising
+Cancelled once it is cancelled, leaving what they found so far in
+Progress.partial. A Job runs such a computation in a worker thread.
+"""
+
+import threading
+import time
+from typing import Any, Callable
+from bitarray import bitarray
+
+
+class Cancelled(Exception):
+    """Raised inside a computation whose Progress was cancelled."""
+
+
+class Progress:
+    """
+    Live counters of a running computation and its cancellation flag.
+    position is the set the computation is currently at (in lectic order
+    for NextClosure and the canonical basis) and partial holds the results
+    found so far: the ConceptStore being filled, the list of basis
+    implications or the (premise, conclusion) bits of defeasible conditionals.
+    """
+
+    def __init__(self) -> None:
+        self.phase: str = ""
+        self.concepts: int = 0
+        self.pseudo_intents: int = 0
+        self.conditionals: int = 0
+        self.position: bitarray | None = None
+        self.partial: Any = None
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the computation to stop at its next step."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self) -> None:
+        """Raise Cancelled if cancel was called."""
+        if self._cancelled.is_set():
+            raise Cancelled()
+
+
+class Job:
+    """
+    A computation running in a daemon worker thread.
+    target is called with the job's Progress; its return value ends up in
+    result, or the exception it raised in error. A cancelled job is neither
+    completed nor failed, and its partial results stay in progress.partial.
+    """
+
+    def __init__(self, name: str, target: Callable[[Progress], Any]) -> None:
+        self.name: str = name
+        self.progress: Progress = Progress()
+        self.result: Any = None
+        self.error: Exception | None = None
+        self.completed: bool = False
+        self.started: float | None = None
+        self.finished: float | None = None
+        self._target = target
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> "Job":
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            self.result = self._target(self.progress)
+            self.completed = True
+        except Cancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = time.perf_counter()
+
+    def cancel(self) -> None:
+        self.progress.cancel()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the job to end; True if it has."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        return not (self.running or self.completed or self.error)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the job started, up to when it ended."""
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
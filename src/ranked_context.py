@@ -1,9 +1,12 @@
-from typing import override
-import itertools
-from bitarray import bitarray
+from bisect import bisect_right
+from typing import Iterable, override
+from bitarray import bitarray, frozenbitarray
+from bitarray.util import subset
 from src.conditional import Conditional
 from src.context import FormalContext
 from src.implications import Implication
+from src.intent_index import IntentTrie
+from src.progress import Progress
 
 
 class RankedContext(FormalContext):
@@ -13,12 +16,12 @@ class RankedContext(FormalContext):
         attributes: list[str],
         incidence: list[bitarray] | None = None,
         rankings: list[FormalContext] | None = None,
+        backend: str = "bitarray",
     ) -> None:
-        super().__init__(objects, attributes, incidence)
-        defeasible_basis: list[Conditional] = []
+        super().__init__(objects, attributes, incidence, backend)
 
         if rankings is None:
-            self.rankings = [FormalContext(objects, attributes, incidence)]
+            self.rankings = [FormalContext(objects, attributes, incidence, backend)]
         else:
             for ctx in rankings:
                 if ctx.attributes != attributes:
@@ -27,6 +30,85 @@ class RankedContext(FormalContext):
                     )
             self.rankings: list[FormalContext] = rankings
 
+        # Attribute extents over all ranked objects, laid out rank after rank,
+        # and the position where each rank starts (see _rank_index)
+        self._rank_columns: list[bitarray] | None = None
+        self._rank_starts: list[int] | None = None
+
+        # Defeasible basis as (premise, conclusion) intent bits, its decoded
+        # conditionals and the conclusions indexed by premise, built on demand
+        self._defeasible_pairs: list[tuple[bitarray, bitarray]] | None = None
+        self._defeasible_basis: list[Conditional] | None = None
+        self._defeasible_index: dict[frozenbitarray, set[frozenbitarray]] | None = None
+        # content_key extended by the rank partition, see ranked_key
+        self._ranked_key: str | None = None
+
+    @override
+    def _invalidate_caches(self, keep_concepts: bool = False) -> None:
+        super()._invalidate_caches(keep_concepts)
+        self._rank_columns = None
+        self._rank_starts = None
+        self._defeasible_pairs = None
+        self._defeasible_basis = None
+        self._defeasible_index = None
+        self._ranked_key = None
+
+    def ranked_key(self) -> str:
+        """
+        Hex digest that keys results depending on the ranking, such as the
+        defeasible basis, in a ResultCache. Concepts and the canonical basis
+        only depend on the incidence and use content_key.
+        """
+        if self._ranked_key is None:
+            from src.cache import ranked_key
+
+            self._ranked_key = ranked_key(self)
+        return self._ranked_key
+
+    def _rank_index(self) -> tuple[list[bitarray], list[int]]:
+        """
+        Attribute extents over the objects of all ranks in rank order, so
+        that every rank and every union of ranks 0..r is a contiguous range,
+        plus the start of each rank (with the total count appended).
+        """
+        if self._rank_columns is None:
+            starts = [0]
+            for rank in self.rankings:
+                starts.append(starts[-1] + rank.num_objects)
+
+            columns = []
+            for _ in range(self.num_attributes):
+                column = bitarray(starts[-1])
+                column.setall(0)
+                columns.append(column)
+            for rank, start in zip(self.rankings, starts):
+                for offset, row in enumerate(rank.incidence):
+                    for attr_idx in row.search(1):
+                        columns[attr_idx][start + offset] = 1
+
+            self._rank_columns = columns
+            self._rank_starts = starts
+        return self._rank_columns, self._rank_starts  # type: ignore
+
+    def _typical_extent(self, premise: bitarray) -> tuple[int, bitarray] | None:
+        """
+        The most typical rank having premise and its objects with premise
+        (as a bitarray over that rank's objects). None if no object has it.
+        One extent intersection finds the first ranked object with premise;
+        the rank containing it is the most typical one.
+        """
+        columns, starts = self._rank_index()
+        extent = bitarray(starts[-1])
+        extent.setall(1)
+        for attr_idx in premise.search(1):
+            extent &= columns[attr_idx]
+
+        first = extent.find(1)
+        if first < 0:
+            return None
+        rank_idx = bisect_right(starts, first) - 1
+        return rank_idx, extent[starts[rank_idx] : starts[rank_idx + 1]]
+
     @override
     def satisfies(self, implication: Implication) -> bool:
         """
@@ -36,58 +118,165 @@ class RankedContext(FormalContext):
         """
         # Check if it's specifically a Conditional (not just an Implication)
         if isinstance(implication, Conditional):
-            # Ranked context semantics: check first rank with premise
-            for rank in self.rankings:
-                if not any(
-                    (object_intent & implication.premise_bits)
-                    == implication.premise_bits
-                    for object_intent in (
-                        rank.object_intent(i) for i in range(rank.num_objects)
-                    )
-                ):
-                    continue
-                return rank.satisfies(implication)
-            return False
+            return self.holds(implication.premise_bits, implication.conclusion_bits)
         else:
             # Classical semantics: all objects must satisfy
             return super().satisfies(implication)
 
-    def compute_defeasible_basis(self) -> list[Conditional]:
+    def holds(self, premise: bitarray, conclusion: bitarray) -> bool:
+        """
+        Whether the conditional premise |~ conclusion, given as attribute
+        bits, holds: ranked semantics, checked in the first rank with the
+        premise, found through the rank index.
+        """
+        found = self._typical_extent(premise)
+        if found is None:
+            return False
+        rank_idx, premise_extent = found
+        # The premise objects must lie in the extent of every conclusion
+        # attribute, i.e. in the AND of their columns
+        columns = self.rankings[rank_idx]._attribute_columns()
+        return all(
+            subset(premise_extent, columns[attr_idx])
+            for attr_idx in conclusion.search(1)
+        )
+
+    def _typical_intent(self, premise: bitarray) -> bitarray | None:
+        """
+        Attributes shared by the most typical objects having premise, i.e. by
+        the premise objects of the first rank that has any. A conditional
+        premise |~ conclusion holds iff conclusion is a subset of it.
+        None if no object has the premise.
+        """
+        found = self._typical_extent(premise)
+        if found is None:
+            return None
+        rank_idx, premise_extent = found
+        return self.rankings[rank_idx].prime_objects(premise_extent)
+
+    def compute_defeasible_basis(
+        self, progress: Progress | None = None
+    ) -> list[Conditional]:
         """
         returns a set of conditionals of the form {X'' -> Y'' | X'' subset Y''}
         Maybe this is sound & complete w.r.t. preferential entailment from self.
         I think it is not redundant
 
+        A cancelled progress stops the computation with Cancelled and leaves
+        the concepts or (premise, conclusion) bits found so far in
+        progress.partial.
         """
-        include = []
-        # print(self.intents_list)
-        for premise, conclusion in itertools.combinations(self.intents_list, 2):
-            if premise < conclusion:  # premise is proper subset of conclusion
-                query = Conditional(premise, conclusion.union(premise), self.attributes)
-                if self.satisfies(query):
-                    include.append(query)
-            elif conclusion < premise:  # conclusion is proper subset of premise
-                query = Conditional(conclusion, premise, self.attributes)
-                if self.satisfies(query):
-                    include.append(query)
+        if self._defeasible_basis is None:
+            pairs = self._defeasible_basis_bits(progress)
+            premises = self._bitarrays_to_attributes(premise for premise, _ in pairs)
+            conclusions = self._bitarrays_to_attributes(
+                conclusion for _, conclusion in pairs
+            )
+            self._defeasible_basis = [
+                Conditional(premise, conclusion, self.attributes)
+                for premise, conclusion in zip(premises, conclusions)
+            ]
+        return self._defeasible_basis
+
+    @property
+    def defeasible_basis(self) -> list[Conditional]:
+        return self.compute_defeasible_basis()
 
-        self.defeasible_basis = include
-        return include
+    def _defeasible_basis_bits(
+        self, progress: Progress | None = None
+    ) -> list[tuple[bitarray, bitarray]]:
+        """The defeasible basis as (premise, conclusion) intent bitarrays."""
+        if self._defeasible_pairs is not None:
+            return self._defeasible_pairs
+        cache = self.result_cache
+        if cache is not None:
+            key = cache.ranked_key(self)
+            self._defeasible_pairs = cache.load_pairs(
+                key, "defeasible-basis", self.num_attributes
+            )
+            if self._defeasible_pairs is not None:
+                return self._defeasible_pairs
+
+        concepts = self._current_concepts(progress)
+        intents = [concepts.intent_bits(i) for i in range(len(concepts))]
+        index = IntentTrie()
+        for i, intent in enumerate(intents):
+            index.insert(intent, i)
+
+        # For each premise intent the conclusions that hold are exactly the
+        # intents between it and the attributes of its most typical objects
+        pairs = []
+        if progress is not None:
+            progress.phase = "defeasible basis"
+            progress.partial = []
+        for premise_id, premise in enumerate(intents):
+            if progress is not None:
+                progress.check()
+                progress.position = premise
+            typical = self._typical_intent(premise)
+            if typical is None:
+                continue
+            for conclusion_id in index.between(premise, typical):
+                if conclusion_id != premise_id:
+                    pairs.append((premise_id, conclusion_id))
+                    if progress is not None:
+                        progress.partial.append((premise, intents[conclusion_id]))
+                        progress.conditionals += 1
+
+        # Same order as enumerating all pairs of concepts
+        pairs.sort(key=lambda pair: (min(pair), max(pair)))
+        self._defeasible_pairs = [
+            (intents[premise_id], intents[conclusion_id])
+            for premise_id, conclusion_id in pairs
+        ]
+        if cache is not None:
+            cache.store_pairs(
+                key, "defeasible-basis", self.num_attributes, self._defeasible_pairs
+            )
+        return self._defeasible_pairs
+
+    def _defeasible_basis_index(self) -> dict[frozenbitarray, set[frozenbitarray]]:
+        """Conclusions of the defeasible basis keyed by their premise."""
+        if self._defeasible_index is None:
+            index: dict[frozenbitarray, set[frozenbitarray]] = {}
+            for premise, conclusion in self._defeasible_basis_bits():
+                index.setdefault(frozenbitarray(premise), set()).add(
+                    frozenbitarray(conclusion)
+                )
+            self._defeasible_index = index
+        return self._defeasible_index
 
     def entailed(self, query: Conditional) -> bool:
-        premise_closed = self.closure(self._attributes_to_bitarray(query.premise))
-        concl_closed = self.closure(self._attributes_to_bitarray(query.conclusion))
-        premise = self._bitarray_to_attributes(premise_closed)
-        concl = self._bitarray_to_attributes(concl_closed)
-
-        newq = Conditional(premise, concl.union(premise), self.attributes)
-        print(newq)
-        if (
-            Conditional(premise, concl.union(premise), self.attributes)
-            in self.defeasible_basis
-        ):
-            return True
-        return False
+        """
+        True if the closed query, premise'' |~ (premise'' | conclusion''),
+        is in the defeasible basis. The basis is computed on first use.
+        """
+        premise = self.closure(query.premise_bits)
+        conclusion = self.closure(query.conclusion_bits) | premise
+        conclusions = self._defeasible_basis_index().get(frozenbitarray(premise))
+        return conclusions is not None and frozenbitarray(conclusion) in conclusions
+
+    def entailed_many(self, queries: Iterable[Conditional]) -> list[bool]:
+        """entailed for every query, sharing the closures of repeated sets."""
+        closures: dict[frozenbitarray, frozenbitarray] = {}
+
+        def closed(bits: bitarray) -> frozenbitarray:
+            key = frozenbitarray(bits)
+            result = closures.get(key)
+            if result is None:
+                result = closures[key] = frozenbitarray(self.closure(bits))
+            return result
+
+        index = self._defeasible_basis_index()
+        results = []
+        for query in queries:
+            premise = closed(query.premise_bits)
+            conclusions = index.get(premise)
+            results.append(
+                conclusions is not None
+                and (closed(query.conclusion_bits) | premise) in conclusions
+            )
+        return results
 
     @override
     def __repr__(self) -> str:
@@ -1,20 +1,29 @@
+from bisect import bisect_right
 from bitarray import bitarray
-from typing import override
+from typing import Iterator, override
+from src.concepts import ConceptStore
 from src.context import FormalContext
+from src.intent_index import IntentTrie
 from src.ranked_context import RankedContext
 
 
 class TranslatedContext(FormalContext):
     def __init__(self, *args, **kwargs) -> None:
+        backend: str = kwargs.pop("backend", "bitarray")
+        if kwargs:
+            raise TypeError(f"Unexpected keyword arguments: {', '.join(kwargs)}")
         if len(args) == 1 and hasattr(args[0], "objects"):
             ranked_context: RankedContext = args[0]
             # Use concept intents from the underlying context (rank 0)
-            attributes = ranked_context.rankings[0].intents_list
-            incidence, objects = self.make_incidence(ranked_context, attributes)
-            super().__init__(objects, attributes, incidence)
+            rank_zero = ranked_context.rankings[0]
+            attributes = rank_zero.intents_list
+            incidence, objects, columns = self.make_incidence(
+                ranked_context, rank_zero.concepts
+            )
+            super().__init__(objects, attributes, incidence, backend, columns)
         elif len(args) == 3:
             objects, attributes, incidence = args
-            super().__init__(objects, attributes, incidence)
+            super().__init__(objects, attributes, incidence, backend)
         else:
             raise TypeError(
                 "TranslatedContext() expects either a RankedContext "
@@ -22,49 +31,39 @@ class TranslatedContext(FormalContext):
             )
 
     def make_incidence(
-        self, ranked_context: RankedContext, attributes: list[list[str]]
-    ) -> tuple[list[bitarray], list[str]]:
+        self, ranked_context: RankedContext, concepts: ConceptStore
+    ) -> tuple[list[bitarray], list[str], list[bitarray]]:
+        """
+        An object has an intent if it has all of its attributes itself, or
+        if any object in a strictly better rank has them (inheritance).
+        Every intent's extent is computed once over the objects in rank
+        order; inheritance is the OR of the ranks before the object's own.
+        Returns the rows, the objects and the columns, which are each
+        intent's extent with every object after its first rank added.
+        """
+        intents = [concepts.intent_bits(i) for i in range(len(concepts))]
+        extents, first_ranks = intent_extents(ranked_context, intents)
+        _, starts = ranked_context._rank_index()
+
+        num_ranks = len(ranked_context.rankings)
+        inherited = inherited_masks(first_ranks, num_ranks)
+
         incidence: list[bitarray] = []
         new_objects: list[str] = []
+        for rank_idx, context in enumerate(ranked_context.rankings):
+            incidence.extend(inherited[rank_idx].copy() for _ in context.objects)
+            new_objects.extend(context.objects)
 
-        # Track which attributes are satisfied by ANY object in lower ranks (cumulative)
-        # This represents the attributes that are "true in better/more normal worlds"
-        cumulative_satisfies = bitarray(len(attributes))
-        cumulative_satisfies.setall(0)
+        # Only the crosses in an intent's first rank are not inherited
+        for intent_idx, (extent, first_rank) in enumerate(zip(extents, first_ranks)):
+            if first_rank == num_ranks:
+                continue
+            start, stop = starts[first_rank], starts[first_rank + 1]
+            for offset in extent[start:stop].search(1):
+                incidence[start + offset][intent_idx] = 1
+            extent[stop:] = 1
 
-        # Process each rank in order (0, 1, 2, ...)
-        for rank_idx, context in enumerate(ranked_context.rankings):
-            # Track what THIS rank satisfies (before inheritance)
-            current_rank_satisfies = bitarray(len(attributes))
-            current_rank_satisfies.setall(0)
-
-            for obj_idx in range(context.num_objects):
-                obj_name = context.objects[obj_idx]
-                row = bitarray(len(attributes))
-                row.setall(0)
-
-                # Check if this object at this rank satisfies each attribute
-                for attr_idx, attr_list in enumerate(attributes):
-                    has_all = all(
-                        context.incidence[obj_idx][context.attributes.index(attr)]
-                        for attr in attr_list
-                    )
-                    if has_all:
-                        row[attr_idx] = 1
-                        current_rank_satisfies[attr_idx] = 1
-
-                # Inherit from ANY object in lower ranks (0..rank_idx-1)
-                # If any object in a better world satisfies an attribute, all objects in
-                # worse worlds inherit it
-                row |= cumulative_satisfies
-
-                incidence.append(row)
-                new_objects.append(obj_name)
-
-            # Update cumulative: add what this rank satisfies
-            cumulative_satisfies |= current_rank_satisfies
-
-        return incidence, new_objects
+        return incidence, new_objects, extents
 
     @override
     def __repr__(self) -> str:
@@ -93,3 +92,179 @@ class TranslatedContext(FormalContext):
             lines.append(line)
 
         return "\n".join(lines)
+
+
+class SparseTranslatedContext:
+    """
+    TranslatedContext without the dense objects x concepts incidence.
+
+    Object g of rank r has concept j iff j is first held by a rank before r
+    (inherited), or g itself has the intent. Only one inherited mask per
+    rank is kept; the object's own crosses beyond it are found on demand
+    with a set-trie subset query over the intents and then cached. The
+    derivation operators reduce to a single rank: the best rank among the
+    objects for prime_objects, the last first-rank of the intents for
+    prime_attributes.
+    """
+
+    def __init__(self, ranked_context: RankedContext) -> None:
+        self.ranked_context = ranked_context
+        self.rankings = ranked_context.rankings
+        rank_zero = self.rankings[0]
+        concepts = rank_zero.concepts
+        self.attributes = rank_zero.intents_list
+        self.objects: list[str] = [
+            obj for rank in self.rankings for obj in rank.objects
+        ]
+        self.num_objects: int = len(self.objects)
+        self.num_attributes: int = len(concepts)
+
+        self._intents = [concepts.intent_bits(i) for i in range(len(concepts))]
+        self._index = IntentTrie()
+        for intent_idx, intent in enumerate(self._intents):
+            self._index.insert(intent, intent_idx)
+        _, self._starts = ranked_context._rank_index()
+
+        # First rank holding each intent (len(rankings) if none does)
+        num_ranks = len(self.rankings)
+        self._first_ranks: list[int] = []
+        for intent in self._intents:
+            found = ranked_context._typical_extent(intent)
+            self._first_ranks.append(num_ranks if found is None else found[0])
+
+        self._inherited = inherited_masks(self._first_ranks, num_ranks)
+
+        # Crosses of each object not covered by its inherited mask
+        self._own: dict[int, list[int]] = {}
+
+    def rank_of(self, obj_idx: int) -> int:
+        return bisect_right(self._starts, obj_idx) - 1
+
+    def _held_in_rank(self, rank_idx: int, attributes: bitarray) -> list[int]:
+        """Concepts first held by rank_idx whose intent is within attributes."""
+        return [
+            intent_idx
+            for intent_idx in self._index.subsets(attributes)
+            if self._first_ranks[intent_idx] == rank_idx
+        ]
+
+    def own_intents(self, obj_idx: int) -> list[int]:
+        """The concepts of obj_idx that it does not inherit, in order."""
+        own = self._own.get(obj_idx)
+        if own is None:
+            rank_idx = self.rank_of(obj_idx)
+            row = self.rankings[rank_idx].incidence[obj_idx - self._starts[rank_idx]]
+            own = self._own[obj_idx] = sorted(self._held_in_rank(rank_idx, row))
+        return own
+
+    def row(self, obj_idx: int) -> bitarray:
+        """The translated incidence row of obj_idx."""
+        row = self._inherited[self.rank_of(obj_idx)].copy()
+        for intent_idx in self.own_intents(obj_idx):
+            row[intent_idx] = 1
+        return row
+
+    def rows(self) -> Iterator[bitarray]:
+        for obj_idx in range(self.num_objects):
+            yield self.row(obj_idx)
+
+    def prime_objects(self, objects: bitarray) -> bitarray:
+        """
+        Compute the intent of a set of objects. Objects in worse ranks
+        inherit everything the best rank present can have, so only the
+        objects of that rank decide.
+        """
+        first = objects.find(1)
+        if first < 0:
+            result = bitarray(self.num_attributes)
+            result.setall(1)
+            return result
+
+        rank_idx = self.rank_of(first)
+        start, stop = self._starts[rank_idx], self._starts[rank_idx + 1]
+        common = self.rankings[rank_idx].prime_objects(objects[start:stop])
+        result = self._inherited[rank_idx].copy()
+        for intent_idx in self._held_in_rank(rank_idx, common):
+            result[intent_idx] = 1
+        return result
+
+    def prime_attributes(self, attributes: bitarray) -> bitarray:
+        """
+        Compute the extent of a set of concepts. Objects of ranks after the
+        last first-rank of the concepts inherit them all; in that rank the
+        objects must have the union of the intents first held there.
+        """
+        result = bitarray(self.num_objects)
+        selected = list(attributes.search(1))
+        if not selected:
+            result.setall(1)
+            return result
+
+        result.setall(0)
+        rank_idx = max(self._first_ranks[intent_idx] for intent_idx in selected)
+        if rank_idx == len(self.rankings):
+            return result
+
+        rank = self.rankings[rank_idx]
+        required = bitarray(rank.num_attributes)
+        required.setall(0)
+        for intent_idx in selected:
+            if self._first_ranks[intent_idx] == rank_idx:
+                required |= self._intents[intent_idx]
+
+        start, stop = self._starts[rank_idx], self._starts[rank_idx + 1]
+        result[start:stop] = rank.prime_attributes(required)
+        result[stop:] = 1
+        return result
+
+    def closure(self, attributes: bitarray) -> bitarray:
+        """Compute the closure of a set of concepts (A'')."""
+        return self.prime_objects(self.prime_attributes(attributes))
+
+    def to_dense(self) -> TranslatedContext:
+        """Materialize the translated context."""
+        return TranslatedContext(self.objects, self.attributes, list(self.rows()))
+
+
+def intent_extents(
+    ranked_context: RankedContext, intents: list[bitarray]
+) -> tuple[list[bitarray], list[int]]:
+    """
+    The extent of every intent over the objects of all ranks in rank order,
+    and the first rank containing an object of it (len(rankings) if none).
+    """
+    columns, starts = ranked_context._rank_index()
+    extents = []
+    first_ranks = []
+    for intent in intents:
+        extent = bitarray(starts[-1])
+        extent.setall(1)
+        for attr_idx in intent.search(1):
+            extent &= columns[attr_idx]
+        extents.append(extent)
+
+        first = extent.find(1)
+        if first < 0:
+            first_ranks.append(len(ranked_context.rankings))
+        else:
+            first_ranks.append(bisect_right(starts, first) - 1)
+    return extents, first_ranks
+
+
+def inherited_masks(first_ranks: list[int], num_ranks: int) -> list[bitarray]:
+    """
+    For every rank r the intents first held by a rank before r, i.e. those
+    all of its objects inherit: a prefix OR over the ranks.
+    """
+    first_held: list[list[int]] = [[] for _ in range(num_ranks + 1)]
+    for intent_idx, first_rank in enumerate(first_ranks):
+        first_held[first_rank].append(intent_idx)
+
+    masks = []
+    mask = bitarray(len(first_ranks))
+    mask.setall(0)
+    for rank_idx in range(num_ranks):
+        masks.append(mask.copy())
+        for intent_idx in first_held[rank_idx]:
+            mask[intent_idx] = 1
+    return masks
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from typing import Iterable
+from unittest import mock
+from bitarray import bitarray
+from src.context import FormalContext
+
+
+def concept_list(
+    concepts: Iterable[tuple[bitarray, bitarray]],
+) -> list[tuple[str, str]]:
+    """(extent, intent) pairs as comparable strings, in order."""
+    return [(extent.to01(), intent.to01()) for extent, intent in concepts]
+
+
+def concept_set(concepts: Iterable[tuple[bitarray, bitarray]]) -> set[tuple[str, str]]:
+    """(extent, intent) pairs as comparable strings, in any order."""
+    return set(concept_list(concepts))
+
+
+def copy_context(context: FormalContext) -> FormalContext:
+    """A fresh context with the same names and incidence and nothing computed."""
+    return FormalContext(
+        list(context.objects),
+        list(context.attributes),
+        [row.copy() for row in context.incidence],
+    )
+
+
+def isolated_cache(testcase: unittest.TestCase) -> str:
+    """
+    Keep the result cache out of the user's cache directory for one test.
+    Returns a temporary directory, removed after the test, whose "cache"
+    subdirectory holds the cache; other files can go beside it.
+    """
+    directory = tempfile.TemporaryDirectory()
+    testcase.addCleanup(directory.cleanup)
+    patcher = mock.patch.dict(
+        os.environ, {"PORT_ROYAL_CACHE_DIR": os.path.join(directory.name, "cache")}
+    )
+    patcher.start()
+    testcase.addCleanup(patcher.stop)
+    return directory.name
@@ -0,0 +1,93 @@
+import unittest
+from bitarray import bitarray
+from benchmarks.generator import random_context, random_subsets
+from src import packed
+from src.context import FormalContext
+
+# (objects, attributes): empty contexts and widths around 64-bit words
+SHAPES = [(0, 5), (7, 0), (0, 0), (1, 1), (63, 65), (130, 64), (40, 129), (65, 3)]
+
+
+def both_backends(num_objects: int, num_attributes: int, seed: int):
+    context, _ = random_context(num_objects, num_attributes, 0.4, seed)
+    numpy_context = FormalContext(
+        list(context.objects),
+        list(context.attributes),
+        [row.copy() for row in context.incidence],
+        "numpy",
+    )
+    return context, numpy_context
+
+
+def queries(size: int, seed: int) -> list[bitarray]:
+    empty = bitarray(size)
+    empty.setall(0)
+    return random_subsets(size, 15, 0.1, seed) + [empty, ~empty]
+
+
+@unittest.skipIf(packed.np is None, "numpy is not installed")
+class NumpyBackendTest(unittest.TestCase):
+    def assert_same_operators(self, context, numpy_context, seed: int) -> None:
+        for objects in queries(context.num_objects, seed):
+            self.assertEqual(
+                numpy_context.prime_objects(objects), context.prime_objects(objects)
+            )
+        for attributes in queries(context.num_attributes, seed + 1):
+            self.assertEqual(
+                numpy_context.prime_attributes(attributes),
+                context.prime_attributes(attributes),
+            )
+            self.assertEqual(
+                numpy_context.closure(attributes), context.closure(attributes)
+            )
+
+    def test_operators_match_bitarray(self):
+        for seed, (num_objects, num_attributes) in enumerate(SHAPES):
+            context, numpy_context = both_backends(num_objects, num_attributes, seed)
+            self.assert_same_operators(context, numpy_context, seed)
+
+    def test_operators_after_edits(self):
+        for seed, (num_objects, num_attributes) in enumerate(SHAPES):
+            if not num_objects or not num_attributes:
+                continue
+            context, numpy_context = both_backends(num_objects, num_attributes, seed)
+            numpy_context.prime_objects(queries(num_objects, seed)[0])
+            for obj_idx in range(0, num_objects, 5):
+                attr_idx = (obj_idx * 7) % num_attributes
+                value = not context.incidence[obj_idx][attr_idx]
+                context.set_relation(obj_idx, attr_idx, value)
+                numpy_context.set_relation(obj_idx, attr_idx, value)
+            row = bitarray(num_attributes)
+            row.setall(1)
+            context.add_object("new", row)
+            numpy_context.add_object("new", row.copy())
+            self.assert_same_operators(context, numpy_context, seed)
+
+    def test_concepts_match_bitarray(self):
+        # Wide contexts have too many concepts to enumerate here
+        for seed, (num_objects, num_attributes) in enumerate(SHAPES[:4] + [(70, 10)]):
+            context, numpy_context = both_backends(num_objects, num_attributes, seed)
+            self.assertEqual(
+                [(e.to01(), i.to01()) for e, i in numpy_context.concepts],
+                [(e.to01(), i.to01()) for e, i in context.concepts],
+            )
+
+    def test_packed_rows(self):
+        for num_bits in (0, 1, 63, 64, 65, 129):
+            rows = random_subsets(num_bits, 9, 0.5, num_bits)
+            matrix = packed.pack_bits(rows, num_bits)
+            self.assertEqual(matrix.shape, (len(rows), packed.words_for(num_bits)))
+            for row, words in zip(rows, matrix):
+                self.assertEqual(packed.words_to_bits(words, num_bits), row)
+            for selected in queries(len(rows), num_bits):
+                expected = bitarray(num_bits)
+                expected.setall(1)
+                for idx in selected.search(1):
+                    expected &= rows[idx]
+                self.assertEqual(
+                    packed.and_reduce(matrix, selected, num_bits), expected
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import unittest
+from unittest import mock
+from benchmarks.generator import random_context
+from main import BatchSession, main
+from src.algorithms import object_rank
+from src.implications import Implication
+from src.io import save_context
+from tests.helpers import isolated_cache
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = isolated_cache(self)
+
+        self.context, _ = random_context(12, 5, 0.4, seed=3)
+        self.path = os.path.join(self.directory, "context.ctx")
+        save_context(self.context, self.path)
+
+    def run_batch(self, lines: list[str]) -> tuple[list[dict], int]:
+        out = io.StringIO()
+        failed = BatchSession().run_lines(lines, out)
+        return [json.loads(line) for line in out.getvalue().splitlines()], failed
+
+    def test_records(self):
+        records, failed = self.run_batch(
+            [
+                "# a comment",
+                f"load {self.path}",
+                "",
+                "info",
+                "intents 2 --offset 1",
+                "impl a0 -> a1",
+                "rank",
+                "cond a0 |~ a1",
+                "basis",
+            ]
+        )
+        self.assertEqual(failed, 0)
+        self.assertEqual(
+            [(r["line"], r["command"]) for r in records],
+            [(2, "load"), (4, "info"), (5, "intents"), (6, "impl")]
+            + [(7, "rank"), (8, "cond"), (9, "basis")],
+        )
+        for record in records:
+            self.assertEqual(list(record)[:3], ["line", "command", "ok"])
+            self.assertTrue(record["ok"])
+
+        load, info, intents, impl, rank, cond, basis = records
+        self.assertEqual((load["objects"], load["attributes"]), (12, 5))
+        self.assertEqual(info["objects"], self.context.objects)
+        self.assertEqual(intents["offset"], 1)
+        self.assertEqual(intents["count"], 2)
+        self.assertEqual(
+            [set(names) for names in intents["intents"]],
+            list(self.context.intents_list[1:3]),
+        )
+        self.assertTrue(intents["more"])
+        self.assertEqual(
+            (impl["index"], impl["premise"], impl["conclusion"]), (0, ["a0"], ["a1"])
+        )
+
+        delta = [Implication(["a0"], ["a1"], self.context.attributes)]
+        ranked = object_rank(self.context, delta)
+        self.assertEqual(rank["ranks"], [r.objects for r in ranked.rankings])
+        premise, conclusion = ranked._attributes_to_bitarrays([["a0"], ["a1"]])
+        self.assertEqual(cond["satisfied"], ranked.holds(premise, conclusion))
+        self.assertEqual(
+            [(set(r["premise"]), set(r["conclusion"])) for r in basis["implications"]],
+            [(i.premise, i.conclusion) for i in self.context.get_canonical_basis()],
+        )
+
+    def test_errors_are_records(self):
+        records, failed = self.run_batch(
+            [
+                "info",
+                f"load {self.path}",
+                "bogus",
+                "closure zz",
+                "cond a0 |~ a1",
+                "intents 0",
+                "extent a0",
+            ]
+        )
+        self.assertEqual(failed, 5)
+        self.assertEqual(
+            [r["ok"] for r in records], [False, True, False, False, False, False, True]
+        )
+        for record in records:
+            if not record["ok"]:
+                self.assertEqual(set(record), {"line", "command", "ok", "error"})
+                self.assertIsInstance(record["error"], str)
+                self.assertTrue(record["error"])
+        self.assertEqual(records[0]["error"], "No context loaded.")
+        self.assertEqual(records[2]["error"], "Unknown command: bogus")
+
+    def test_quit_stops(self):
+        records, _ = self.run_batch([f"load {self.path}", "quit", "info"])
+        self.assertEqual([r["command"] for r in records], ["load"])
+
+    def test_exit_status(self):
+        for lines, status in [(["load", "info"], 1), ([f"load {self.path}"], 0)]:
+            script = os.path.join(self.directory, "script.txt")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            out = io.StringIO()
+            with (
+                mock.patch("sys.argv", ["main.py", "--batch", script]),
+                mock.patch("sys.stdout", out),
+                self.assertRaises(SystemExit) as raised,
+            ):
+                main()
+            self.assertEqual(raised.exception.code, status)
+            self.assertEqual(len(out.getvalue().splitlines()), len(lines))
+
+    def test_standard_input(self):
+        out = io.StringIO()
+        with (
+            mock.patch("sys.argv", ["main.py", "--batch", "-"]),
+            mock.patch("sys.stdin", io.StringIO(f"load {self.path}\ninfo\n")),
+            mock.patch("sys.stdout", out),
+            self.assertRaises(SystemExit) as raised,
+        ):
+            main()
+        self.assertEqual(raised.exception.code, 0)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["command"] for r in records], ["load", "info"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from benchmarks.generator import random_context
+from src.context import FormalContext
+from tests.helpers import concept_list, copy_context
+
+
+def basis(context: FormalContext) -> list[tuple[frozenset[str], frozenset[str]]]:
+    return [(impl.premise, impl.conclusion) for impl in context.get_canonical_basis()]
+
+
+class BulkUpdateTest(unittest.TestCase):
+    def setUp(self):
+        self.context, _ = random_context(20, 8, 0.4, seed=1)
+        self.context.concepts
+        self.context.intents_list
+
+    def edit(self, seed: int) -> None:
+        for obj_idx in range(seed, self.context.num_objects, 4):
+            attr_idx = (obj_idx * 3) % self.context.num_attributes
+            value = not self.context.incidence[obj_idx][attr_idx]
+            self.context.set_relation(obj_idx, attr_idx, value)
+
+    def assert_consistent(self) -> None:
+        fresh = copy_context(self.context)
+        self.assertEqual(self.context._bulk_depth, 0)
+        self.assertFalse(self.context._pending_invalidation)
+        self.assertEqual(
+            concept_list(self.context.concepts), concept_list(fresh.concepts)
+        )
+        self.assertEqual(list(self.context.intents_list), list(fresh.intents_list))
+        self.assertEqual(basis(self.context), basis(fresh))
+        self.assertEqual(self.context.content_key(), fresh.content_key())
+        for attr_idx, column in enumerate(self.context._attribute_columns()):
+            self.assertEqual(column, fresh._attribute_columns()[attr_idx])
+
+    def test_concepts_are_invalidated_on_exit(self):
+        concepts = self.context._concepts
+        intents = self.context._intents_list
+        with self.context.bulk_update():
+            self.edit(0)
+            self.context.add_relation("g1", "a2")
+            # The concepts computed before the block are kept until it ends
+            self.assertIs(self.context._concepts, concepts)
+            self.assertIs(self.context._intents_list, intents)
+            self.assertFalse(self.context._concepts_dirty)
+            self.assertTrue(self.context._pending_invalidation)
+        self.assertIsNone(self.context._concepts)
+        self.assert_consistent()
+
+    def test_nested_blocks_invalidate_once(self):
+        concepts = self.context._concepts
+        with self.context.bulk_update():
+            with self.context.bulk_update():
+                self.edit(1)
+            self.assertIs(self.context._concepts, concepts)
+            self.edit(2)
+        self.assertIsNone(self.context._concepts)
+        self.assert_consistent()
+
+    def test_added_objects(self):
+        self.context.incremental = True
+        with self.context.bulk_update():
+            self.edit(3)
+            row = self.context.incidence[0].copy()
+            row.invert()
+            self.context.add_object("new", row)
+        self.assert_consistent()
+
+    def test_lattice_inside_the_block(self):
+        self.context.get_lattice()
+        with self.context.bulk_update():
+            self.edit(0)
+            lattice = self.context.get_lattice()
+            fresh = copy_context(self.context).get_lattice()
+            self.assertEqual(lattice.upper_covers, fresh.upper_covers)
+            self.assertEqual(
+                concept_list(self.context.concepts), concept_list(fresh.concepts)
+            )
+            self.assertFalse(self.context._pending_invalidation)
+            self.edit(1)
+            self.assertTrue(self.context._pending_invalidation)
+            lattice = self.context.get_lattice()
+            fresh = copy_context(self.context).get_lattice()
+            self.assertEqual(lattice.upper_covers, fresh.upper_covers)
+        self.assert_consistent()
+
+    def test_exception_inside_the_block(self):
+        with self.assertRaises(RuntimeError):
+            with self.context.bulk_update():
+                self.edit(0)
+                raise RuntimeError("stop")
+        self.assertIsNone(self.context._concepts)
+        self.assert_consistent()
+
+    def test_block_without_edits_keeps_the_concepts(self):
+        concepts = self.context._concepts
+        key = self.context.content_key()
+        with self.context.bulk_update() as context:
+            self.assertIs(context, self.context)
+        self.assertIs(self.context._concepts, concepts)
+        self.assertIs(self.context.content_key(), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
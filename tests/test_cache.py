@@ -0,0 +1,164 @@
+import os
+import tempfile
+import unittest
+from bitarray import bitarray
+from benchmarks.generator import random_context, random_ranked_context
+from src.algorithms import object_rank
+from src.cache import ResultCache
+from src.context import FormalContext
+from src.ranked_context import RankedContext
+from tests.helpers import concept_list, copy_context
+
+
+def basis(implications) -> list[tuple[frozenset[str], frozenset[str]]]:
+    return [(impl.premise, impl.conclusion) for impl in implications]
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = ResultCache(self.directory.name)
+
+    def cached(self, context: FormalContext) -> FormalContext:
+        context.result_cache = self.cache
+        return context
+
+    def test_concepts_miss_hit_and_invalidation(self):
+        context, _ = random_context(20, 8, 0.4, seed=1)
+        expected = concept_list(copy_context(context).concepts)
+
+        self.assertEqual(
+            concept_list(self.cached(copy_context(context)).concepts), expected
+        )
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+        self.assertEqual(
+            concept_list(self.cached(copy_context(context)).concepts), expected
+        )
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        edited = self.cached(copy_context(context))
+        key = edited.content_key()
+        edited.set_relation(0, 0, not edited.incidence[0][0])
+        self.assertNotEqual(edited.content_key(), key)
+        self.assertEqual(
+            concept_list(edited.concepts), concept_list(copy_context(edited).concepts)
+        )
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_content_key_is_kept_until_an_edit(self):
+        context, _ = random_context(15, 6, 0.4, seed=2)
+        key = context.content_key()
+        self.assertIs(context.content_key(), key)
+        self.assertEqual(copy_context(context).content_key(), key)
+        context.set_relation(1, 1, not context.incidence[1][1])
+        self.assertIsNone(context._content_key)
+        self.assertNotEqual(context.content_key(), key)
+
+    def test_canonical_basis_miss_then_hit(self):
+        context, _ = random_context(20, 8, 0.35, seed=3, implications=2)
+        expected = basis(copy_context(context).get_canonical_basis())
+        self.assertEqual(
+            basis(self.cached(copy_context(context)).get_canonical_basis()), expected
+        )
+        self.assertEqual(self.cache.hits, 0)
+        self.assertEqual(
+            basis(self.cached(copy_context(context)).get_canonical_basis()), expected
+        )
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_rank_partition_keys_only_the_defeasible_basis(self):
+        context, planted = random_ranked_context(25, 7, 0.3, seed=4, exceptions=0.2)
+        ranked = object_rank(context, planted)
+        flat = RankedContext(context.objects, context.attributes, context.incidence)
+        self.assertGreater(len(ranked.rankings), len(flat.rankings))
+        self.assertEqual(ranked.content_key(), flat.content_key())
+        self.assertNotEqual(ranked.ranked_key(), flat.ranked_key())
+
+        expected = basis(object_rank(context, planted).compute_defeasible_basis())
+        self.assertEqual(
+            basis(self.cached(ranked).compute_defeasible_basis()), expected
+        )
+        hits = self.cache.hits
+        # The same ranking finds its basis, another one computes its own
+        self.assertEqual(
+            basis(
+                self.cached(object_rank(context, planted)).compute_defeasible_basis()
+            ),
+            expected,
+        )
+        self.assertEqual(self.cache.hits, hits + 1)
+        misses = self.cache.misses
+        self.cached(flat).compute_defeasible_basis()
+        self.assertEqual(self.cache.misses, misses + 1)
+
+        # The canonical basis is shared by every ranking of the context
+        self.cached(ranked).get_canonical_basis()
+        hits = self.cache.hits
+        other = self.cached(object_rank(context, planted[:1]))
+        self.assertEqual(
+            basis(other.get_canonical_basis()), basis(ranked.get_canonical_basis())
+        )
+        self.assertEqual(self.cache.hits, hits + 1)
+
+    def test_empty_contexts(self):
+        # Records and pairs of these contexts have no bytes at all
+        for num_objects, num_attributes in [(0, 4), (5, 0), (0, 0)]:
+            objects = [f"g{i}" for i in range(num_objects)]
+            attributes = [f"a{j}" for j in range(num_attributes)]
+            rows = [bitarray(num_attributes) for _ in objects]
+            for row in rows:
+                row.setall(0)
+            results = []
+            for _ in range(2):
+                ranked = self.cached(RankedContext(objects, attributes, rows))
+                results.append(
+                    (
+                        concept_list(ranked.concepts),
+                        basis(ranked.get_canonical_basis()),
+                        basis(ranked.compute_defeasible_basis()),
+                    )
+                )
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(len(results[1][0]), 1)
+        self.assertEqual(self.cache.hits, 9)
+
+    def test_least_recently_used_are_evicted(self):
+        cache = ResultCache(self.directory.name, max_bytes=250)
+        for i in range(3):
+            cache.put(f"key{i}", "test", bytes(100))
+            path = os.path.join(self.directory.name, f"key{i}.test")
+            os.utime(path, (1000 + i, 1000 + i))
+        # Two entries fit, so key0 is gone; reading key1 makes key2 the oldest
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("key0", "test"))
+        self.assertIsNotNone(cache.get("key1", "test"))
+        cache.put("key3", "test", bytes(100))
+        self.assertIsNone(cache.get("key2", "test"))
+        self.assertIsNotNone(cache.get("key1", "test"))
+        self.assertEqual(cache.nbytes, 200)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_corrupt_entries_are_discarded(self):
+        context, _ = random_context(10, 5, 0.4, seed=5)
+        key = self.cache.key(context)
+        for kind in ("concepts-nextclosure", "canonical-basis"):
+            self.cache.put(key, kind, b"corrupt")
+        self.assertIsNone(self.cache.load_concepts(key, "concepts-nextclosure", 10, 5))
+        self.assertIsNone(self.cache.load_pairs(key, "canonical-basis", 5))
+        self.assertEqual(len(self.cache), 0)
+
+        # Corrupt entries are recomputed and stored again
+        self.cache.put(key, "concepts-nextclosure", b"corrupt")
+        self.assertEqual(
+            concept_list(self.cached(context).concepts),
+            concept_list(copy_context(context).concepts),
+        )
+        self.assertIsNotNone(
+            self.cache.load_concepts(key, "concepts-nextclosure", 10, 5)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from bitarray import bitarray
+from benchmarks.generator import random_context
+from src.context import FormalContext
+from src.enumeration import ALGORITHMS
+from tests.helpers import concept_list, concept_set
+
+# (objects, attributes, density, implications) of the seeded contexts
+SHAPES = [(12, 6, 0.3, 0), (20, 8, 0.5, 2), (30, 10, 0.2, 4), (9, 17, 0.4, 1)]
+
+
+def seeded_contexts():
+    for num_objects, num_attributes, density, implications in SHAPES:
+        for seed in range(4):
+            context, _ = random_context(
+                num_objects, num_attributes, density, seed, implications
+            )
+            yield context
+
+
+class EngineTest(unittest.TestCase):
+    def assert_same_concepts(self, context: FormalContext) -> None:
+        expected = concept_list(context.generate_all_concepts("nextclosure", workers=1))
+        for algorithm in ALGORITHMS:
+            found = concept_list(context.generate_all_concepts(algorithm, workers=1))
+            self.assertEqual(len(found), len(set(found)), algorithm)
+            self.assertEqual(set(found), set(expected), algorithm)
+
+    def test_engines_match_next_closure(self):
+        for context in seeded_contexts():
+            self.assert_same_concepts(context)
+
+    def test_concepts_are_closed(self):
+        for context in seeded_contexts():
+            for algorithm in ALGORITHMS:
+                for extent, intent in context.generate_all_concepts(
+                    algorithm, workers=1
+                ):
+                    self.assertEqual(context.prime_objects(extent), intent)
+                    self.assertEqual(context.prime_attributes(intent), extent)
+
+    def test_degenerate_contexts(self):
+        for num_objects, num_attributes in [(0, 4), (5, 0), (0, 0), (1, 1)]:
+            rows = [bitarray("1" * num_attributes) for _ in range(num_objects)]
+            context = FormalContext(
+                [f"g{i}" for i in range(num_objects)],
+                [f"a{j}" for j in range(num_attributes)],
+                rows,
+            )
+            self.assert_same_concepts(context)
+
+    def test_concept_algorithm_setting(self):
+        context, _ = random_context(15, 7, 0.4, seed=3)
+        expected = concept_set(context.generate_all_concepts("nextclosure", workers=1))
+        for algorithm in ALGORITHMS:
+            context.concept_algorithm = algorithm
+            self.assertEqual(concept_set(context.concepts), expected)
+        with self.assertRaises(ValueError):
+            context.concept_algorithm = "unknown"
+
+
+if __name__ == "__main__":
+    unittest.main()
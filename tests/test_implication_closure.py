@@ -0,0 +1,92 @@
+import unittest
+from bitarray import bitarray
+from benchmarks.generator import random_context, random_subsets
+from src.implication_closure import CLOSURE_ALGORITHMS
+
+
+def naive_closure(
+    attributes: bitarray, implications: list[tuple[bitarray, bitarray]]
+) -> bitarray:
+    """Apply every implication whose premise is contained until nothing changes."""
+    result = attributes.copy()
+    changed = True
+    while changed:
+        changed = False
+        for premise, conclusion in implications:
+            if (result & premise) == premise and (result | conclusion) != result:
+                result |= conclusion
+                changed = True
+    return result
+
+
+def all_subsets(num_attributes: int):
+    for mask in range(1 << num_attributes):
+        yield bitarray(format(mask, f"0{num_attributes}b"))
+
+
+class ClosureEngineTest(unittest.TestCase):
+    def test_engines_match_naive_closure(self):
+        for seed in range(6):
+            num_attributes = 6 + 3 * seed
+            premises = random_subsets(num_attributes, 12, 0.2, seed)
+            conclusions = random_subsets(num_attributes, 12, 0.15, seed + 100)
+            queries = random_subsets(num_attributes, 40, 0.25, seed + 200)
+            for name, engine in CLOSURE_ALGORITHMS.items():
+                closure = engine(num_attributes)
+                added = []
+                # Closures are asked for while the implications grow
+                for premise, conclusion in zip(premises, conclusions):
+                    closure.add(premise, conclusion)
+                    added.append((premise, conclusion))
+                    self.assertEqual(len(closure), len(added))
+                    for query in queries:
+                        self.assertEqual(
+                            closure.closure(query),
+                            naive_closure(query, added),
+                            name,
+                        )
+
+    def test_empty_premise_always_fires(self):
+        for name, engine in CLOSURE_ALGORITHMS.items():
+            closure = engine(4)
+            closure.add(bitarray("0000"), bitarray("0100"))
+            closure.add(bitarray("0100"), bitarray("0011"))
+            self.assertEqual(closure.closure(bitarray("0000")), bitarray("0111"), name)
+
+
+class CanonicalBasisTest(unittest.TestCase):
+    def test_engines_give_the_same_basis(self):
+        for seed in range(4):
+            bases = []
+            for algorithm in CLOSURE_ALGORITHMS:
+                # A fresh context, since the basis is cached whatever the engine
+                context, _ = random_context(20, 8, 0.35, seed, implications=2)
+                bases.append(
+                    [
+                        (impl.premise, impl.conclusion)
+                        for impl in context.get_canonical_basis(algorithm)
+                    ]
+                )
+            self.assertEqual(bases[0], bases[1])
+
+    def test_basis_closure_is_the_context_closure(self):
+        for seed in range(4):
+            for algorithm in CLOSURE_ALGORITHMS:
+                context, _ = random_context(15, 7, 0.4, seed, implications=2)
+                basis = [
+                    (impl.premise_bits, impl.premise_bits | impl.conclusion_bits)
+                    for impl in context.get_canonical_basis(algorithm)
+                ]
+                for subset in all_subsets(context.num_attributes):
+                    self.assertEqual(
+                        naive_closure(subset, basis), context.closure(subset)
+                    )
+
+    def test_unknown_algorithm(self):
+        context, _ = random_context(5, 3, 0.5)
+        with self.assertRaises(ValueError):
+            context.get_canonical_basis("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
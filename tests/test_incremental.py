@@ -0,0 +1,111 @@
+import random
+import unittest
+from bitarray import bitarray
+from src.concepts import ConceptStore
+from src.context import FormalContext
+from tests.helpers import concept_list, concept_set
+
+
+def random_rows(num_objects: int, num_attributes: int, seed: int) -> list[bitarray]:
+    rng = random.Random(seed)
+    return [
+        bitarray([rng.random() < 0.35 for _ in range(num_attributes)])
+        for _ in range(num_objects)
+    ]
+
+
+class AddObjectTest(unittest.TestCase):
+    def test_matches_recompute(self):
+        # 12 objects added one by one cross several byte boundaries of the extents
+        for algorithm in ("nextclosure", "cbo", "inclose"):
+            for seed in range(5):
+                rows = random_rows(14, 7, seed)
+                attributes = [f"a{i}" for i in range(7)]
+                context = FormalContext(["g0", "g1"], attributes, rows[:2])
+                context.concept_algorithm = algorithm
+                context.incremental = True
+                context.concepts
+                for obj_idx in range(2, len(rows)):
+                    context.add_object(f"g{obj_idx}", rows[obj_idx])
+
+                    fresh = FormalContext(
+                        [f"g{i}" for i in range(obj_idx + 1)],
+                        attributes,
+                        [row.copy() for row in rows[: obj_idx + 1]],
+                    )
+                    fresh.concept_algorithm = algorithm
+                    self.assertFalse(context._concepts_dirty)
+                    self.assertEqual(len(context.concepts), len(fresh.concepts))
+                    self.assertEqual(
+                        concept_set(context.concepts), concept_set(fresh.concepts)
+                    )
+
+    def test_old_concepts_keep_their_positions(self):
+        rows = random_rows(9, 6, 1)
+        context = FormalContext(
+            [f"g{i}" for i in range(8)], [f"a{i}" for i in range(6)], rows[:8]
+        )
+        context.incremental = True
+        before = [intent.to01() for intent in (i for _, i in context.concepts)]
+        context.add_object("g8", rows[8])
+        after = [intent.to01() for intent in (i for _, i in context.concepts)]
+        self.assertEqual(after[: len(before)], before)
+
+    def test_views_handed_out_keep_the_old_concepts(self):
+        rows = random_rows(9, 6, 2)
+        context = FormalContext(
+            [f"g{i}" for i in range(8)], [f"a{i}" for i in range(6)], rows[:8]
+        )
+        context.incremental = True
+        store, intents = context.concepts, context.intents_list
+        before = list(intents)
+        extents = [extent.to01() for extent, _ in store]
+        context.add_object("g8", rows[8])
+        self.assertEqual(list(intents), before)
+        self.assertEqual([extent.to01() for extent, _ in store], extents)
+        self.assertIsNot(context.concepts, store)
+
+    def test_store_is_only_copied_when_handed_out(self):
+        rows = random_rows(12, 7, 3)
+        context = FormalContext(
+            [f"g{i}" for i in range(8)], [f"a{i}" for i in range(7)], rows[:8]
+        )
+        context.incremental = True
+        context.compute_concepts()
+        context.add_object("g8", rows[8])
+        store = context._concepts
+        context.add_object("g9", rows[9])
+        self.assertIs(context._concepts, store)
+
+        # The kept intent keys follow the appended concepts
+        keys = store.intent_keys()
+        self.assertEqual(keys, [store.intent_key(i) for _, i in store])
+        self.assertEqual(store.intent_ids(), {key: i for i, key in enumerate(keys)})
+
+        held = context.concepts
+        context.add_object("g10", rows[10])
+        self.assertIsNot(context._concepts, held)
+        context.add_object("g11", rows[11])
+        fresh = FormalContext(
+            [f"g{i}" for i in range(12)],
+            [f"a{i}" for i in range(7)],
+            [row.copy() for row in rows],
+        )
+        self.assertEqual(concept_set(context.concepts), concept_set(fresh.concepts))
+
+    def test_store_records_survive_widening(self):
+        store = ConceptStore(7, 11)
+        expected = list(zip(random_rows(50, 7, 4), random_rows(50, 11, 5)))
+        for extent, intent in expected:
+            store.append(extent, intent)
+        # Objects 7 .. 24 cross the byte boundaries at 8, 16 and 24
+        for obj_idx in range(7, 25):
+            members = [i for i in range(len(expected)) if (i + obj_idx) % 3 == 0]
+            store.add_object(members)
+            for i, (extent, _) in enumerate(expected):
+                extent.append(i in members)
+            self.assertEqual(concept_list(store), concept_list(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from benchmarks.generator import random_context, random_ranked_context, random_subsets
+from main import CommandError, PortRoyalREPL
+from src.algorithms import IncrementalRanking, object_rank
+from src.cache import ResultCache
+from src.context import FormalContext
+from src.instrumentation import TIMED_METHODS, Profiler
+from tests.helpers import copy_context, isolated_cache
+
+# Every (class, method) pair a profiler wraps
+PATCHED = TIMED_METHODS + [
+    (IncrementalRanking, "_run"),
+    (FormalContext, "_set_concepts"),
+]
+
+
+def installed() -> dict[tuple[type, str], object]:
+    return {(cls, name): cls.__dict__[name] for cls, name in PATCHED}
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.originals = installed()
+        # A failing test must not leave wrappers behind for the others
+        self.addCleanup(self.restore)
+
+    def restore(self):
+        for (cls, name), method in self.originals.items():
+            setattr(cls, name, method)
+        Profiler._active = None
+
+    def assert_restored(self):
+        self.assertEqual(installed(), self.originals)
+        self.assertIsNone(Profiler._active)
+
+    def assert_wrapped(self):
+        for key, method in installed().items():
+            self.assertIsNot(method, self.originals[key], key)
+
+    def test_restored_on_exit(self):
+        profiler = Profiler()
+        with profiler as entered:
+            self.assertIs(entered, profiler)
+            self.assertTrue(profiler.enabled)
+            self.assertIs(Profiler._active, profiler)
+            self.assert_wrapped()
+        self.assertFalse(profiler.enabled)
+        self.assert_restored()
+        profiler.enable()
+        profiler.disable()
+        self.assert_restored()
+
+    def test_restored_on_exception(self):
+        profiler = Profiler()
+        context, _ = random_context(15, 6, 0.4, seed=1)
+        with self.assertRaises(RuntimeError):
+            with profiler:
+                context.compute_concepts()
+                raise RuntimeError("stop")
+        self.assertFalse(profiler.enabled)
+        self.assert_restored()
+        # The counts of the block are kept after it ends
+        self.assertGreater(profiler.calls["_next_intent"][0], 0)
+
+    def test_nested_use(self):
+        profiler = Profiler()
+        with profiler:
+            wrapped = installed()
+            with profiler:
+                with profiler:
+                    pass
+                # Leaving an inner block neither unwraps nor wraps twice
+                self.assertEqual(installed(), wrapped)
+            self.assertTrue(profiler.enabled)
+            self.assertEqual(installed(), wrapped)
+            other = Profiler()
+            with self.assertRaises(RuntimeError):
+                with other:
+                    pass
+            self.assertFalse(other.enabled)
+            self.assertIs(Profiler._active, profiler)
+            self.assertEqual(installed(), wrapped)
+        self.assert_restored()
+        # Once the first is done another profiler can be enabled
+        with Profiler():
+            self.assert_wrapped()
+        self.assert_restored()
+
+    def test_counts_the_calls(self):
+        context, _ = random_context(15, 6, 0.4, seed=2)
+        queries = random_subsets(context.num_attributes, 7, 0.3, seed=2)
+        profiler = Profiler()
+        with profiler:
+            for attributes in queries:
+                context.closure(attributes)
+            for attributes in queries[:3]:
+                context.prime_attributes(attributes)
+        # Nothing is counted once the originals are back
+        context.closure(queries[0])
+        calls = profiler.calls
+        self.assertEqual(calls["closure"][0], 7)
+        # Each closure calls prime_attributes and prime_objects once
+        self.assertEqual(calls["prime_attributes"][0], 7 + 3)
+        self.assertEqual(calls["prime_objects"][0], 7)
+        self.assertGreaterEqual(calls["closure"][1], 0.0)
+
+        profiler.reset()
+        with profiler:
+            context.compute_concepts()
+        self.assertEqual(profiler.peak_concepts, len(context.concepts))
+
+    def test_reads_the_cache_counters(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache = ResultCache(directory.name)
+        profiler = Profiler(cache)
+        context, _ = random_context(10, 5, 0.4, seed=2)
+        context.result_cache = cache
+        with profiler:
+            context.compute_concepts()
+        # Also counted while the profiler is off: the cache is the one source
+        fresh = copy_context(context)
+        fresh.result_cache = cache
+        fresh.compute_concepts()
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual((profiler.cache_hits, profiler.cache_misses), (1, 1))
+        report = profiler.report()
+        self.assertEqual((report["cache_hits"], report["cache_misses"]), (1, 1))
+        self.assertIn("1 hits, 1 misses", profiler.format())
+
+        profiler.reset()
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+        self.assertEqual((profiler.cache_hits, profiler.cache_misses), (0, 0))
+        self.assertEqual(Profiler().cache_hits, 0)
+
+    def test_counts_the_ranking_rounds(self):
+        context, planted = random_ranked_context(20, 6, 0.3, seed=3, exceptions=0.2)
+        profiler = Profiler()
+        with profiler:
+            ranked = object_rank(context, planted)
+        self.assertEqual(profiler.ranking_rounds, len(ranked.rankings))
+        report = profiler.report()
+        self.assertEqual(report["ranking_rounds"], profiler.ranking_rounds)
+        self.assertEqual(report["calls"]["_run"]["calls"], profiler.calls["_run"][0])
+
+    def test_repl_reports_a_second_profiler(self):
+        isolated_cache(self)
+        first, second = PortRoyalREPL(), PortRoyalREPL()
+        first.op_profile(["on"])
+        with self.assertRaisesRegex(CommandError, "Another profiler"):
+            second.op_profile(["on"])
+        out = io.StringIO()
+        with redirect_stdout(out):
+            second.cmd_profile(["on"])
+        self.assertIn("Another profiler", out.getvalue())
+        self.assertFalse(second.profiler.enabled)
+        first.op_profile(["off"])
+        self.assert_restored()
+
+
+if __name__ == "__main__":
+    unittest.main()
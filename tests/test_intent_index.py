@@ -0,0 +1,92 @@
+import itertools
+import unittest
+from bitarray import bitarray
+from bitarray.util import subset
+from benchmarks.generator import random_ranked_context, random_subsets
+from src.algorithms import object_rank
+from src.intent_index import IntentTrie
+from src.ranked_context import RankedContext
+
+
+def pairwise_basis(ranked: RankedContext) -> list[tuple[str, str]]:
+    """The defeasible basis by testing every pair of nested intents."""
+    concepts = ranked.compute_concepts()
+    intents = [concepts.intent_bits(i) for i in range(len(concepts))]
+    basis = []
+    for premise, conclusion in itertools.combinations(intents, 2):
+        if subset(conclusion, premise):
+            premise, conclusion = conclusion, premise
+        elif not subset(premise, conclusion):
+            continue
+        if ranked.holds(premise, conclusion):
+            basis.append((premise.to01(), conclusion.to01()))
+    return basis
+
+
+class IntentTrieTest(unittest.TestCase):
+    def test_queries_match_brute_force(self):
+        for seed in range(4):
+            size = 5 + 4 * seed
+            stored = random_subsets(size, 60, 0.4, seed)
+            trie = IntentTrie()
+            for i, bits in enumerate(stored):
+                trie.insert(bits, i)
+            self.assertEqual(len(trie), len(stored))
+
+            lowers = random_subsets(size, 15, 0.15, seed + 100)
+            uppers = random_subsets(size, 15, 0.7, seed + 200)
+            for lower, upper in zip(lowers, uppers):
+                upper |= lower
+                self.assertEqual(
+                    sorted(trie.between(lower, upper)),
+                    [
+                        i
+                        for i, bits in enumerate(stored)
+                        if subset(lower, bits) and subset(bits, upper)
+                    ],
+                )
+                self.assertEqual(
+                    sorted(trie.supersets(lower)),
+                    [i for i, bits in enumerate(stored) if subset(lower, bits)],
+                )
+                self.assertEqual(
+                    sorted(trie.subsets(upper)),
+                    [i for i, bits in enumerate(stored) if subset(bits, upper)],
+                )
+
+    def test_repeated_and_empty_sets(self):
+        trie = IntentTrie()
+        trie.insert(bitarray("000"), 0)
+        trie.insert(bitarray("101"), 1)
+        trie.insert(bitarray("101"), 2)
+        self.assertEqual(sorted(trie.supersets(bitarray("100"))), [1, 2])
+        self.assertEqual(trie.subsets(bitarray("000")), [0])
+        self.assertEqual(trie.between(bitarray("010"), bitarray("111")), [])
+
+
+class DefeasibleBasisTest(unittest.TestCase):
+    def test_basis_matches_pairwise_basis(self):
+        for num_objects, num_attributes in [(20, 6), (30, 8), (15, 10)]:
+            for seed in range(3):
+                context, planted = random_ranked_context(
+                    num_objects, num_attributes, 0.3, seed, exceptions=0.2
+                )
+                ranked = object_rank(context, planted)
+                found = [
+                    (premise.to01(), conclusion.to01())
+                    for premise, conclusion in ranked._defeasible_basis_bits()
+                ]
+                self.assertEqual(found, pairwise_basis(ranked))
+
+    def test_basis_is_entailed(self):
+        context, planted = random_ranked_context(25, 7, 0.3, seed=5, exceptions=0.2)
+        ranked = object_rank(context, planted)
+        basis = ranked.compute_defeasible_basis()
+        self.assertTrue(basis)
+        self.assertEqual(ranked.entailed_many(basis), [True] * len(basis))
+        for conditional in basis:
+            self.assertTrue(ranked.satisfies(conditional))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,324 @@
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+from unittest import mock
+from bitarray import bitarray
+from benchmarks.generator import random_context
+from src import io
+from src.context import FormalContext
+from src.io import load_context, save_context
+from tests.helpers import concept_set
+
+BACKENDS = ("bitarray", "numpy")
+
+# (objects, attributes) of the seeded contexts, with widths that are and
+# are not whole bytes
+SHAPES = [(12, 8), (37, 13), (40, 24), (9, 1)]
+
+
+def seeded_contexts():
+    for seed, (num_objects, num_attributes) in enumerate(SHAPES):
+        context, _ = random_context(num_objects, num_attributes, 0.4, seed)
+        yield context
+
+
+class IOTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name: str) -> str:
+        # An absolute path replaces the data directory
+        return os.path.join(self.directory.name, name)
+
+    def assert_same_context(
+        self, loaded: FormalContext, expected: FormalContext
+    ) -> None:
+        self.assertEqual(loaded.objects, expected.objects)
+        self.assertEqual(loaded.attributes, expected.attributes)
+        self.assertEqual(loaded.num_objects, expected.num_objects)
+        self.assertEqual(loaded.num_attributes, expected.num_attributes)
+        self.assertEqual(
+            [row.to01() for row in loaded.incidence],
+            [row.to01() for row in expected.incidence],
+        )
+        self.assertEqual(
+            [column.to01() for column in loaded._attribute_columns()],
+            [column.to01() for column in expected._attribute_columns()],
+        )
+
+
+class BinaryTest(IOTestCase):
+    def test_round_trip(self):
+        for context in seeded_contexts():
+            path = self.path("context.bctx")
+            save_context(context, path, "bin")
+            for backend in BACKENDS:
+                loaded = load_context(path, "bin", backend)
+                self.assert_same_context(loaded, context)
+                self.assertEqual(
+                    concept_set(loaded.concepts), concept_set(context.concepts)
+                )
+
+    def test_degenerate_shapes(self):
+        for num_objects, num_attributes in [(0, 4), (5, 0), (0, 0), (1, 1)]:
+            rows = [bitarray("1" * num_attributes) for _ in range(num_objects)]
+            context = FormalContext(
+                [f"g{i}" for i in range(num_objects)],
+                [f"a{j}" for j in range(num_attributes)],
+                rows,
+            )
+            path = self.path("degenerate.bctx")
+            save_context(context, path, "bin")
+            for backend in BACKENDS:
+                self.assert_same_context(load_context(path, "bin", backend), context)
+
+    def test_unusual_names(self):
+        for objects, attributes in [
+            ([""], ["a"]),
+            (["a\nb"], [""]),
+            (["", "\n", "a\nb"], ["x\ny", "", "é"]),
+        ]:
+            rows = [bitarray("1" * len(attributes)) for _ in objects]
+            context = FormalContext(objects, attributes, rows)
+            path = self.path("names.bctx")
+            save_context(context, path, "bin")
+            for backend in BACKENDS:
+                self.assert_same_context(load_context(path, "bin", backend), context)
+
+    def test_edit_after_load(self):
+        for context in seeded_contexts():
+            path = self.path("context.bctx")
+            save_context(context, path, "bin")
+            for backend in BACKENDS:
+                loaded = load_context(path, "bin", backend)
+                expected = FormalContext(
+                    list(context.objects),
+                    list(context.attributes),
+                    [row.copy() for row in context.incidence],
+                )
+                for obj_idx in range(0, context.num_objects, 3):
+                    attr_idx = obj_idx % context.num_attributes
+                    value = not expected.incidence[obj_idx][attr_idx]
+                    loaded.set_relation(obj_idx, attr_idx, value)
+                    expected.set_relation(obj_idx, attr_idx, value)
+                row = bitarray("10" * context.num_attributes)[: context.num_attributes]
+                loaded.add_object("new", row)
+                expected.add_object("new", row.copy())
+                self.assert_same_context(loaded, expected)
+                self.assertEqual(
+                    concept_set(loaded.concepts), concept_set(expected.concepts)
+                )
+
+                # The file is replaced, not overwritten under the mapping
+                save_context(loaded, path, "bin")
+                self.assert_same_context(loaded, expected)
+                self.assert_same_context(load_context(path, "bin", backend), expected)
+                save_context(context, path, "bin")
+
+    def test_invalid_files(self):
+        context = next(seeded_contexts())
+        path = self.path("context.bctx")
+        save_context(context, path, "bin")
+        with open(path, "rb") as f:
+            data = f.read()
+        for name, content in [
+            ("short.bctx", data[:10]),
+            ("truncated.bctx", data[:-8]),
+            ("signature.bctx", b"NOTACTX\x00" + data[8:]),
+        ]:
+            with open(self.path(name), "wb") as f:
+                f.write(content)
+            with self.assertRaises(ValueError):
+                load_context(self.path(name), "bin")
+
+
+class CrossTableTest(IOTestCase):
+    def save_ctx(self, context: FormalContext, name: str = "context.ctx") -> bytes:
+        path = self.path(name)
+        save_context(context, path, "ctx")
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_round_trip(self):
+        for context in seeded_contexts():
+            self.save_ctx(context)
+            for backend in BACKENDS:
+                loaded = load_context(self.path("context.ctx"), "ctx", backend)
+                self.assert_same_context(loaded, context)
+
+    def test_small_blocks(self):
+        # Blocks end inside rows and hold a single row or none at all
+        for block_size in (1, 5, 17, 64):
+            with mock.patch.object(io, "BLOCK_SIZE", block_size):
+                for context in seeded_contexts():
+                    self.save_ctx(context)
+                    loaded = load_context(self.path("context.ctx"), "ctx")
+                    self.assert_same_context(loaded, context)
+
+    def test_compressed(self):
+        context = next(seeded_contexts())
+        data = self.save_ctx(context)
+        for name, compress in [
+            ("gz.ctx.gz", gzip.compress),
+            ("xz.ctx.xz", lzma.compress),
+        ]:
+            with open(self.path(name), "wb") as f:
+                f.write(compress(data))
+            self.assert_same_context(load_context(self.path(name), "ctx"), context)
+
+    def test_workers(self):
+        contexts = list(seeded_contexts())
+        with mock.patch.object(io, "BLOCK_SIZE", 64):
+            for context in contexts[:2]:
+                self.save_ctx(context)
+                loaded = load_context(self.path("context.ctx"), "ctx", workers=2)
+                self.assert_same_context(loaded, context)
+
+    def test_line_endings_and_blanks(self):
+        context = next(seeded_contexts())
+        data = self.save_ctx(context)
+        for name, content in [
+            ("crlf.ctx", data.replace(b"\n", b"\r\n")),
+            ("trailing.ctx", data.replace(b"\n", b" \n")),
+            ("unterminated.ctx", data.rstrip(b"\n")),
+        ]:
+            with open(self.path(name), "wb") as f:
+                f.write(content)
+            for block_size in (7, io.BLOCK_SIZE):
+                with mock.patch.object(io, "BLOCK_SIZE", block_size):
+                    loaded = load_context(self.path(name), "ctx")
+                    self.assert_same_context(loaded, context)
+
+    def test_bad_row(self):
+        context = next(seeded_contexts())
+        lines = self.save_ctx(context).split(b"\n")
+        header = 5 + context.num_objects + context.num_attributes
+        lines[header + 3] += b"X"
+        with open(self.path("bad.ctx"), "wb") as f:
+            f.write(b"\n".join(lines))
+        for block_size in (7, io.BLOCK_SIZE):
+            with mock.patch.object(io, "BLOCK_SIZE", block_size):
+                with self.assertRaisesRegex(RuntimeError, "row 3 .*'g3'"):
+                    load_context(self.path("bad.ctx"), "ctx")
+
+
+def transactions_context(transactions: list[tuple[str, list[str]]]) -> FormalContext:
+    """The context of (object, items) transactions, items in order of appearance."""
+    objects = list(dict.fromkeys(obj for obj, _ in transactions))
+    attributes = list(
+        dict.fromkeys(item for _, items in transactions for item in items)
+    )
+    rows = {obj: bitarray("0" * len(attributes)) for obj in objects}
+    for obj, items in transactions:
+        for item in items:
+            rows[obj][attributes.index(item)] = 1
+    return FormalContext(objects, attributes, [rows[obj] for obj in objects])
+
+
+class TransactionTest(IOTestCase):
+    def write(self, name: str, text: str) -> str:
+        path = self.path(name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return path
+
+    def assert_loads(self, path: str, format: str, expected: FormalContext) -> None:
+        for backend in BACKENDS:
+            self.assert_same_context(load_context(path, format, backend), expected)
+
+    def test_fimi(self):
+        for context in seeded_contexts():
+            lines, transactions = [], []
+            for obj_idx, row in enumerate(context.incidence):
+                # Items listed from the highest id, some with leading zeros
+                ids = [attr_idx * 3 + 1 for attr_idx in row.search(1)][::-1]
+                lines.append(" ".join(f"{i:03d}" if i % 2 else str(i) for i in ids))
+                transactions.append((str(obj_idx), [str(i) for i in sorted(ids)]))
+            path = self.write("context.dat", "\n".join(lines) + "\n")
+
+            expected = transactions_context(transactions)
+            order = sorted(
+                range(expected.num_attributes),
+                key=lambda j: int(expected.attributes[j]),
+            )
+            expected = FormalContext(
+                expected.objects,
+                [expected.attributes[j] for j in order],
+                [bitarray([row[j] for j in order]) for row in expected.incidence],
+            )
+            self.assert_loads(path, "fimi", expected)
+
+    def test_item_lists(self):
+        for context in seeded_contexts():
+            transactions = [
+                (
+                    str(obj_idx),
+                    [context.attributes[j] for j in reversed(list(row.search(1)))],
+                )
+                for obj_idx, row in enumerate(context.incidence)
+            ]
+            text = "".join(" , ".join(items) + "\r\n" for _, items in transactions)
+            path = self.write("context.txt", text)
+            self.assert_loads(path, "items", transactions_context(transactions))
+
+    def test_csv(self):
+        for context in seeded_contexts():
+            pairs = [
+                (obj, [context.attributes[j]])
+                for obj, row in zip(context.objects, context.incidence)
+                for j in row.search(1)
+            ]
+            # Objects without crosses have an empty attribute; rows interleave
+            pairs += [
+                (obj, [])
+                for obj, row in zip(context.objects, context.incidence)
+                if not row.any()
+            ]
+            pairs.sort(key=lambda pair: pair[1])
+            text = "object,attribute\n" + "".join(
+                f"{obj},{''.join(items)}\n" for obj, items in pairs
+            )
+            path = self.write("context.csv", text)
+            self.assert_loads(path, "csv", transactions_context(pairs))
+
+    def test_compressed(self):
+        path = self.path("context.dat.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("1 3\n\n2 3\n")
+        expected = FormalContext(
+            ["0", "1", "2"],
+            ["1", "2", "3"],
+            [bitarray("101"), bitarray("000"), bitarray("011")],
+        )
+        self.assert_loads(path, "fimi", expected)
+
+    def test_invalid_files(self):
+        for name, format, text in [
+            ("bad.dat", "fimi", "1 2\n3 x\n"),
+            ("negative.dat", "fimi", "-1\n"),
+            ("bad.csv", "csv", "g0,a0\ng1,a1,a2\n"),
+        ]:
+            path = self.write(name, text)
+            with self.assertRaises(RuntimeError):
+                load_context(path, format)
+
+    def test_csv_names_that_cannot_be_saved(self):
+        for text, message in [
+            ("g0,a0\n,a1\n", "row 2, column 1"),
+            (" ,a0\n", "row 1, column 1"),
+            ('g0,a0\n"g\n1",a1\n', "row 2, column 1"),
+            ('g0,"a\n0"\n', "row 1, column 2"),
+        ]:
+            path = self.write("names.csv", text)
+            with self.assertRaisesRegex(RuntimeError, message):
+                load_context(path, "csv")
+            with open(path, encoding="utf-8", newline="") as f:
+                with self.assertRaisesRegex(ValueError, message):
+                    list(io._csv_transactions(f))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from bitarray import bitarray
+from bitarray.util import subset
+from benchmarks.generator import random_context
+from src.context import FormalContext
+
+
+def pairwise_covers(intents: list[bitarray]) -> set[tuple[int, int]]:
+    """(lower, upper) pairs whose intents are nested with no intent in between."""
+    covers = set()
+    for upper, upper_intent in enumerate(intents):
+        for lower, lower_intent in enumerate(intents):
+            if upper_intent == lower_intent or not subset(upper_intent, lower_intent):
+                continue
+            if not any(
+                between != upper_intent
+                and between != lower_intent
+                and subset(upper_intent, between)
+                and subset(between, lower_intent)
+                for between in intents
+            ):
+                covers.add((lower, upper))
+    return covers
+
+
+class LatticeTest(unittest.TestCase):
+    def assert_lattice(self, context: FormalContext) -> None:
+        lattice = context.get_lattice()
+        intents = [lattice.intent_bits(i) for i in range(len(lattice))]
+        expected = pairwise_covers(intents)
+        self.assertEqual(set(lattice.edges()), expected)
+        self.assertEqual(lattice.num_edges, len(expected))
+        for lower, upper in expected:
+            self.assertIn(upper, lattice.upper_neighbours(lower))
+            self.assertIn(lower, lattice.lower_neighbours(upper))
+
+        for concept_id in range(len(lattice)):
+            self.assertTrue(lattice.leq(concept_id, lattice.top))
+            self.assertTrue(lattice.leq(lattice.bottom, concept_id))
+        self.assertEqual(lattice.upper_neighbours(lattice.top), [])
+        self.assertEqual(lattice.lower_neighbours(lattice.bottom), [])
+        self.assertEqual(lattice.extent_bits(lattice.top).count(), context.num_objects)
+        self.assertEqual(
+            lattice.intent_bits(lattice.bottom).count(), context.num_attributes
+        )
+
+    def test_covers_match_pairwise_covers(self):
+        for num_objects, num_attributes, density in [
+            (12, 6, 0.3),
+            (20, 9, 0.5),
+            (8, 14, 0.4),
+        ]:
+            for seed in range(3):
+                context, _ = random_context(
+                    num_objects, num_attributes, density, seed, implications=2
+                )
+                self.assert_lattice(context)
+
+    def test_single_concept(self):
+        context = FormalContext(["g0", "g1"], ["a0", "a1"], [bitarray("11")] * 2)
+        lattice = context.get_lattice()
+        self.assertEqual(len(lattice), 1)
+        self.assertEqual(lattice.top, lattice.bottom)
+        self.assertEqual(lattice.num_edges, 0)
+
+    def test_index(self):
+        context, _ = random_context(10, 5, 0.4, seed=1)
+        lattice = context.get_lattice()
+        for concept_id in range(len(lattice)):
+            self.assertEqual(lattice.index(lattice.intent_bits(concept_id)), concept_id)
+        with self.assertRaises(ValueError):
+            lattice.index(bitarray("1" * 4))
+
+    def test_rebuilt_after_edit(self):
+        context, _ = random_context(10, 5, 0.4, seed=2)
+        lattice = context.get_lattice()
+        self.assertIs(context.get_lattice(), lattice)
+        context.set_relation(0, 0, not context.incidence[0][0])
+        self.assertIsNot(context.get_lattice(), lattice)
+        self.assert_lattice(context)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from bitarray import bitarray
+from benchmarks.generator import random_context
+from src.context import FormalContext
+
+
+class NameIndexTest(unittest.TestCase):
+    def test_positions_match_the_names(self):
+        context, _ = random_context(15, 6, 0.4, seed=2)
+        for obj_idx, name in enumerate(context.objects):
+            self.assertEqual(context.object_index(name), obj_idx)
+        for attr_idx, name in enumerate(context.attributes):
+            self.assertEqual(context.attribute_index(name), attr_idx)
+
+    def test_index_follows_add_object(self):
+        context, _ = random_context(10, 5, 0.4, seed=4)
+        # Build the index before the objects arrive
+        context.object_index(context.objects[0])
+        for i in range(3):
+            context.add_object(f"new{i}", bitarray("10101"))
+            self.assertEqual(context.object_index(f"new{i}"), 10 + i)
+        for obj_idx, name in enumerate(context.objects):
+            self.assertEqual(context.object_index(name), obj_idx)
+
+        context.add_relation("new1", context.attributes[1])
+        self.assertTrue(context.has_attribute(11, 1))
+        self.assertEqual(
+            context._objects_to_bitarray(["new2", context.objects[0]]),
+            bitarray("1" + "0" * 11 + "1"),
+        )
+
+    def test_duplicate_names(self):
+        context = FormalContext(
+            ["g", "h", "g"],
+            ["a", "b", "a"],
+            [bitarray("100"), bitarray("010"), bitarray("001")],
+        )
+        # Duplicates resolve to their first position, as list.index did
+        self.assertEqual(context.object_index("g"), 0)
+        self.assertEqual(context.attribute_index("a"), 0)
+        self.assertEqual(context._attributes_to_bitarray(["a", "b"]), bitarray("110"))
+        with self.assertRaises(ValueError):
+            context.add_object("h")
+        self.assertEqual(context.num_objects, 3)
+        self.assertEqual(context.object_index("h"), 1)
+
+    def test_batch_conversions_round_trip(self):
+        context, _ = random_context(12, 7, 0.4, seed=6)
+        extents = [context.attribute_extent(j) for j in range(context.num_attributes)]
+        intents = list(context.incidence)
+        object_sets = context._bitarrays_to_objects(extents)
+        attribute_sets = context._bitarrays_to_attributes(intents)
+        self.assertEqual(
+            object_sets, [context._bitarray_to_objects(bits) for bits in extents]
+        )
+        self.assertEqual(
+            attribute_sets, [context._bitarray_to_attributes(bits) for bits in intents]
+        )
+        self.assertEqual(context._objects_to_bitarrays(object_sets), extents)
+        self.assertEqual(context._attributes_to_bitarrays(attribute_sets), intents)
+        self.assertEqual(context._bitarrays_to_attributes([]), [])
+
+    def test_unknown_names(self):
+        context, _ = random_context(5, 3, 0.4, seed=1)
+        with self.assertRaisesRegex(ValueError, "Object 'missing'"):
+            context.object_index("missing")
+        with self.assertRaisesRegex(ValueError, "Attribute 'missing'"):
+            context.attribute_index("missing")
+        with self.assertRaisesRegex(ValueError, "Attribute 'missing'"):
+            context._attributes_to_bitarray([context.attributes[0], "missing"])
+        with self.assertRaises(ValueError):
+            context.add_relation("missing", context.attributes[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
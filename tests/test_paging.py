@@ -0,0 +1,125 @@
+import unittest
+from benchmarks.generator import random_context
+from main import CommandError, PortRoyalREPL
+from src.context import FormalContext
+from tests.helpers import concept_list, isolated_cache
+
+
+def counting(context: FormalContext) -> list[int]:
+    """Count the concepts the engines produce for context from now on."""
+    produced = [0]
+    generate = context.generate_all_concepts
+
+    def generate_all_concepts(*args, **kwargs):
+        for concept in generate(*args, **kwargs):
+            produced[0] += 1
+            yield concept
+
+    context.generate_all_concepts = generate_all_concepts
+    return produced
+
+
+class IterConceptsTest(unittest.TestCase):
+    def setUp(self):
+        self.context, _ = random_context(25, 9, 0.4, seed=1)
+        self.expected = concept_list(
+            random_context(25, 9, 0.4, seed=1)[0].compute_concepts()
+        )
+
+    def test_pages_match_the_full_list(self):
+        pages = [(0, 5), (3, 10), (len(self.expected) - 2, 5), (0, None), (7, 0)]
+        for workers in (1, 2):
+            self.context.concept_workers = workers
+            for offset, limit in pages:
+                stop = None if limit is None else offset + limit
+                self.assertEqual(
+                    concept_list(self.context.iter_concepts(offset, limit)),
+                    self.expected[offset:stop],
+                )
+            self.assertIsNone(self.context._concepts)
+        # Pages of computed concepts come from the store
+        self.context.compute_concepts()
+        for offset, limit in pages:
+            stop = None if limit is None else offset + limit
+            self.assertEqual(
+                concept_list(self.context.iter_concepts(offset, limit)),
+                self.expected[offset:stop],
+            )
+
+    def test_out_of_range(self):
+        end = len(self.expected)
+        self.assertEqual(list(self.context.iter_concepts(end, 5)), [])
+        self.assertEqual(list(self.context.iter_concepts(end + 10)), [])
+        for offset, limit in [(-1, 5), (0, -1)]:
+            with self.assertRaises(ValueError):
+                self.context.iter_concepts(offset, limit)
+
+    def test_stops_after_the_page(self):
+        for workers in (1, 2):
+            self.context.concept_workers = workers
+            produced = counting(self.context)
+            page = list(self.context.iter_concepts(4, 6))
+            self.assertEqual(len(page), 6)
+            self.assertEqual(produced[0], 10)
+            del self.context.generate_all_concepts
+
+
+class ConceptPageTest(unittest.TestCase):
+    def setUp(self):
+        isolated_cache(self)
+
+        self.repl = PortRoyalREPL()
+        self.repl.page_size = 4
+        self.repl.context, _ = random_context(25, 9, 0.4, seed=2)
+        reference, _ = random_context(25, 9, 0.4, seed=2)
+        self.intents = list(reference.intents_list)
+        self.extents = list(reference.extents_list)
+
+    def page(self, kind: str, args: str) -> dict:
+        return self.repl._concept_page(kind, args.split())
+
+    def test_pages(self):
+        total = len(self.intents)
+        for args, offset, limit in [
+            ("", 0, 4),
+            ("3", 0, 3),
+            ("--offset 5", 5, 4),
+            ("--offset 2 --limit 7", 2, 7),
+            (f"--offset {total - 2}", total - 2, 4),
+            (f"--offset {total + 3}", total + 3, 4),
+        ]:
+            for kind, expected in [
+                ("intents", self.intents),
+                ("extents", self.extents),
+            ]:
+                result = self.page(kind, args)
+                found = [set(names) for names in result[kind]]
+                self.assertEqual(found, expected[offset : offset + limit])
+                self.assertEqual(result["offset"], offset)
+                self.assertEqual(result["count"], len(found))
+                self.assertEqual(result["more"], offset + limit < total)
+                self.assertNotIn("total", result)
+
+    def test_all(self):
+        result = self.page("intents", "all --limit 3")
+        self.assertEqual(result["total"], len(self.intents))
+        self.assertEqual([set(n) for n in result["intents"]], self.intents[:3])
+        self.assertIsNotNone(self.repl.context._concepts)
+
+    def test_workers(self):
+        self.repl.context.concept_workers = 2
+        result = self.page("intents", "--offset 3 --limit 5")
+        self.assertEqual([set(n) for n in result["intents"]], self.intents[3:8])
+        self.assertIsNone(self.repl.context._concepts)
+
+    def test_bad_arguments(self):
+        for args in ["0", "--limit 0", "--offset -1", "--offset", "--limit x", "x"]:
+            with self.assertRaises(CommandError):
+                self.page("intents", args)
+        self.assertEqual(
+            PortRoyalREPL._parse_page(["--offset", "3", "all"]), (3, 100, True)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
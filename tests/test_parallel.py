@@ -0,0 +1,50 @@
+import unittest
+from benchmarks.generator import random_context
+from src.context import FormalContext
+from src.parallel import parallel_concepts
+from tests.helpers import concept_list
+
+
+class ParallelTest(unittest.TestCase):
+    def setUp(self):
+        # Every run starts a process pool, so a few contexts have to do
+        self.contexts = [random_context(25, 9, 0.3, seed)[0] for seed in range(2)] + [
+            random_context(18, 12, 0.5, 7, implications=3)[0]
+        ]
+
+    def expected(self, context: FormalContext) -> list[tuple[str, str]]:
+        return concept_list(context.generate_all_concepts("nextclosure", workers=1))
+
+    def test_ordered_matches_next_closure(self):
+        for context in self.contexts:
+            for split_depth in (0, 1, 3):
+                found = concept_list(
+                    parallel_concepts(context, workers=2, split_depth=split_depth)
+                )
+                self.assertEqual(found, self.expected(context))
+
+    def test_unordered_yields_the_same_concepts(self):
+        for context in self.contexts:
+            found = concept_list(
+                parallel_concepts(context, workers=2, split_depth=2, ordered=False)
+            )
+            self.assertEqual(len(found), len(set(found)))
+            self.assertEqual(set(found), set(self.expected(context)))
+
+    def test_split_below_the_tree(self):
+        # A split depth beyond the deepest node leaves no work for the pool
+        context = self.contexts[0]
+        found = concept_list(parallel_concepts(context, workers=2, split_depth=50))
+        self.assertEqual(found, self.expected(context))
+
+    def test_context_settings(self):
+        context = self.contexts[2]
+        context.concept_workers = 2
+        context.concept_split_depth = 2
+        self.assertEqual(concept_list(context.concepts), self.expected(context))
+        with self.assertRaises(ValueError):
+            list(parallel_concepts(context, workers=2, split_depth=-1))
+
+
+if __name__ == "__main__":
+    unittest.main()
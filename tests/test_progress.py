@@ -0,0 +1,152 @@
+import io
+import multiprocessing
+import unittest
+from contextlib import redirect_stdout
+from benchmarks.generator import random_context, random_ranked_context
+from main import PortRoyalREPL
+from src.algorithms import object_rank
+from src.context import FormalContext
+from src.progress import Cancelled, Job, Progress
+from tests.helpers import concept_list, copy_context, isolated_cache
+
+
+class CancelAfter(Progress):
+    """A Progress that cancels itself at its steps-th check."""
+
+    def __init__(self, steps: int) -> None:
+        super().__init__()
+        self.steps = steps
+
+    def check(self) -> None:
+        self.steps -= 1
+        if self.steps < 0:
+            self.cancel()
+        super().check()
+
+
+class CancellationTest(unittest.TestCase):
+    def test_concepts_found_so_far_are_kept(self):
+        context, _ = random_context(30, 10, 0.4, seed=1)
+        expected = concept_list(copy_context(context).concepts)
+        progress = CancelAfter(20)
+        with self.assertRaises(Cancelled):
+            context.compute_concepts(progress)
+        self.assertEqual(progress.phase, "concepts")
+        self.assertEqual(progress.concepts, 20)
+        # NextClosure stops at a prefix of the lectic order
+        self.assertEqual(concept_list(progress.partial), expected[:20])
+        # The context is left as if nothing was computed
+        self.assertEqual(concept_list(context.concepts), expected)
+
+    def test_canonical_basis_found_so_far_is_kept(self):
+        context, _ = random_context(20, 9, 0.35, seed=2, implications=2)
+        expected = [
+            (impl.premise, impl.conclusion)
+            for impl in copy_context(context).get_canonical_basis()
+        ]
+        progress = CancelAfter(len(expected) * 2)
+        with self.assertRaises(Cancelled):
+            context.get_canonical_basis(progress=progress)
+        self.assertEqual(progress.phase, "canonical basis")
+        found = [(impl.premise, impl.conclusion) for impl in progress.partial]
+        self.assertLess(len(found), len(expected))
+        self.assertEqual(found, expected[: len(found)])
+        self.assertIsNone(context._canonical_basis)
+
+    def test_defeasible_basis_found_so_far_is_kept(self):
+        context, planted = random_ranked_context(25, 7, 0.3, seed=3, exceptions=0.2)
+        expected = object_rank(context, planted)._defeasible_basis_bits()
+        ranked = object_rank(context, planted)
+        ranked.compute_concepts()
+        progress = CancelAfter(len(ranked.concepts) // 2)
+        with self.assertRaises(Cancelled):
+            ranked.compute_defeasible_basis(progress)
+        self.assertEqual(progress.phase, "defeasible basis")
+        self.assertEqual(progress.conditionals, len(progress.partial))
+        self.assertTrue(
+            set((p.to01(), c.to01()) for p, c in progress.partial)
+            <= set((p.to01(), c.to01()) for p, c in expected)
+        )
+        self.assertIsNone(ranked._defeasible_basis)
+
+    def test_parallel_enumeration_is_cancelled(self):
+        context, _ = random_context(40, 12, 0.4, seed=4)
+        context.concept_workers = 2
+        progress = Progress()
+        progress.cancel()
+        with self.assertRaises(Cancelled):
+            context.compute_concepts(progress)
+        self.assertEqual(multiprocessing.active_children(), [])
+        self.assertEqual(
+            concept_list(context.concepts),
+            concept_list(copy_context(context).concepts),
+        )
+
+
+class JobTest(unittest.TestCase):
+    def test_result(self):
+        context, _ = random_context(20, 8, 0.4, seed=5)
+        job = Job("concepts", context.compute_concepts).start()
+        self.assertTrue(job.wait(30))
+        self.assertTrue(job.completed)
+        self.assertFalse(job.cancelled)
+        self.assertIs(job.result, context.concepts)
+        self.assertGreaterEqual(job.elapsed, 0)
+
+    def test_error(self):
+        def fail(progress: Progress) -> None:
+            raise ValueError("broken")
+
+        job = Job("failing", fail).start()
+        self.assertTrue(job.wait(30))
+        self.assertIsInstance(job.error, ValueError)
+        self.assertFalse(job.completed)
+        self.assertFalse(job.cancelled)
+
+    def test_cancel_while_running(self):
+        # Far too large to finish before it is cancelled
+        context, _ = random_context(400, 40, 0.35, seed=1)
+        for workers in (1, 2):
+            context.concept_workers = workers
+            job = Job("concepts", context.compute_concepts).start()
+            while job.running and not job.progress.phase:
+                job.wait(0.01)
+            job.cancel()
+            self.assertTrue(job.wait(10))
+            self.assertTrue(job.cancelled)
+            self.assertIsNone(job.error)
+            self.assertIsNone(context._concepts)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+class BackgroundJobTest(unittest.TestCase):
+    def setUp(self):
+        isolated_cache(self)
+
+    def test_progress_reports_a_finished_job_once(self):
+        def fail(progress: Progress) -> None:
+            raise ValueError("broken")
+
+        context, _ = random_context(20, 8, 0.4, seed=5)
+        for name, target in [("intents", context.compute_concepts), ("basis", fail)]:
+            repl = PortRoyalREPL()
+            with redirect_stdout(io.StringIO()):
+                repl._run_job(name, context, target, ["&"])
+            self.assertTrue(repl.job.wait(30))
+            self.assertTrue(repl.background)
+
+            out = io.StringIO()
+            with redirect_stdout(out):
+                repl.cmd_progress([])
+            self.assertIn(name, out.getvalue())
+            self.assertFalse(repl.background)
+            self.assertIsNone(repl.job)
+
+            out = io.StringIO()
+            with redirect_stdout(out):
+                repl.cmd_progress([])
+            self.assertEqual(out.getvalue(), "No computation started.\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import random
+import unittest
+from bitarray import bitarray
+from main import PortRoyalREPL
+from src.algorithms import IncrementalRanking, object_rank
+from src.context import FormalContext
+from src.implications import Implication
+from tests.helpers import isolated_cache
+
+
+def random_context(seed: int) -> FormalContext:
+    rng = random.Random(seed)
+    attributes = [f"a{i}" for i in range(5)]
+    rows = [bitarray([rng.random() < 0.5 for _ in attributes]) for _ in range(25)]
+    return FormalContext([f"g{i}" for i in range(25)], attributes, rows)
+
+
+def random_implications(context: FormalContext, seed: int) -> list[Implication]:
+    rng = random.Random(seed)
+    implications = []
+    for _ in range(4):
+        premise = rng.sample(context.attributes, 1)
+        conclusion = rng.sample(context.attributes, 1)
+        implications.append(Implication(premise, conclusion, context.attributes))
+    return implications
+
+
+def rank_names(ranked) -> list[list[str]]:
+    return [rank.objects for rank in ranked.rankings]
+
+
+def reference_rounds(
+    context: FormalContext, delta: list[Implication]
+) -> list[tuple[list[str], list[Implication]]] | None:
+    """
+    The ranking object by object, as the original object_rank did it: every
+    round places the unranked objects that satisfy all implications still
+    active, then drops the implications they witness. Returns the objects
+    placed in each round with the implications active in it, or None if
+    some objects can never be placed.
+    """
+    unranked = list(range(context.num_objects))
+    active = list(delta)
+    rounds = []
+    while unranked:
+        placed, witnessed = [], []
+        for obj_idx in unranked:
+            results = [impl.sat_wit(context.incidence[obj_idx]) for impl in active]
+            if all(sat for sat, _ in results):
+                placed.append(obj_idx)
+                witnessed.extend(impl for impl, (_, wit) in zip(active, results) if wit)
+        if not placed:
+            return None
+        rounds.append(([context.objects[i] for i in placed], active))
+        active = [impl for impl in active if not any(impl is w for w in witnessed)]
+        unranked = [obj_idx for obj_idx in unranked if obj_idx not in placed]
+    return rounds
+
+
+def ranking_rounds(ranking: IncrementalRanking) -> list[tuple[list[str], list]]:
+    objects = ranking.context.objects
+    return [
+        (
+            [objects[i] for i in rnd.placed.search(1)],
+            [entry.implication for entry in rnd.active],
+        )
+        for rnd in ranking._rounds
+    ]
+
+
+class RemoveImplicationTest(unittest.TestCase):
+    def setUp(self):
+        isolated_cache(self)
+
+    def assert_ranks(self, context, ranking, delta):
+        expected = reference_rounds(context, delta)
+        self.assertIsNotNone(expected)
+        self.assertEqual(ranking_rounds(ranking), expected)
+        self.assertEqual(
+            rank_names(ranking.ranked_context()), [names for names, _ in expected]
+        )
+
+    def test_equal_implications_removed_by_identity(self):
+        for seed in range(30):
+            context = random_context(seed)
+            implications = random_implications(context, seed)
+            # An equal copy of the first implication, added last
+            twin = Implication(
+                implications[0].premise, implications[0].conclusion, context.attributes
+            )
+            delta = implications + [twin]
+            try:
+                ranking = IncrementalRanking(context, delta)
+            except ValueError:
+                continue
+
+            ranking.remove_implication(twin)
+            remaining = implications
+            self.assertEqual(
+                [id(impl) for impl in ranking.delta], list(map(id, remaining))
+            )
+            self.assert_ranks(context, ranking, remaining)
+
+            ranking.remove_implication(implications[0])
+            remaining = implications[1:]
+            self.assertEqual(
+                [id(impl) for impl in ranking.delta], list(map(id, remaining))
+            )
+            self.assert_ranks(context, ranking, remaining)
+
+    def test_repl_sync_after_removing_a_duplicate(self):
+        for seed in range(30):
+            repl = PortRoyalREPL()
+            repl.context = random_context(seed)
+            attributes = repl.context.attributes
+            first = random_implications(repl.context, seed)[0]
+            twin = Implication(first.premise, first.conclusion, attributes)
+            repl.implications = random_implications(repl.context, seed + 100) + [
+                first,
+                twin,
+            ]
+            try:
+                repl._sync_ranking()
+            except ValueError:
+                continue
+
+            del repl.implications[-2]
+            repl._sync_ranking()
+            self.assertEqual(
+                [id(impl) for impl in repl.ranking.delta],
+                [id(impl) for impl in repl.implications],
+            )
+            self.assert_ranks(repl.context, repl.ranking, repl.implications)
+
+    def test_repl_sync_is_all_or_nothing(self):
+        for seed in range(10):
+            repl = PortRoyalREPL()
+            repl.context = random_context(seed)
+            attributes = repl.context.attributes
+            # Nobody has a4, so every object violates {} -> all attributes
+            for obj_idx in range(repl.context.num_objects):
+                repl.context.set_relation(obj_idx, 4, False)
+            unrankable = Implication([], attributes, attributes)
+            repl.implications = random_implications(repl.context, seed)
+            try:
+                repl._sync_ranking()
+            except ValueError:
+                continue
+            ranking = repl.ranking
+            before = ranking_rounds(ranking)
+
+            # One removal succeeds before the addition fails
+            kept = repl.implications[1:]
+            repl.implications = kept + [unrankable]
+            with self.assertRaises(ValueError):
+                repl._sync_ranking()
+            self.assertIs(repl.ranking, ranking)
+            self.assertEqual(ranking_rounds(repl.ranking), before)
+
+            repl.implications = kept
+            repl._sync_ranking()
+            self.assert_ranks(repl.context, repl.ranking, kept)
+
+
+class ObjectRankTest(unittest.TestCase):
+    def test_matches_the_object_by_object_ranking(self):
+        outcomes = set()
+        for seed in range(60):
+            context = random_context(seed)
+            delta = random_implications(context, seed)
+            expected = reference_rounds(context, delta)
+            outcomes.add(expected is None)
+            if expected is None:
+                with self.assertRaises(ValueError):
+                    object_rank(context, delta)
+                continue
+            self.assertEqual(
+                rank_names(object_rank(context, delta)),
+                [names for names, _ in expected],
+            )
+            self.assertEqual(
+                ranking_rounds(IncrementalRanking(context, delta)), expected
+            )
+        # Both rankable and unrankable contexts were seen
+        self.assertEqual(outcomes, {False, True})
+
+    def test_edits_match_the_object_by_object_ranking(self):
+        for seed in range(40):
+            context = random_context(seed)
+            implications = random_implications(context, seed)
+            ranking = IncrementalRanking(context)
+            delta = []
+            for implication in implications + implications[::2]:
+                if implication in delta:
+                    delta.remove(implication)
+                    ranking.remove_implication(implication)
+                elif reference_rounds(context, delta + [implication]) is None:
+                    with self.assertRaises(ValueError):
+                        ranking.add_implication(implication)
+                else:
+                    delta.append(implication)
+                    ranking.add_implication(implication)
+                self.assertEqual(
+                    ranking_rounds(ranking), reference_rounds(context, delta)
+                )
+
+
+class HoldsTest(unittest.TestCase):
+    def assert_holds(self, ranked) -> None:
+        for premise_name in ranked.attributes:
+            for conclusion_name in ranked.attributes:
+                premise, conclusion = ranked._attributes_to_bitarrays(
+                    [[premise_name], [conclusion_name]]
+                )
+                # The first rank with a premise object decides
+                expected = False
+                for rank in ranked.rankings:
+                    having = [row for row in rank.incidence if row[premise.index(1)]]
+                    if having:
+                        expected = all(row[conclusion.index(1)] for row in having)
+                        break
+                self.assertEqual(ranked.holds(premise, conclusion), expected)
+
+    def test_matches_the_first_rank_with_the_premise(self):
+        for seed in range(10):
+            context = random_context(seed)
+            try:
+                ranked = object_rank(context, random_implications(context, seed))
+            except ValueError:
+                continue
+            self.assert_holds(ranked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from bitarray import bitarray
+from bitarray.util import subset
+from benchmarks.generator import random_ranked_context, random_subsets
+from src.algorithms import object_rank
+from src.context import FormalContext
+from src.ranked_context import RankedContext
+from src.translated_ranked_context import SparseTranslatedContext, TranslatedContext
+from tests.helpers import concept_list
+
+
+def inherited_rows(ranked: RankedContext) -> list[bitarray]:
+    """
+    The translated rows by definition: an object has an intent if it has
+    all of its attributes, or if an object of a strictly better rank has.
+    """
+    concepts = ranked.rankings[0].concepts
+    intents = [concepts.intent_bits(i) for i in range(len(concepts))]
+    rows = []
+    held = bitarray(len(intents))
+    held.setall(0)
+    for rank in ranked.rankings:
+        held_here = held.copy()
+        for obj_row in rank.incidence:
+            row = held.copy()
+            for intent_idx, intent in enumerate(intents):
+                if subset(intent, obj_row):
+                    row[intent_idx] = 1
+            held_here |= row
+            rows.append(row)
+        held = held_here
+    return rows
+
+
+def ranked_contexts():
+    for num_objects, num_attributes in [(20, 6), (30, 8), (15, 9)]:
+        for seed in range(3):
+            context, planted = random_ranked_context(
+                num_objects, num_attributes, 0.3, seed, exceptions=0.2
+            )
+            yield object_rank(context, planted)
+
+
+class DenseTranslatedTest(unittest.TestCase):
+    def test_incidence_matches_the_definition(self):
+        for ranked in ranked_contexts():
+            expected = inherited_rows(ranked)
+            translated = TranslatedContext(ranked)
+            self.assertEqual(translated.incidence, expected)
+            self.assertEqual(
+                translated.objects,
+                [obj for rank in ranked.rankings for obj in rank.objects],
+            )
+            self.assertEqual(
+                list(translated.attributes), list(ranked.rankings[0].intents_list)
+            )
+
+            # The columns handed to the context are the transposed rows
+            reference = FormalContext(
+                list(translated.objects),
+                list(translated.attributes),
+                [row.copy() for row in expected],
+            )
+            self.assertEqual(
+                translated._attribute_columns(), reference._attribute_columns()
+            )
+            self.assertEqual(
+                concept_list(translated.concepts), concept_list(reference.concepts)
+            )
+
+
+class SparseTranslatedTest(unittest.TestCase):
+    def test_rows_match_the_definition(self):
+        for ranked in ranked_contexts():
+            expected = inherited_rows(ranked)
+            sparse = SparseTranslatedContext(ranked)
+            self.assertEqual(list(sparse.rows()), expected)
+            dense = sparse.to_dense()
+            self.assertEqual(dense.incidence, expected)
+            self.assertEqual(dense.objects, sparse.objects)
+            self.assertEqual(dense.attributes, sparse.attributes)
+
+    def test_derivations_match_the_dense_context(self):
+        for seed, ranked in enumerate(ranked_contexts()):
+            sparse = SparseTranslatedContext(ranked)
+            dense = sparse.to_dense()
+            for objects in random_subsets(sparse.num_objects, 20, 0.1, seed) + [
+                bitarray("0" * sparse.num_objects)
+            ]:
+                self.assertEqual(
+                    sparse.prime_objects(objects), dense.prime_objects(objects)
+                )
+            for attributes in random_subsets(sparse.num_attributes, 20, 0.1, seed) + [
+                bitarray("0" * sparse.num_attributes)
+            ]:
+                self.assertEqual(
+                    sparse.prime_attributes(attributes),
+                    dense.prime_attributes(attributes),
+                )
+                self.assertEqual(sparse.closure(attributes), dense.closure(attributes))
+
+
+if __name__ == "__main__":
+    unittest.main()